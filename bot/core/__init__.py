@@ -2,5 +2,9 @@
 from .strategy import SimplifiedEMAStrategy
 from .risk_manager import RiskManager
 from .position_manager import PositionManager
+from .rebalance_policy import RebalancePolicy, Thresholds, EmaRebalanceConfig
 
-__all__ = ["SimplifiedEMAStrategy", "RiskManager", "PositionManager"]
\ No newline at end of file
+__all__ = [
+    "SimplifiedEMAStrategy", "RiskManager", "PositionManager",
+    "RebalancePolicy", "Thresholds", "EmaRebalanceConfig",
+]
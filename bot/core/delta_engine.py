@@ -1,8 +1,11 @@
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
+from bot.utils import get_base_symbol, safe_float
 
-@dataclass
+
+@dataclass(slots=True)
 class DeltaSnapshot:
     spot_base: float
     futures_base: float
@@ -10,69 +13,104 @@ class DeltaSnapshot:
     desired_net_delta_base: float
 
 
+@dataclass(slots=True)
+class PositionView:
+    """
+    One fetch of spot + futures exposure, in base units. Both the base-unit (DeltaEngine)
+    and USDT (DeltaTracker) delta views are derived from it so they never disagree.
+    """
+    spot_base: float
+    futures_base: float  # signed: long > 0, short < 0
+    mark_price: float
+    t: float  # monotonic fetch time
+
+    def as_base_delta(self, desired_net_delta_base: float) -> DeltaSnapshot:
+        return DeltaSnapshot(
+            spot_base=self.spot_base,
+            futures_base=self.futures_base,
+            net_base_delta=self.spot_base - self.futures_base,
+            desired_net_delta_base=desired_net_delta_base,
+        )
+
+    def as_usdt_delta(self) -> Tuple[float, float]:
+        """(futures_position_usdt, spot_position_usdt) at the view's mark price."""
+        return self.futures_base * self.mark_price, self.spot_base * self.mark_price
+
+
 class DeltaEngine:
     """
     Computes spot/futures base exposure and net delta (base units).
     futures_base ≈ futures_notional_quote / mark_price for USDT-linear.
     """
+    __slots__ = (
+        'client', 'spot_symbol', 'futures_symbol', 'base_symbol', 'desired_net_delta_base',
+        '_spot_base_resp', '_spot_base_value',
+    )
 
     def __init__(self, client, spot_symbol: str, futures_symbol: Optional[str] = None, desired_net_delta_base: float = 0.0):
         self.client = client
         self.spot_symbol = spot_symbol
         self.futures_symbol = futures_symbol or spot_symbol
-        self.base_symbol = spot_symbol.replace("USDT", "") if spot_symbol.endswith("USDT") else spot_symbol
+        self.base_symbol = get_base_symbol(spot_symbol)
         self.desired_net_delta_base = float(desired_net_delta_base)
+        self._spot_base_resp = None
+        self._spot_base_value = 0.0
 
     def get_spot_base(self) -> float:
-        bal = 0.0
         try:
             resp = self.client.get_coin_balance(self.base_symbol)
+            # A cached client hands back the same response object within its TTL
+            if resp is self._spot_base_resp:
+                return self._spot_base_value
+            bal = 0.0
             if resp and resp.get('retCode') == 0:
-                for acct in resp.get('result', {}).get('list', []) or []:
-                    for coin in acct.get('coin', []) or []:
-                        if coin.get('coin') == self.base_symbol:
-                            v = coin.get('walletBalance') or '0'
-                            bal += float(v or 0)
+                target = self.base_symbol
+                lst = resp.get('result', {}).get('list', []) or ()
+                bal = sum(safe_float(c.get('walletBalance'))
+                          for acct in lst for c in acct.get('coin', ()) or ()
+                          if c.get('coin') == target)
+            self._spot_base_resp = resp
+            self._spot_base_value = bal
+            return bal
         except Exception:
-            pass
-        return bal
+            return 0.0
 
-    def get_futures_base(self, mark_price: Optional[float]) -> float:
+    def _get_futures_position(self, mark_price: Optional[float]) -> Tuple[float, float]:
+        """(signed base size, price) for the futures leg; price falls back to the position's markPrice."""
         try:
             resp = self.client.get_positions(category='linear', symbol=self.futures_symbol)
             if resp and resp.get('retCode') == 0:
                 lst = resp.get('result', {}).get('list', []) or []
                 if not lst:
-                    return 0.0
+                    return 0.0, mark_price or 0.0
                 pos = lst[0]
-                size = float(pos.get('size') or 0)
+                size = safe_float(pos.get('size'))
                 side = pos.get('side')
                 signed = size if side == 'Buy' else -size if side == 'Sell' else 0.0
-                if signed == 0.0:
-                    return 0.0
                 px = mark_price
                 if px is None:
-                    try:
-                        px = float(pos.get('markPrice') or 0)
-                    except Exception:
-                        px = 0.0
-                if px <= 0:
-                    return 0.0
-                # futures notional quote = signed * px; convert to base by dividing by px ⇒ equals signed
-                return signed
+                    px = safe_float(pos.get('markPrice'))
+                return signed, px
         except Exception:
             pass
-        return 0.0
+        return 0.0, mark_price or 0.0
 
-    def snapshot(self, mark_price: Optional[float]) -> DeltaSnapshot:
-        spot_base = self.get_spot_base()
-        futures_base = self.get_futures_base(mark_price)
-        net = spot_base - futures_base
-        return DeltaSnapshot(
-            spot_base=spot_base,
-            futures_base=futures_base,
-            net_base_delta=net,
-            desired_net_delta_base=self.desired_net_delta_base,
-        )
+    def get_futures_base(self, mark_price: Optional[float]) -> float:
+        signed, px = self._get_futures_position(mark_price)
+        if signed == 0.0 or px <= 0:
+            return 0.0
+        # futures notional quote = signed * px; convert to base by dividing by px ⇒ equals signed
+        return signed
 
+    def position_view(self, mark_price: Optional[float]) -> PositionView:
+        """Single fan-out for spot + futures; serves both the base and USDT delta views."""
+        signed, px = self._get_futures_position(mark_price)
+        return PositionView(
+            spot_base=self.get_spot_base(),
+            futures_base=signed if px > 0 else 0.0,
+            mark_price=px,
+            t=time.monotonic(),
+        )
 
+    def snapshot(self, mark_price: Optional[float]) -> DeltaSnapshot:
+        return self.position_view(mark_price).as_base_delta(self.desired_net_delta_base)
@@ -2,94 +2,329 @@
 """
 Delta Tracker - Manages position delta across futures and spot
 """
+import asyncio
+import json
+import logging
+import math
+import os
 import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Optional, Dict
 from datetime import datetime
 
+from bot.exchange.client import CachedBybitClient
+from bot.utils import get_base_symbol, get_instrument_info_cached, get_qty_precision, safe_float
+
+logger = logging.getLogger(__name__)
+
+# Two workers so the futures and spot REST lookups overlap instead of queueing. Shared by every
+# tracker (threads start lazily and are joined at exit) rather than leaked per instance.
+_FETCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="delta-sync")
+
+# Shared read-only result for the (common) no-rebalance case of calculate_futures_adjustment
+_NO_ADJUSTMENT = types.MappingProxyType({
+    'adjustment_needed': False,
+    'adjustment_usdt': 0.0,
+    'adjustment_quantity': 0.0,
+    'adjustment_side': None,
+    'reason': 'No rebalance needed'
+})
+
+
+@dataclass(slots=True)
+class DeltaStatus:
+    """Latest delta snapshot. DeltaTracker owns one instance and updates it in place each sync."""
+    futures_position_usdt: float = 0.0
+    spot_position_usdt: float = 0.0
+    total_delta: float = 0.0
+    desired_delta: float = 0.0
+    delta_divergence: float = 0.0
+    divergence_magnitude: float = 0.0
+    is_diverging: bool = False
+    divergence_duration: Optional[float] = None
+    needs_rebalance: bool = False
+    sync_time: float = 0.0
+    last_sync_age: Optional[float] = None
+
+
 class DeltaTracker:
     """
     Tracks and manages delta exposure across futures and spot positions.
     Delta is calculated as: futures_position_usdt + spot_position_usdt
     Positive delta = net long exposure, Negative delta = net short exposure
     """
+    __slots__ = (
+        'client', 'symbol', 'config', 'base_symbol',
+        '_limits',
+        'debug_spot_zero', '_last_spot_debug_t', '_last_err_log_t',
+        'position_store', 'position_store_max_age_seconds', 'engine',
+        '_header_line', '_status_template',
+        'last_futures_position_usdt', 'last_spot_position_usdt', 'last_total_delta',
+        'last_sync_time', 'last_sync_wall_time',
+        'divergence_start_time', 'is_diverging', '_divergence_deadline',
+        '_status', '_status_key',
+        '_state_path', '_last_state_write_t', '_linear_lot',
+    )
     
-    def __init__(self, client, symbol: str, config: dict):
+    def __init__(self, client, symbol: str, config: dict, position_store=None, engine=None):
+        delta_config = config.get('delta_management', {})
+        
+        # Share short-lived position/balance responses with anything else holding this client
+        # (e.g. a DeltaEngine built from tracker.client) so one loop tick costs one round trip
+        if not isinstance(client, CachedBybitClient):
+            client = CachedBybitClient(client, ttl_ms=delta_config.get('cache_ttl_ms', 250))
         self.client = client
         self.symbol = symbol
         self.config = config
         
         # Extract base symbol from trading pair (e.g., "AVNT" from "AVNTUSDT")
-        self.base_symbol = symbol.replace("USDT", "") if symbol.endswith("USDT") else symbol
+        self.base_symbol = get_base_symbol(symbol)
         
         # Delta management configuration
-        delta_config = config.get('delta_management', {})
-        self.desired_delta_usdt = delta_config.get('desired_delta_usdt', 0)
-        self.divergence_threshold_usdt = delta_config.get('divergence_threshold_usdt', 1000)
-        self.divergence_timeout_seconds = delta_config.get('divergence_timeout_seconds', 360)
+        # Frozen as (desired, threshold, timeout) so the sync path unpacks them in one go
+        self._limits = (
+            float(delta_config.get('desired_delta_usdt', 0)),
+            float(delta_config.get('divergence_threshold_usdt', 1000)),
+            float(delta_config.get('divergence_timeout_seconds', 360)),
+        )
+        
+        # Zero-spot balance diagnostics cost an extra REST call, so they are opt-in and rate limited
+        self.debug_spot_zero = delta_config.get('debug_spot_zero', False)
+        self._last_spot_debug_t = 0.0
+        self._last_err_log_t = float('-inf')
+        
+        # Optional websocket-fed position/wallet cache; REST is the fallback when it goes stale
+        self.position_store = position_store
+        self.position_store_max_age_seconds = delta_config.get('position_store_max_age_seconds', 30)
+        if self.position_store is not None:
+            self.position_store.seed(self.client, self.symbol, self.base_symbol)
+        
+        # Optional DeltaEngine to share one position fetch per tick with its base-unit snapshot
+        self.engine = engine
+        
+        # Static pieces of the status printout, built once
+        self._header_line = "=" * 80
+        self._status_template = "\n".join([
+            "\n%s",
+            "📊 DELTA STATUS - %s",
+            "%s",
+            "%s FUTURES: $%s",
+            "%s SPOT:    $%s",
+            "=" * 20,
+            "%s TOTAL:   $%s",
+            "🎯 TARGET:  $%s",
+            "%s DIVERGENCE: $%s",
+        ])
+        
+        # (qtyStep, minOrderQty) of the linear contract, fetched on first hedge order
+        self._linear_lot = None
         
         # State tracking
         self.last_futures_position_usdt = 0.0
         self.last_spot_position_usdt = 0.0
         self.last_total_delta = 0.0
-        self.last_sync_time = 0.0
+        self.last_sync_time = 0.0  # monotonic, for durations only
+        self.last_sync_wall_time = 0.0  # wall clock, for logs
         
         # Divergence tracking
         self.divergence_start_time = None
         self.is_diverging = False
+        self._divergence_deadline = float('inf')  # when the current divergence times out
+        
+        # Reused for every sync so the hot loop doesn't allocate a status per tick
+        self._status = DeltaStatus(desired_delta=self.desired_delta_usdt)
+        self._status_key = None  # (last_sync_time, desired_delta) the status was built for
         
-        print(f"""
+        # Divergence state survives restarts so a restart mid-divergence doesn't reset the timeout
+        # One file per symbol ('{symbol}' in a configured path is filled in) so bots sharing a
+        # working directory don't restore each other's divergence
+        state_path = delta_config.get('state_path', '.delta_state_{symbol}.json')
+        self._state_path = state_path.format(symbol=symbol) if state_path else None
+        self._last_state_write_t = float('-inf')
+        self._load_state()
+        
+        logger.info("""
         ========== DELTA TRACKER INITIALIZED ==========
-        Symbol: {self.symbol}
-        Base Symbol: {self.base_symbol}
-        Desired Delta: ${self.desired_delta_usdt:,.0f}
-        Divergence Threshold: ${self.divergence_threshold_usdt:,.0f}
-        Divergence Timeout: {self.divergence_timeout_seconds}s
+        Symbol: %s
+        Base Symbol: %s
+        Desired Delta: $%.0f
+        Divergence Threshold: $%.0f
+        Divergence Timeout: %gs
         ===============================================
-        """)
+        """, self.symbol, self.base_symbol, self.desired_delta_usdt,
+                    self.divergence_threshold_usdt, self.divergence_timeout_seconds)
+    
+    @property
+    def desired_delta_usdt(self) -> float:
+        return self._limits[0]
     
-    def sync_positions(self, current_price: Optional[float] = None) -> Dict:
+    @desired_delta_usdt.setter
+    def desired_delta_usdt(self, value: float):
+        self._limits = (float(value), self._limits[1], self._limits[2])
+    
+    @property
+    def divergence_threshold_usdt(self) -> float:
+        return self._limits[1]
+    
+    @divergence_threshold_usdt.setter
+    def divergence_threshold_usdt(self, value: float):
+        self._limits = (self._limits[0], float(value), self._limits[2])
+    
+    @property
+    def divergence_timeout_seconds(self) -> float:
+        return self._limits[2]
+    
+    @divergence_timeout_seconds.setter
+    def divergence_timeout_seconds(self, value: float):
+        self._limits = (self._limits[0], self._limits[1], float(value))
+    
+    def sync_positions(self, current_price: Optional[float] = None) -> DeltaStatus:
         """
         Sync futures and spot positions and calculate current delta.
-        Returns dict with position information.
+        Returns the shared DeltaStatus.
         """
-        current_time = time.time()
+        if self.engine is not None:
+            return self._apply_positions(*self.engine.position_view(current_price).as_usdt_delta())
         
-        # Get futures position (from existing strategy position sync)
-        futures_position_usdt = self._get_futures_position_usdt(current_price)
+        # Both lookups in flight at once on the fetch pool; async callers await sync_positions_async
+        futures_future = _FETCH_POOL.submit(self._get_futures_position_usdt, current_price)
+        spot_future = _FETCH_POOL.submit(self._get_spot_position_usdt, current_price)
+        return self._apply_positions(futures_future.result(), spot_future.result())
+    
+    async def sync_positions_async(self, current_price: Optional[float] = None) -> DeltaStatus:
+        """Same as sync_positions, but fetches futures and spot positions concurrently."""
+        if self.engine is not None:
+            loop = asyncio.get_running_loop()
+            view = await loop.run_in_executor(_FETCH_POOL, self.engine.position_view, current_price)
+            return self._apply_positions(*view.as_usdt_delta())
+        futures_position_usdt, spot_position_usdt = await asyncio.gather(
+            self._get_futures_position_usdt_async(current_price),
+            self._get_spot_position_usdt_async(current_price),
+        )
+        return self._apply_positions(futures_position_usdt, spot_position_usdt)
+    
+    async def _get_futures_position_usdt_async(self, current_price: Optional[float] = None) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_FETCH_POOL, self._get_futures_position_usdt, current_price)
+    
+    async def _get_spot_position_usdt_async(self, current_price: Optional[float] = None) -> float:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_FETCH_POOL, self._get_spot_position_usdt, current_price)
+    
+    def _apply_positions(self, futures_position_usdt: float, spot_position_usdt: float) -> DeltaStatus:
+        """Update delta state from freshly fetched positions and refresh the shared status."""
+        # Monotonic clock so NTP jumps can't fake a divergence timeout
+        current_time = time.monotonic()
         
-        # Get spot position
-        spot_position_usdt = self._get_spot_position_usdt()
+        desired, thr, timeout = self._limits
         
         # Calculate total delta
         total_delta = futures_position_usdt + spot_position_usdt
         
         # Calculate divergence from desired delta
-        delta_divergence = total_delta - self.desired_delta_usdt
+        delta_divergence = total_delta - desired
+        divergence_magnitude = abs(delta_divergence)
         
         # Update state
         self.last_futures_position_usdt = futures_position_usdt
         self.last_spot_position_usdt = spot_position_usdt
         self.last_total_delta = total_delta
         self.last_sync_time = current_time
+        self.last_sync_wall_time = time.time()
         
         # Track divergence timing
-        self._update_divergence_tracking(abs(delta_divergence), current_time)
+        is_above_threshold = divergence_magnitude > thr
+        if is_above_threshold and not self.is_diverging:
+            # Start tracking divergence
+            self.is_diverging = True
+            self.divergence_start_time = current_time
+            self._divergence_deadline = current_time + timeout
+        elif not is_above_threshold and self.is_diverging:
+            # Stop tracking divergence
+            self.is_diverging = False
+            self.divergence_start_time = None
+            self._divergence_deadline = float('inf')
         
-        return {
-            'futures_position_usdt': futures_position_usdt,
-            'spot_position_usdt': spot_position_usdt,
-            'total_delta': total_delta,
-            'desired_delta': self.desired_delta_usdt,
-            'delta_divergence': delta_divergence,
-            'divergence_magnitude': abs(delta_divergence),
+        status = self._status
+        status.futures_position_usdt = futures_position_usdt
+        status.spot_position_usdt = spot_position_usdt
+        status.total_delta = total_delta
+        status.desired_delta = desired
+        status.delta_divergence = delta_divergence
+        status.divergence_magnitude = divergence_magnitude
+        status.is_diverging = self.is_diverging
+        status.divergence_duration = current_time - self.divergence_start_time if self.is_diverging else None
+        status.needs_rebalance = is_above_threshold and current_time > self._divergence_deadline
+        status.sync_time = self.last_sync_wall_time
+        status.last_sync_age = 0.0
+        self._status_key = (current_time, desired)
+        
+        if current_time - self._last_state_write_t >= 5.0:
+            self._save_state()
+        return status
+    
+    def _save_state(self):
+        """Atomically persist divergence state (wall-clock start time, since monotonic doesn't survive restarts)."""
+        if not self._state_path:
+            return
+        self._last_state_write_t = time.monotonic()
+        start_wall = None
+        if self.is_diverging and self.divergence_start_time is not None:
+            start_wall = time.time() - (time.monotonic() - self.divergence_start_time)
+        state = {
+            'symbol': self.symbol,
+            'written_at': time.time(),
             'is_diverging': self.is_diverging,
-            'divergence_duration': self._get_divergence_duration(current_time),
-            'needs_rebalance': self._needs_rebalance(delta_divergence, current_time),
-            'sync_time': current_time
+            'divergence_start_time_wall': start_wall,
+            'last_total_delta': self.last_total_delta,
         }
+        tmp_path = f"{self._state_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._state_path)
+        except OSError as e:
+            logger.warning("Could not persist delta state to %s: %s", self._state_path, e)
+    
+    def _load_state(self):
+        """Restore divergence state written by a previous run, if any."""
+        if not self._state_path or not os.path.exists(self._state_path):
+            return
+        try:
+            with open(self._state_path) as f:
+                state = json.load(f)
+            if state.get('symbol') != self.symbol:
+                logger.warning("Ignoring delta state in %s: written for %s, not %s",
+                               self._state_path, state.get('symbol'), self.symbol)
+                return
+            # Older than a full timeout, the divergence it describes says nothing about now
+            age = time.time() - float(state.get('written_at') or 0.0)
+            if age > self.divergence_timeout_seconds:
+                logger.info("Ignoring delta state in %s: %.0fs old", self._state_path, age)
+                return
+            self.last_total_delta = float(state.get('last_total_delta') or 0.0)
+            start_wall = state.get('divergence_start_time_wall')
+            if state.get('is_diverging') and start_wall is not None:
+                # Re-anchor the wall-clock start onto this process's monotonic clock
+                self.is_diverging = True
+                self.divergence_start_time = time.monotonic() - max(0.0, time.time() - float(start_wall))
+                self._divergence_deadline = self.divergence_start_time + self.divergence_timeout_seconds
+                logger.warning("♻️ Restored divergence state: diverging for %.0fs", time.time() - float(start_wall))
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Could not load delta state from %s: %s", self._state_path, e)
     
     def _get_futures_position_usdt(self, current_price: Optional[float] = None) -> float:
         """Get the current futures position value in USDT"""
+        store = self.position_store
+        if store is not None and store.is_fresh(self.position_store_max_age_seconds):
+            pos = store.futures.get(self.symbol)
+            if pos is not None:
+                side = pos['side']
+                position_size = pos['size'] if side == 'Buy' else -pos['size'] if side == 'Sell' else 0
+                return position_size * (current_price or pos['markPrice'])
+        
         try:
             response = self.client.get_positions(
                 category='linear',
@@ -100,7 +335,7 @@ class DeltaTracker:
                 positions = response['result']['list']
                 if positions:
                     pos = positions[0]
-                    size = float(pos.get('size', 0))
+                    size = safe_float(pos.get('size'))
                     side = pos.get('side', 'None')
                     
                     # Convert to signed position (positive = long, negative = short)
@@ -114,7 +349,7 @@ class DeltaTracker:
                         position_usdt = position_size * current_price
                     else:
                         # Use mark price from position data
-                        mark_price = float(pos.get('markPrice', 0))
+                        mark_price = safe_float(pos.get('markPrice'))
                         position_usdt = position_size * mark_price
                     
                     return position_usdt
@@ -122,19 +357,26 @@ class DeltaTracker:
             return 0.0
             
         except Exception as e:
-            print(f"⚠️ Error getting futures position: {e}")
+            logger.warning("Error getting futures position: %s", e)
             return 0.0
     
-    def _get_spot_position_usdt(self) -> float:
+    def _get_spot_position_usdt(self, current_price: Optional[float] = None) -> float:
         """Get the current spot position value in USDT"""
+        store = self.position_store
+        if current_price and store is not None and store.is_fresh(self.position_store_max_age_seconds):
+            balance = store.spot.get(self.base_symbol)
+            if balance is not None:
+                return balance * current_price
+        
         try:
             spot_value = self.client.get_spot_position_value(self.base_symbol, "USDT")
             
             # Debug output for spot position detection
             if spot_value > 0:
-                print(f"📊 Spot position detected: {self.base_symbol} = ${spot_value:+,.2f}")
-            else:
+                logger.debug("📊 Spot position detected: %s = $%+.2f", self.base_symbol, spot_value)
+            elif self.debug_spot_zero and (time.monotonic() - self._last_spot_debug_t) > 60:
                 # Let's also check the raw balance to see what's happening
+                self._last_spot_debug_t = time.monotonic()
                 balance_response = self.client.get_coin_balance(self.base_symbol)
                 if balance_response and balance_response.get('retCode') == 0:
                     coin_list = balance_response.get('result', {}).get('list', [])
@@ -143,38 +385,25 @@ class DeltaTracker:
                         coins = account.get('coin', [])
                         for coin_info in coins:
                             if coin_info.get('coin') == self.base_symbol:
-                                wallet_balance_str = coin_info.get('walletBalance', '0')
-                                if wallet_balance_str and wallet_balance_str != '':
-                                    balance = float(wallet_balance_str)
-                                    total_balance += balance
-                                    if balance > 0:
-                                        print(f"🔍 Found {self.base_symbol} balance: {balance:.3f} (account: {account.get('accountType', 'unknown')})")
+                                balance = safe_float(coin_info.get('walletBalance'))
+                                total_balance += balance
+                                if balance > 0:
+                                    logger.debug("🔍 Found %s balance: %.3f (account: %s)", self.base_symbol, balance, account.get('accountType', 'unknown'))
                     
                     if total_balance > 0:
-                        print(f"⚠️ Spot position calculation issue: Found {total_balance:.3f} {self.base_symbol} but value calculation returned ${spot_value:.2f}")
+                        logger.debug("⚠️ Spot position calculation issue: Found %.3f %s but value calculation returned $%.2f", total_balance, self.base_symbol, spot_value)
                 else:
-                    print(f"🔍 No spot balance found for {self.base_symbol}")
+                    logger.debug("🔍 No spot balance found for %s", self.base_symbol)
             
             return spot_value
         except Exception as e:
-            print(f"⚠️ Error getting spot position: {e}")
-            import traceback
-            traceback.print_exc()
+            # Rate limited so an exchange outage can't flood stdout
+            now = time.monotonic()
+            if now - self._last_err_log_t >= 1.0:
+                self._last_err_log_t = now
+                logger.warning("Error getting spot position: %s", e)
             return 0.0
     
-    def _update_divergence_tracking(self, divergence_magnitude: float, current_time: float):
-        """Update divergence tracking state"""
-        is_above_threshold = divergence_magnitude > self.divergence_threshold_usdt
-        
-        if is_above_threshold and not self.is_diverging:
-            # Start tracking divergence
-            self.is_diverging = True
-            self.divergence_start_time = current_time
-        elif not is_above_threshold and self.is_diverging:
-            # Stop tracking divergence
-            self.is_diverging = False
-            self.divergence_start_time = None
-    
     def _get_divergence_duration(self, current_time: float) -> Optional[float]:
         """Get how long we've been diverging"""
         if not self.is_diverging or self.divergence_start_time is None:
@@ -187,35 +416,18 @@ class DeltaTracker:
         1. Divergence magnitude exceeding threshold
         2. Divergence duration exceeding timeout
         """
-        divergence_magnitude = abs(delta_divergence)
-        
-        # Check if we're above threshold
-        if divergence_magnitude <= self.divergence_threshold_usdt:
-            return False
-        
-        # Check if we've been diverging too long
-        divergence_duration = self._get_divergence_duration(current_time)
-        if divergence_duration and divergence_duration > self.divergence_timeout_seconds:
-            return True
-        
-        return False
+        return abs(delta_divergence) > self.divergence_threshold_usdt and current_time > self._divergence_deadline
     
-    def calculate_futures_adjustment(self, delta_status: Dict, current_price: float) -> Dict:
+    def calculate_futures_adjustment(self, delta_status: DeltaStatus, current_price: float) -> Dict:
         """
         Calculate how much to adjust futures position to reach desired delta.
         Returns dict with adjustment details.
         """
-        if not delta_status['needs_rebalance']:
-            return {
-                'adjustment_needed': False,
-                'adjustment_usdt': 0.0,
-                'adjustment_quantity': 0.0,
-                'adjustment_side': None,
-                'reason': 'No rebalance needed'
-            }
+        if not delta_status.needs_rebalance:
+            return _NO_ADJUSTMENT
         
         # Calculate required adjustment
-        delta_divergence = delta_status['delta_divergence']
+        delta_divergence = delta_status.delta_divergence
         
         # To correct the divergence, we need to adjust futures by the negative of divergence
         # If we're too long (positive divergence), we need to reduce futures position (negative adjustment)
@@ -238,66 +450,104 @@ class DeltaTracker:
             'adjustment_side': side,
             'current_divergence': delta_divergence,
             'target_delta': self.desired_delta_usdt,
-            'reason': f'Delta divergence: ${delta_divergence:+,.0f} (threshold: ${self.divergence_threshold_usdt:,.0f})'
+            'reason': f'Delta divergence: ${delta_divergence:+,.0f} (threshold: ${self.divergence_threshold_usdt:,.0f})',
+            # Ready to queue with a spot leg via SpotExecutionEngine.place_batch
+            'order': self._hedge_order(side, adjustment_quantity),
         }
     
-    def get_status(self, current_price: Optional[float] = None) -> Dict:
+    def _hedge_order(self, side: str, quantity: float) -> Optional[Dict]:
+        """
+        Linear market order for the hedge leg with qty floored to the contract's qtyStep.
+        None if the lot size is unknown or the rounded qty is below minOrderQty.
+        """
+        if self._linear_lot is None:
+            try:
+                info = get_instrument_info_cached(self.client, 'linear', self.symbol)
+            except Exception as e:
+                logger.warning("Could not get linear instrument info for %s: %s", self.symbol, e)
+                return None
+            if not info:
+                return None
+            lot = info.get('lotSizeFilter', {})
+            self._linear_lot = (lot.get('qtyStep', '1'), safe_float(lot.get('minOrderQty')))
+        
+        qty_step, min_qty = self._linear_lot
+        step = float(qty_step)
+        # Epsilon so an exact multiple isn't floored one step down by float error
+        qty = math.floor(quantity / step + 1e-9) * step
+        if qty <= 0 or qty < min_qty:
+            return None
+        return {
+            'category': 'linear',
+            'symbol': self.symbol,
+            'side': side,
+            'orderType': 'Market',
+            'qty': f"{qty:.{get_qty_precision(qty_step)}f}",
+        }
+    
+    def get_status(self, current_price: Optional[float] = None) -> DeltaStatus:
         """Get current delta status for monitoring"""
         if current_price:
             # Refresh positions if price is provided
             return self.sync_positions(current_price)
         else:
             # Return last known status
-            current_time = time.time()
+            current_time = time.monotonic()
+            status = self._status
+            last_sync_age = current_time - self.last_sync_time if self.last_sync_time > 0 else None
+            
+            # No sync and no open divergence clock since the last build: only the age can have moved
+            if self._status_key == (self.last_sync_time, self.desired_delta_usdt) and not self.is_diverging:
+                status.last_sync_age = last_sync_age
+                return status
+            
             delta_divergence = self.last_total_delta - self.desired_delta_usdt
             
-            return {
-                'futures_position_usdt': self.last_futures_position_usdt,
-                'spot_position_usdt': self.last_spot_position_usdt,
-                'total_delta': self.last_total_delta,
-                'desired_delta': self.desired_delta_usdt,
-                'delta_divergence': delta_divergence,
-                'divergence_magnitude': abs(delta_divergence),
-                'is_diverging': self.is_diverging,
-                'divergence_duration': self._get_divergence_duration(current_time),
-                'needs_rebalance': self._needs_rebalance(delta_divergence, current_time),
-                'sync_time': self.last_sync_time,
-                'last_sync_age': current_time - self.last_sync_time if self.last_sync_time > 0 else None
-            }
+            status.futures_position_usdt = self.last_futures_position_usdt
+            status.spot_position_usdt = self.last_spot_position_usdt
+            status.total_delta = self.last_total_delta
+            status.desired_delta = self.desired_delta_usdt
+            status.delta_divergence = delta_divergence
+            status.divergence_magnitude = abs(delta_divergence)
+            status.is_diverging = self.is_diverging
+            status.divergence_duration = self._get_divergence_duration(current_time)
+            status.needs_rebalance = self._needs_rebalance(delta_divergence, current_time)
+            status.last_sync_age = last_sync_age
+            self._status_key = (self.last_sync_time, self.desired_delta_usdt)
+            return status
     
-    def print_delta_status(self, status: Dict):
+    def print_delta_status(self, status: DeltaStatus, verbose: bool = True):
         """Print detailed delta status"""
-        print(f"\n{'='*80}")
-        print(f"📊 DELTA STATUS - {datetime.now().strftime('%H:%M:%S')}")
-        print(f"{'='*80}")
-        
-        # Position breakdown
-        futures_icon = "🟢" if status['futures_position_usdt'] > 0 else "🔴" if status['futures_position_usdt'] < 0 else "⚪"
-        spot_icon = "🟢" if status['spot_position_usdt'] > 0 else "⚪"
-        
-        print(f"{futures_icon} FUTURES: ${status['futures_position_usdt']:+,.0f}")
-        print(f"{spot_icon} SPOT:    ${status['spot_position_usdt']:+,.0f}")
-        print(f"{'='*20}")
-        
-        # Total delta
-        delta_icon = "🟢" if status['total_delta'] > 0 else "🔴" if status['total_delta'] < 0 else "⚪"
-        print(f"{delta_icon} TOTAL:   ${status['total_delta']:+,.0f}")
-        print(f"🎯 TARGET:  ${status['desired_delta']:+,.0f}")
-        
-        # Divergence info
-        divergence = status['delta_divergence']
-        divergence_icon = "⚠️" if status['is_diverging'] else "✅"
-        print(f"{divergence_icon} DIVERGENCE: ${divergence:+,.0f}")
-        
-        if status['is_diverging']:
-            duration = status['divergence_duration']
+        if not verbose or not logger.isEnabledFor(logging.INFO):
+            return
+        
+        futures = status.futures_position_usdt
+        spot = status.spot_position_usdt
+        total = status.total_delta
+        futures_icon = "🟢" if futures > 0 else "🔴" if futures < 0 else "⚪"
+        spot_icon = "🟢" if spot > 0 else "⚪"
+        delta_icon = "🟢" if total > 0 else "🔴" if total < 0 else "⚪"
+        divergence_icon = "⚠️" if status.is_diverging else "✅"
+        
+        lines = [self._status_template % (
+            self._header_line, datetime.now().strftime('%H:%M:%S'), self._header_line,
+            futures_icon, format(futures, '+,.0f'),
+            spot_icon, format(spot, '+,.0f'),
+            delta_icon, format(total, '+,.0f'),
+            format(status.desired_delta, '+,.0f'),
+            divergence_icon, format(status.delta_divergence, '+,.0f'),
+        )]
+        
+        if status.is_diverging:
+            duration = status.divergence_duration
             timeout = self.divergence_timeout_seconds
-            print(f"⏱️ DURATION: {duration:.0f}s / {timeout}s")
+            lines.append("⏱️ DURATION: %.0fs / %gs" % (duration, timeout))
             
-            if status['needs_rebalance']:
-                print(f"🚨 REBALANCE NEEDED!")
+            if status.needs_rebalance:
+                lines.append("🚨 REBALANCE NEEDED!")
             else:
                 remaining = timeout - duration if duration else timeout
-                print(f"⏳ TIME REMAINING: {remaining:.0f}s")
+                lines.append("⏳ TIME REMAINING: %.0fs" % remaining)
         
-        print(f"{'='*80}\n")
+        lines.append(self._header_line + "\n")
+        logger.info("\n".join(lines))
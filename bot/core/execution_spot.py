@@ -1,22 +1,32 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Dict, List
 
+# Bybit v5 retCode for amending an order that no longer exists (filled/cancelled) or is too late to replace
+ORDER_GONE_RET_CODE = 110001
 
-@dataclass
+# Bybit batches only within one category, so spot and linear legs go out side by side. Shared by
+# every engine (threads start lazily and are joined at exit) rather than leaked per instance.
+_BATCH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="batch-order")
+
+
+@dataclass(slots=True)
 class MakerConfig:
     post_only: bool = True
     quote_improve_bps: int = 0
     chase_seconds: float = 5.0
     max_requotes: int = 3
+    requote_check_seconds: float = 0.1
 
 
-@dataclass
+@dataclass(slots=True)
 class TakerConfig:
     allowed_on_soft: bool = False
     allowed_on_hard: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionConfig:
     profile: str
     maker: MakerConfig
@@ -26,14 +36,27 @@ class ExecutionConfig:
 
 
 class SpotExecutionEngine:
-    def __init__(self, client, symbol: str, cfg: ExecutionConfig):
+    """
+    Spot order execution. `book` (e.g. BybitWebSocketManager) supplies the live touch via
+    get_best_bid_ask(); `order_store` (PositionStore) supplies order fill events. Both are
+    optional: without them the maker chase degrades to a single resting order at best_px.
+    """
+    __slots__ = ('client', 'symbol', 'cfg', 'category', 'book', 'order_store', '_min_q', '_max_q')
+
+    def __init__(self, client, symbol: str, cfg: ExecutionConfig, book=None, order_store=None):
         self.client = client
         self.symbol = symbol
         self.cfg = cfg
         self.category = 'spot'
+        # Size limits as plain floats; _clamp_qty runs on every order path
+        self._min_q = float(cfg.min_trade_base)
+        self._max_q = float(cfg.max_trade_base)
+        self.book = book
+        self.order_store = order_store
 
     def _clamp_qty(self, qty_base: float) -> float:
-        return max(self.cfg.min_trade_base, min(self.cfg.max_trade_base, abs(qty_base)))
+        q = abs(qty_base)
+        return self._min_q if q < self._min_q else self._max_q if q > self._max_q else q
 
     def market(self, side: str, qty_base: float) -> bool:
         q = self._clamp_qty(qty_base)
@@ -48,6 +71,31 @@ class SpotExecutionEngine:
         )
         return bool(resp and resp.get('retCode') == 0)
 
+    def place_batch(self, orders: List[Dict]) -> List[bool]:
+        """
+        Submit several orders at once, e.g. a spot rebalance leg plus a futures hedge.
+        Orders are grouped per category (default spot) into one create-batch request each,
+        and the per-category requests are sent concurrently. Returns per-order success flags
+        in input order.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, order in enumerate(orders):
+            groups.setdefault(order.get('category', self.category), []).append(i)
+
+        def submit(category: str, idxs: List[int]):
+            return self.client.place_batch_order(category, [orders[i] for i in idxs], verbose=False)
+
+        futures = {cat: _BATCH_POOL.submit(submit, cat, idxs) for cat, idxs in groups.items()}
+        results = [False] * len(orders)
+        for cat, idxs in groups.items():
+            resp = futures[cat].result()
+            if not (resp and resp.get('retCode') == 0):
+                continue
+            codes = (resp.get('retExtInfo') or {}).get('list', []) or []
+            for i, info in zip(idxs, codes):
+                results[i] = info.get('code') == 0
+        return results
+
     def post_only_limit_once(self, side: str, best_px: float) -> bool:
         """Place a single post-only limit at touch or 1 tick inside (approximated by quote_improve_bps)."""
         price = best_px
@@ -65,32 +113,124 @@ class SpotExecutionEngine:
         )
         return bool(resp and resp.get('retCode') == 0)
 
+    def _touch_price(self, side: str, fallback: float) -> float:
+        """Best bid for buys / best ask for sells from the book stream, else the fallback."""
+        if self.book is None:
+            return fallback
+        bid, ask = self.book.get_best_bid_ask()
+        px = bid if side == 'Buy' else ask
+        return px or fallback
+
     def maker_then_escalate(self, side: str, qty_base: float, best_px: float, allow_taker: bool) -> bool:
         q = self._clamp_qty(qty_base)
         if q <= 0:
             return False
 
-        # Try maker order(s) by re-placing at touch; simplified without tracking orderIds
-        deadline = time.time() + max(0.0, float(self.cfg.maker.chase_seconds))
-        placed = False
-        while time.time() < deadline and not placed:
-            resp = self.client.place_order(
-                category=self.category,
-                symbol=self.symbol,
-                side=side,
-                orderType='Limit',
-                qty=q,
-                price=best_px,
-                timeInForce='PostOnly' if self.cfg.maker.post_only else 'GTC',
-                verbose=False,
-            )
-            placed = bool(resp and resp.get('retCode') == 0)
-            if placed:
+        tif = 'PostOnly' if self.cfg.maker.post_only else 'GTC'
+        deadline = time.monotonic() + max(0.0, float(self.cfg.maker.chase_seconds))
+        px = best_px
+        order_id = None
+        requotes = 0
+        backoff = 0.1
+
+        while time.monotonic() < deadline:
+            if order_id is None:
+                resp = self.client.place_order(
+                    category=self.category,
+                    symbol=self.symbol,
+                    side=side,
+                    orderType='Limit',
+                    qty=q,
+                    price=px,
+                    timeInForce=tif,
+                    verbose=False,
+                )
+                if not (resp and resp.get('retCode') == 0):
+                    # Rejected (e.g. post-only would cross): back off, then retry at the current touch
+                    time.sleep(min(backoff, max(0.0, deadline - time.monotonic())))
+                    backoff = min(backoff * 2, 1.0)
+                    px = self._touch_price(side, px)
+                    continue
+                order_id = resp.get('result', {}).get('orderId')
+                if self.order_store is None or not order_id:
+                    # No fill events to wait on; a resting maker order is the best we can confirm
+                    return True
+
+            wait = min(self.cfg.maker.requote_check_seconds, max(0.0, deadline - time.monotonic()))
+            order = self.order_store.wait_for_order(order_id, wait)
+            if order is not None:
+                if order['status'] == 'Filled':
+                    return True
+                # Cancelled/rejected by the venue: re-place whatever is still unfilled at the current touch
+                q = max(0.0, q - order['cumExecQty'])
+                if q < self.cfg.min_trade_base:
+                    return True
+                order_id = None
+                px = self._touch_price(side, px)
+                continue
+
+            # Only touch REST when the top of book has actually moved
+            new_px = self._touch_price(side, px)
+            if new_px != px and requotes < self.cfg.maker.max_requotes:
+                resp = self.client.amend_order(
+                    category=self.category,
+                    symbol=self.symbol,
+                    orderId=order_id,
+                    price=new_px,
+                )
+                if resp and resp.get('retCode') == 0:
+                    px = new_px
+                    requotes += 1
+                elif resp is None:
+                    # Outcome unknown (no ack / transport error): keep the order we have unless the
+                    # stream shows it finished; count the attempt so a dead link can't spin here
+                    requotes += 1
+                    order = self.order_store.wait_for_order(order_id, self.cfg.maker.requote_check_seconds)
+                    if order is not None:
+                        if order['status'] == 'Filled':
+                            return True
+                        q = max(0.0, q - order['cumExecQty'])
+                        if q < self.cfg.min_trade_base:
+                            return True
+                        order_id = None
+                        px = new_px
+                elif resp.get('retCode') == ORDER_GONE_RET_CODE:
+                    # Filled or cancelled under us; only the order stream can say which, so wait for
+                    # it (up to the deadline) and re-place just the unfilled remainder
+                    requotes += 1
+                    order = self.order_store.wait_for_order(
+                        order_id, max(self.cfg.maker.requote_check_seconds, deadline - time.monotonic()))
+                    if order is None:
+                        # Still unconfirmed: re-placing now risks doubling a fill; the caller re-evaluates
+                        return False
+                    if order['status'] == 'Filled':
+                        return True
+                    q = max(0.0, q - order['cumExecQty'])
+                    if q < self.cfg.min_trade_base:
+                        return True
+                    order_id = None
+                    px = new_px
+                else:
+                    # Amend rejected (rate limit, post-only cross, ...): the order still rests at px.
+                    # Count it against max_requotes and back off like a rejected placement
+                    requotes += 1
+                    time.sleep(min(backoff, max(0.0, deadline - time.monotonic())))
+                    backoff = min(backoff * 2, 1.0)
+
+        if order_id is not None:
+            self.client.cancel_order(category=self.category, symbol=self.symbol, orderId=order_id)
+            # Size the taker leg from the order's terminal state, not a snapshot that predates
+            # the cancel (or a fill racing it) - otherwise the full size could trade twice
+            order = self.order_store.wait_for_order(order_id, self.cfg.maker.requote_check_seconds)
+            if order is None:
+                # Still unconfirmed: escalating now risks doubling a fill; the caller re-evaluates
+                return False
+            if order['status'] == 'Filled':
+                return True
+            q = max(0.0, q - order['cumExecQty'])
+            if q < self.cfg.min_trade_base:
                 return True
-            time.sleep(0.5)
 
         if allow_taker:
             return self.market(side, q)
         return False
-
-
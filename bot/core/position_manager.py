@@ -2,35 +2,51 @@
 """
 Position and order management module
 """
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
-from enum import Enum
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+from enum import IntEnum
+from types import MappingProxyType
 import time
 import logging
 
+import numpy as np
+
+from bot.utils import format_quantity, format_price
+
 logger = logging.getLogger(__name__)
 
-class OrderType(Enum):
-    MARKET = "Market"
-    LIMIT = "Limit"
-    STOP = "Stop"
-    STOP_LIMIT = "StopLimit"
+ORDER_HISTORY_MAXLEN = 10_000
+# Executions are looked up from an order's creation time minus this margin, covering local vs
+# exchange clock skew and fills that land while place_order is still in flight
+EXECUTION_LOOKBACK_MARGIN_S = 5.0
+# Cursor pages fetched per reconciliation query before falling back to per-order calls
+MAX_RECONCILE_PAGES = 10
+
+class OrderType(IntEnum):
+    MARKET = 0
+    LIMIT = 1
+    STOP = 2
+    STOP_LIMIT = 3
 
-class OrderStatus(Enum):
-    PENDING = "Pending"
-    FILLED = "Filled"
-    CANCELLED = "Cancelled"
-    REJECTED = "Rejected"
-    PARTIAL = "PartiallyFilled"
+class OrderStatus(IntEnum):
+    PENDING = 0
+    FILLED = 1
+    CANCELLED = 2
+    REJECTED = 3
+    PARTIAL = 4
 
-@dataclass
+# Bybit orderType string for each OrderType, looked up by plain int index
+_ORDER_TYPE_STR = ("Market", "Limit", "Stop", "StopLimit")
+
+@dataclass(slots=True)
 class Position:
     """Enhanced position tracking"""
     symbol: str
     side: str  # 'long' or 'short'
     entry_price: float
     quantity: float
-    entry_time: float
+    entry_time: float  # wall clock, for logging/reporting
     ema_type: str  # '9', '21', or 'inventory'
     
     # Additional tracking
@@ -38,27 +54,32 @@ class Position:
     unrealized_pnl: float = 0.0
     peak_unrealized_pnl: float = 0.0
     time_in_position: float = 0.0
+    # Monotonic entry stamp for duration math (immune to NTP/wall-clock steps)
+    entry_time_ns: int = field(default_factory=time.monotonic_ns)
     
     # Risk metrics
     stop_loss: Optional[float] = None
     take_profit: Optional[float] = None
     trailing_stop_distance: Optional[float] = None
     
-    def update_pnl(self, current_price: float):
-        """Update P&L calculations"""
-        if self.side == 'long':
-            self.unrealized_pnl = (current_price - self.entry_price) * self.quantity
-        else:
-            self.unrealized_pnl = (self.entry_price - current_price) * self.quantity
+    # +1 long / -1 short, so P&L and stop math need no branch on `side`
+    side_sign: int = field(init=False)
+    
+    def __post_init__(self):
+        self.side_sign = 1 if self.side == 'long' else -1
+    
+    def update_pnl(self, current_price: float, now: Optional[int] = None):
+        """Update P&L calculations; pass `now` (time.monotonic_ns()) to share one clock read across positions"""
+        self.unrealized_pnl = self.side_sign * (current_price - self.entry_price) * self.quantity
             
         # Track peak P&L for drawdown calculation
         if self.unrealized_pnl > self.peak_unrealized_pnl:
             self.peak_unrealized_pnl = self.unrealized_pnl
             
         # Update time in position
-        self.time_in_position = time.time() - self.entry_time
+        self.time_in_position = ((now or time.monotonic_ns()) - self.entry_time_ns) * 1e-9
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Enhanced order tracking"""
     order_id: str
@@ -75,8 +96,9 @@ class Order:
     commission: float = 0.0
     
     # Timing
-    created_time: float = field(default_factory=time.time)
+    created_time: float = field(default_factory=time.time)  # local, taken before the create request
     updated_time: float = field(default_factory=time.time)
+    exchange_created_ms: Optional[int] = None  # Bybit createdTime, once seen in open orders
     
     # Metadata
     ema_type: Optional[str] = None
@@ -94,17 +116,91 @@ class PositionManager:
         self.category = category
         
         # Position tracking
-        self.positions: Dict[str, Position] = {}  # key: position_id
+        self._positions: Dict[str, Position] = {}  # key: position_id
         self.position_counter = 0
         
+        # Hot numeric position state as structure-of-arrays, one slot per open position.
+        # Free slots hold qty=0/side=0/NaN stops so whole-array reductions ignore them.
+        self._slots: Dict[str, int] = {}  # position_id -> slot
+        self._slot_ids: List[Optional[str]] = []  # slot -> position_id (None when free)
+        self._free_slots: List[int] = []
+        self._n = 0  # high-water mark of slots ever used
+        self._pnl_time: Optional[int] = None  # monotonic_ns read of the last update_all_pnl
+        # Set whenever the arrays change; `positions` only re-syncs the Position views then
+        self._views_stale = False
+        
+        # Running aggregates, maintained on add/close so reads are O(1)
+        self._total_exposure = 0.0
+        self._net_base = 0.0
+        self._long_count = 0
+        self._short_count = 0
+        self._upnl_total = 0.0
+        self._alloc(16)
+        
         # Order tracking
         self.active_orders: Dict[str, Order] = {}  # key: order_id
-        self.order_history: List[Order] = []
+        # Bounded so long-running sessions don't grow memory linearly; oldest orders fall off
+        self.order_history: Deque[Order] = deque(maxlen=ORDER_HISTORY_MAXLEN)
         
         # Aggregate metrics
         self.total_volume_traded = 0.0
         self.total_commission_paid = 0.0
         
+    def _alloc(self, capacity: int):
+        """Grow the SoA arrays to `capacity` slots, preserving existing contents."""
+        def grow(old, fill, dtype=np.float64):
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                arr[:len(old)] = old
+            return arr
+        
+        self._qty = grow(getattr(self, '_qty', None), 0.0)
+        self._entry = grow(getattr(self, '_entry', None), 0.0)
+        self._side = grow(getattr(self, '_side', None), 0.0)  # +1 long, -1 short, 0 free
+        self._sl = grow(getattr(self, '_sl', None), np.nan)
+        self._tp = grow(getattr(self, '_tp', None), np.nan)
+        self._trail = grow(getattr(self, '_trail', None), np.nan)
+        self._upnl = grow(getattr(self, '_upnl', None), 0.0)
+        self._peak = grow(getattr(self, '_peak', None), 0.0)
+        self._rpnl = grow(getattr(self, '_rpnl', None), 0.0)
+        self._entry_t = grow(getattr(self, '_entry_t', None), 0, np.int64)  # monotonic_ns
+        # Scratch buffers for tick(); contents are not preserved across calls
+        self._hit = np.zeros(capacity, dtype=bool)
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._slot_ids.extend([None] * (capacity - len(self._slot_ids)))
+        
+    @staticmethod
+    def _level(value: Optional[float]) -> float:
+        """Stop/TP as stored in the arrays: unset (None or 0) becomes NaN, which never triggers."""
+        return value if value else np.nan
+        
+    @property
+    def positions(self) -> Mapping[str, Position]:
+        """
+        Read-only view of open positions keyed by id, numeric fields refreshed from the arrays.
+        The arrays are the source of truth, so setting a field on a returned Position does not
+        change the position: route stop/TP changes through update_position_stops.
+        """
+        if self._views_stale:
+            self._sync_views()
+        return MappingProxyType(self._positions)
+        
+    def _sync_views(self):
+        """Copy every open slot's numeric state back onto its Position object."""
+        now = self._pnl_time
+        for position_id, position in self._positions.items():
+            i = self._slots[position_id]
+            position.quantity = float(self._qty[i])
+            position.unrealized_pnl = float(self._upnl[i])
+            position.peak_unrealized_pnl = float(self._peak[i])
+            position.realized_pnl = float(self._rpnl[i])
+            position.stop_loss = None if np.isnan(self._sl[i]) else float(self._sl[i])
+            position.take_profit = None if np.isnan(self._tp[i]) else float(self._tp[i])
+            position.trailing_stop_distance = None if np.isnan(self._trail[i]) else float(self._trail[i])
+            if now is not None:
+                position.time_in_position = (now - position.entry_time_ns) * 1e-9
+        self._views_stale = False
+        
     def add_position(self, side: str, entry_price: float, 
                     quantity: float, ema_type: str,
                     stop_loss: Optional[float] = None,
@@ -124,114 +220,222 @@ class PositionManager:
             take_profit=take_profit
         )
         
-        self.positions[position_id] = position
-        logger.info(f"Added position {position_id}: {side} {quantity} @ ${entry_price:.4f}")
+        if self._free_slots:
+            i = self._free_slots.pop()
+        else:
+            if self._n == len(self._qty):
+                self._alloc(2 * len(self._qty))
+            i = self._n
+            self._n += 1
+        self._slots[position_id] = i
+        self._slot_ids[i] = position_id
+        self._qty[i] = quantity
+        self._entry[i] = entry_price
+        self._side[i] = position.side_sign
+        self._sl[i] = self._level(stop_loss)
+        self._tp[i] = self._level(take_profit)
+        self._trail[i] = np.nan
+        self._upnl[i] = 0.0
+        self._peak[i] = 0.0
+        self._rpnl[i] = 0.0
+        self._entry_t[i] = position.entry_time_ns
+        
+        self._total_exposure += quantity * entry_price
+        self._net_base += position.side_sign * quantity
+        if position.side_sign > 0:
+            self._long_count += 1
+        else:
+            self._short_count += 1
+        
+        self._positions[position_id] = position
+        self._views_stale = True
+        logger.info("Added position %s: %s %s @ $%.4f", position_id, side, quantity, entry_price)
         
         return position_id
         
+    def _free_slot(self, position_id: str):
+        i = self._slots.pop(position_id)
+        self._slot_ids[i] = None
+        self._qty[i] = 0.0
+        self._side[i] = 0.0
+        self._sl[i] = np.nan
+        self._tp[i] = np.nan
+        self._trail[i] = np.nan
+        self._upnl[i] = 0.0
+        self._peak[i] = 0.0
+        self._free_slots.append(i)
+        
     def update_position_stops(self, position_id: str, 
                             stop_loss: Optional[float] = None,
                             take_profit: Optional[float] = None):
         """Update position stop levels"""
-        if position_id not in self.positions:
+        i = self._slots.get(position_id)
+        if i is None:
             return
-            
-        position = self.positions[position_id]
         
         if stop_loss is not None:
-            position.stop_loss = stop_loss
+            self._sl[i] = self._level(stop_loss)
             
         if take_profit is not None:
-            position.take_profit = take_profit
+            self._tp[i] = self._level(take_profit)
+        self._views_stale = True
             
     def close_position(self, position_id: str, exit_price: float, 
                       exit_quantity: Optional[float] = None) -> float:
         """Close a position and return realized P&L"""
-        if position_id not in self.positions:
-            logger.warning(f"Position {position_id} not found")
+        position = self._positions.get(position_id)
+        if position is None:
+            logger.warning("Position %s not found", position_id)
             return 0.0
             
-        position = self.positions[position_id]
+        i = self._slots[position_id]
+        quantity = float(self._qty[i])
         
         # Use full position quantity if not specified
         if exit_quantity is None:
-            exit_quantity = position.quantity
+            exit_quantity = quantity
         else:
-            exit_quantity = min(exit_quantity, position.quantity)
+            exit_quantity = min(exit_quantity, quantity)
             
         # Calculate P&L
-        if position.side == 'long':
-            pnl = (exit_price - position.entry_price) * exit_quantity
-        else:
-            pnl = (position.entry_price - exit_price) * exit_quantity
+        pnl = position.side_sign * (exit_price - position.entry_price) * exit_quantity
             
-        position.realized_pnl += pnl
-        position.quantity -= exit_quantity
+        self._rpnl[i] += pnl
+        position.realized_pnl = float(self._rpnl[i])
+        quantity -= exit_quantity
+        position.quantity = quantity
+        self._qty[i] = quantity
+        self._total_exposure -= exit_quantity * position.entry_price
+        self._net_base -= position.side_sign * exit_quantity
+        self._views_stale = True
         
         # Remove position if fully closed
-        if position.quantity <= 0:
-            del self.positions[position_id]
-            logger.info(f"Closed position {position_id}: P&L ${pnl:.2f}")
+        if quantity <= 0:
+            del self._positions[position_id]
+            self._upnl_total -= float(self._upnl[i])
+            self._free_slot(position_id)
+            if position.side_sign > 0:
+                self._long_count -= 1
+            else:
+                self._short_count -= 1
+            if not self._positions:
+                # Nothing open: drop any float drift accumulated by the running sums
+                self._recompute_aggregates()
+            logger.info("Closed position %s: P&L $%.2f", position_id, pnl)
         else:
-            logger.info(f"Partially closed position {position_id}: P&L ${pnl:.2f}")
+            logger.info("Partially closed position %s: P&L $%.2f", position_id, pnl)
             
         return pnl
         
+    def _recompute_aggregates(self):
+        """Rebuild the running aggregates from the arrays (drift reset / debugging)."""
+        n = self._n
+        side = self._side[:n]
+        self._total_exposure = float(np.dot(self._qty[:n], self._entry[:n]))
+        self._net_base = float(np.dot(self._qty[:n], side))
+        self._long_count = int(np.count_nonzero(side > 0))
+        self._short_count = int(np.count_nonzero(side < 0))
+        self._upnl_total = float(self._upnl[:n].sum())
+        
     def get_total_exposure(self) -> float:
         """Calculate total market exposure"""
-        total = 0.0
-        for position in self.positions.values():
-            total += position.quantity * position.entry_price
-        return total
+        return self._total_exposure
         
     def get_net_position(self) -> float:
         """Calculate net position (long - short)"""
-        long_qty = sum(p.quantity for p in self.positions.values() if p.side == 'long')
-        short_qty = sum(p.quantity for p in self.positions.values() if p.side == 'short')
-        return long_qty - short_qty
-        
-    def update_all_pnl(self, current_price: float):
-        """Update P&L for all positions"""
-        for position in self.positions.values():
-            position.update_pnl(current_price)
+        return self._net_base
+        
+    def update_all_pnl(self, current_price: float, now: Optional[int] = None):
+        """Update P&L for all positions; `now` is a time.monotonic_ns() reading"""
+        self._pnl_time = now or time.monotonic_ns()
+        self._views_stale = True
+        n = self._n
+        upnl = self._upnl[:n]
+        np.subtract(current_price, self._entry[:n], out=upnl)
+        upnl *= self._qty[:n]
+        upnl *= self._side[:n]
+        # Track peak P&L for drawdown calculation
+        np.maximum(self._peak[:n], upnl, out=self._peak[:n])
+        self._upnl_total = float(upnl.sum())
             
     def check_stop_levels(self, current_price: float) -> List[str]:
         """Check if any positions hit stop levels"""
-        positions_to_close = []
-        
-        for position_id, position in self.positions.items():
-            # Check stop loss
-            if position.stop_loss:
-                if position.side == 'long' and current_price <= position.stop_loss:
-                    positions_to_close.append(position_id)
-                elif position.side == 'short' and current_price >= position.stop_loss:
-                    positions_to_close.append(position_id)
-                    
-            # Check take profit
-            if position.take_profit:
-                if position.side == 'long' and current_price >= position.take_profit:
-                    positions_to_close.append(position_id)
-                elif position.side == 'short' and current_price <= position.take_profit:
-                    positions_to_close.append(position_id)
-                    
-        return positions_to_close
+        n = self._n
+        side, sl, tp = self._side[:n], self._sl[:n], self._tp[:n]
+        
+        # Signed distance past each level; NaN levels (unset, or free slots) never trigger
+        hit = (side * (current_price - sl) <= 0) | (side * (current_price - tp) >= 0)
+        
+        if not hit.any():
+            return []
+        slot_ids = self._slot_ids
+        return [slot_ids[i] for i in np.flatnonzero(hit)]
         
     def update_trailing_stops(self, current_price: float, trail_distance_pct: float):
         """Update trailing stops for all positions"""
-        for position in self.positions.values():
-            if position.side == 'long':
-                # For longs, stop trails upward
-                new_stop = current_price * (1 - trail_distance_pct / 100)
-                if position.stop_loss is None or new_stop > position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_distance = trail_distance_pct
-                    
-            else:  # short
-                # For shorts, stop trails downward
-                new_stop = current_price * (1 + trail_distance_pct / 100)
-                if position.stop_loss is None or new_stop < position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_distance = trail_distance_pct
+        n = self._n
+        side, sl = self._side[:n], self._sl[:n]
+        longs, shorts = side > 0, side < 0
+        
+        # Call-invariant stop levels: for longs the stop trails upward, for shorts downward
+        frac = trail_distance_pct * 0.01
+        self._views_stale = True
+        long_stop = current_price * (1 - frac)
+        short_stop = current_price * (1 + frac)
+        # NaN (unset) compares False, so unset stops always move
+        move = (longs & ~(sl >= long_stop)) | (shorts & ~(sl <= short_stop))
+        
+        # fmax/fmin take the non-NaN operand, so unset stops are set outright
+        np.fmax(sl, long_stop, out=sl, where=longs)
+        np.fmin(sl, short_stop, out=sl, where=shorts)
+        self._trail[:n][move] = trail_distance_pct
+        
+    def tick(self, current_price: float, trail_distance_pct: Optional[float] = None,
+             now: Optional[int] = None) -> List[str]:
+        """
+        Per-price-update pass: P&L + peak, optional trailing-stop update, then stop/TP check.
+        Equivalent to update_all_pnl -> update_trailing_stops -> check_stop_levels, but the
+        side-signed price moves are computed once and intermediates go to preallocated
+        buffers instead of fresh temporaries. Returns ids of positions that hit a level.
+        """
+        self._pnl_time = now or time.monotonic_ns()
+        self._views_stale = True
+        n = self._n
+        if n == 0:
+            self._upnl_total = 0.0
+            return []
+        side, sl, tp = self._side[:n], self._sl[:n], self._tp[:n]
+        upnl, peak = self._upnl[:n], self._peak[:n]
+        hit, mask = self._hit[:n], self._mask[:n]
+        
+        # side * (price - entry) is the per-unit P&L; scale by qty in place
+        np.subtract(current_price, self._entry[:n], out=upnl)
+        upnl *= side
+        upnl *= self._qty[:n]
+        np.maximum(peak, upnl, out=peak)
+        self._upnl_total = float(upnl.sum())
+        
+        if trail_distance_pct is not None:
+            # Trailing stop is price shifted against the position: side * (stop - new) < 0 means tighten
+            offset = current_price * trail_distance_pct / 100
+            unset = np.isnan(sl, out=hit)
+            candidate = current_price - side * offset
+            np.greater(side * (candidate - sl), 0, out=mask)
+            mask |= unset
+            mask &= side != 0
+            sl[mask] = candidate[mask]
+            self._trail[:n][mask] = trail_distance_pct
+        
+        # Signed distance past each level; NaN levels (unset, or free slots) never trigger
+        move = side * (current_price - sl)
+        np.less_equal(move, 0, out=hit)
+        np.multiply(side, current_price - tp, out=move)
+        hit |= move >= 0
+        
+        if not hit.any():
+            return []
+        slot_ids = self._slot_ids
+        return [slot_ids[i] for i in np.flatnonzero(hit)]
                     
     # Order Management Methods
     
@@ -242,8 +446,6 @@ class PositionManager:
         """Place an order through the exchange"""
         try:
             # Format order parameters
-            from bot.utils import format_quantity, format_price
-            
             qty_formatted = format_quantity(quantity, 3)  # Adjust precision as needed
             
             # Build order request
@@ -251,7 +453,7 @@ class PositionManager:
                 'category': self.category,
                 'symbol': self.symbol,
                 'side': side,
-                'orderType': order_type.value,
+                'orderType': _ORDER_TYPE_STR[order_type],
                 'qty': qty_formatted
             }
             
@@ -262,6 +464,7 @@ class PositionManager:
                 order_params['reduceOnly'] = True
                 
             # Place order through client
+            sent_at = time.time()
             response = self.client.place_order(**order_params)
             
             if response and response.get('retCode') == 0:
@@ -276,20 +479,21 @@ class PositionManager:
                     quantity=quantity,
                     price=price,
                     ema_type=ema_type,
-                    reduce_only=reduce_only
+                    reduce_only=reduce_only,
+                    created_time=sent_at
                 )
                 
                 self.active_orders[order_id] = order
-                logger.info(f"Order placed: {order_id} - {side} {quantity} @ "
-                          f"{'Market' if order_type == OrderType.MARKET else price}")
+                logger.info("Order placed: %s - %s %s @ %s", order_id, side, quantity,
+                            'Market' if order_type == OrderType.MARKET else price)
                 
                 return order_id
             else:
-                logger.error(f"Order failed: {response.get('retMsg', 'Unknown error')}")
+                logger.error("Order failed: %s", response.get('retMsg', 'Unknown error'))
                 return None
                 
         except Exception as e:
-            logger.error(f"Error placing order: {e}")
+            logger.error("Error placing order: %s", e)
             return None
             
     def cancel_order(self, order_id: str) -> bool:
@@ -303,23 +507,22 @@ class PositionManager:
             
             if response and response.get('retCode') in [0, 110001]:
                 # 0 = success, 110001 = already filled/cancelled
-                if order_id in self.active_orders:
-                    order = self.active_orders[order_id]
+                order = self.active_orders.pop(order_id, None)
+                if order is not None:
                     order.status = OrderStatus.CANCELLED
                     order.updated_time = time.time()
                     
                     # Move to history
                     self.order_history.append(order)
-                    del self.active_orders[order_id]
                     
-                logger.info(f"Order cancelled: {order_id}")
+                logger.info("Order cancelled: %s", order_id)
                 return True
             else:
-                logger.error(f"Failed to cancel order: {response.get('retMsg', 'Unknown')}")
+                logger.error("Failed to cancel order: %s", response.get('retMsg', 'Unknown'))
                 return False
                 
         except Exception as e:
-            logger.error(f"Error cancelling order: {e}")
+            logger.error("Error cancelling order: %s", e)
             return False
             
     def update_order_status(self, order_id: str):
@@ -334,20 +537,20 @@ class PositionManager:
             if response and response.get('retCode') == 0:
                 orders = response['result']['list']
                 
-                if not orders and order_id in self.active_orders:
+                order = self.active_orders.get(order_id)
+                if not orders and order is not None:
                     # Order not in open orders - check if filled
                     self._check_order_execution(order_id)
                 elif orders:
                     # Update order details
                     order_data = orders[0]
-                    if order_id in self.active_orders:
-                        order = self.active_orders[order_id]
+                    if order is not None:
                         order.filled_qty = float(order_data.get('cumExecQty', 0))
                         order.avg_fill_price = float(order_data.get('avgPrice', 0))
                         order.updated_time = time.time()
                         
         except Exception as e:
-            logger.error(f"Error updating order status: {e}")
+            logger.error("Error updating order status: %s", e)
             
     def _check_order_execution(self, order_id: str):
         """Check if an order was executed"""
@@ -362,58 +565,143 @@ class PositionManager:
             if response and response.get('retCode') == 0:
                 executions = response['result']['list']
                 
-                if executions and order_id in self.active_orders:
-                    order = self.active_orders[order_id]
-                    
-                    # Calculate fill details
-                    total_qty = 0
-                    total_value = 0
-                    total_commission = 0
-                    
-                    for execution in executions:
-                        qty = float(execution['execQty'])
-                        price = float(execution['execPrice'])
-                        commission = float(execution.get('execFee', 0))
-                        
-                        total_qty += qty
-                        total_value += qty * price
-                        total_commission += commission
-                        
-                    if total_qty > 0:
-                        order.filled_qty = total_qty
-                        order.avg_fill_price = total_value / total_qty
-                        order.commission = total_commission
-                        order.status = OrderStatus.FILLED if total_qty >= order.quantity else OrderStatus.PARTIAL
-                        order.updated_time = time.time()
-                        
-                        # Update aggregate metrics
-                        self.total_volume_traded += total_value
-                        self.total_commission_paid += total_commission
-                        
-                        # Move to history if fully filled
-                        if order.status == OrderStatus.FILLED:
-                            self.order_history.append(order)
-                            del self.active_orders[order_id]
-                            logger.info(f"Order filled: {order_id} - {total_qty} @ ${order.avg_fill_price:.4f}")
+                order = self.active_orders.get(order_id)
+                if executions and order is not None:
+                    self._apply_executions(order_id, order, executions)
                             
         except Exception as e:
-            logger.error(f"Error checking order execution: {e}")
+            logger.error("Error checking order execution: %s", e)
+            
+    def _apply_executions(self, order_id: str, order: Order, executions: List[Dict]):
+        """Fold an order's fills into its tracking record"""
+        # Calculate fill details
+        total_qty = 0
+        total_value = 0
+        total_commission = 0
+        
+        for execution in executions:
+            qty = float(execution['execQty'])
+            price = float(execution['execPrice'])
+            commission = float(execution.get('execFee', 0))
+            
+            total_qty += qty
+            total_value += qty * price
+            total_commission += commission
+            
+        if total_qty > 0:
+            order.filled_qty = total_qty
+            order.avg_fill_price = total_value / total_qty
+            order.commission = total_commission
+            order.status = OrderStatus.FILLED if total_qty >= order.quantity else OrderStatus.PARTIAL
+            order.updated_time = time.time()
+            
+            # Update aggregate metrics
+            self.total_volume_traded += total_value
+            self.total_commission_paid += total_commission
+            
+            # Move to history if fully filled
+            if order.status == OrderStatus.FILLED:
+                self.order_history.append(order)
+                self.active_orders.pop(order_id, None)
+                logger.info("Order filled: %s - %s @ $%.4f", order_id, total_qty, order.avg_fill_price)
+                
+    def _fetch_pages(self, fetch, **params) -> Tuple[List[Dict], bool]:
+        """
+        Follow nextPageCursor for a list endpoint. Returns (rows, complete); complete is False
+        if a request failed or MAX_RECONCILE_PAGES was reached with more pages left.
+        """
+        rows: List[Dict] = []
+        cursor = None
+        for _ in range(MAX_RECONCILE_PAGES):
+            response = fetch(cursor=cursor, **params)
+            if not (response and response.get('retCode') == 0):
+                return rows, False
+            result = response['result']
+            rows.extend(result['list'])
+            cursor = result.get('nextPageCursor')
+            if not cursor or not result['list']:
+                return rows, True
+        return rows, False
+
+    def refresh_all_orders(self):
+        """
+        Reconcile every active order with one paginated open-orders query for the symbol and
+        one paginated executions query covering all orders that left the book. If either
+        listing is incomplete, the affected orders fall back to the per-order calls.
+        """
+        if not self.active_orders:
+            return
+        try:
+            open_orders, complete = self._fetch_pages(
+                self.client.get_open_orders,
+                category=self.category,
+                symbol=self.symbol,
+                limit=50
+            )
+            if not complete:
+                # Absence from a partial listing proves nothing; check orders one by one
+                for order_id in list(self.active_orders):
+                    self.update_order_status(order_id)
+                return
+            open_by_id = {o['orderId']: o for o in open_orders}
+            
+            now = time.time()
+            gone = []
+            for order_id, order in self.active_orders.items():
+                order_data = open_by_id.get(order_id)
+                if order_data is None:
+                    gone.append(order_id)
+                    continue
+                order.filled_qty = float(order_data.get('cumExecQty', 0))
+                order.avg_fill_price = float(order_data.get('avgPrice', 0))
+                order.updated_time = now
+                if order.exchange_created_ms is None and order_data.get('createdTime'):
+                    order.exchange_created_ms = int(order_data['createdTime'])
+            
+            if not gone:
+                return
+            
+            # One executions query from the oldest departed order's creation onwards. Prefer the
+            # exchange's createdTime; the local stamp gets a margin for skew and in-flight fills
+            start_ms = min(
+                order.exchange_created_ms if order.exchange_created_ms is not None
+                else (order.created_time - EXECUTION_LOOKBACK_MARGIN_S) * 1000
+                for order in (self.active_orders[oid] for oid in gone)
+            )
+            executions, complete = self._fetch_pages(
+                self.client.get_executions,
+                category=self.category,
+                symbol=self.symbol,
+                limit=100,
+                startTime=start_ms
+            )
+            if not complete:
+                for order_id in gone:
+                    self._check_order_execution(order_id)
+                return
+            
+            fills_by_order: Dict[str, List[Dict]] = {}
+            for execution in executions:
+                fills_by_order.setdefault(execution.get('orderId'), []).append(execution)
+            for order_id in gone:
+                order_executions = fills_by_order.get(order_id)
+                order = self.active_orders.get(order_id)
+                if order_executions and order is not None:
+                    self._apply_executions(order_id, order, order_executions)
+                    
+        except Exception as e:
+            logger.error("Error refreshing orders: %s", e)
             
     def get_position_summary(self) -> Dict:
         """Get summary of all positions"""
-        long_positions = [p for p in self.positions.values() if p.side == 'long']
-        short_positions = [p for p in self.positions.values() if p.side == 'short']
-        
-        total_unrealized_pnl = sum(p.unrealized_pnl for p in self.positions.values())
-        
         return {
-            'total_positions': len(self.positions),
-            'long_positions': len(long_positions),
-            'short_positions': len(short_positions),
-            'net_position': self.get_net_position(),
-            'total_exposure': self.get_total_exposure(),
-            'unrealized_pnl': total_unrealized_pnl,
+            'total_positions': len(self._positions),
+            'long_positions': self._long_count,
+            'short_positions': self._short_count,
+            'net_position': self._net_base,
+            'total_exposure': self._total_exposure,
+            'unrealized_pnl': self._upnl_total,
             'active_orders': len(self.active_orders),
             'total_volume': self.total_volume_traded,
             'total_commission': self.total_commission_paid
-        }
\ No newline at end of file
+        }
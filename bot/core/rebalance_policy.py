@@ -1,5 +1,90 @@
 from dataclasses import dataclass
-from typing import Optional
+from enum import IntEnum
+from typing import NamedTuple, Optional, Tuple
+
+
+class RebalanceAction(IntEnum):
+    NONE = 0
+    PARTIAL = 1
+    FULL = 2
+
+
+class Decision(NamedTuple):
+    action: RebalanceAction
+    target_trade_base: float  # signed, + buy base, - sell base
+
+
+class EmaReason(IntEnum):
+    DISABLED = 0
+    NOT_INITIALIZED = 1
+    POSITION_TOO_SMALL = 2
+    COOLDOWN = 3
+    NO_TRIGGER = 4
+    LONG_BREAKOUT = 5
+    LONG_EMA_TOUCH = 6
+    SHORT_BREAKOUT = 7
+    SHORT_EMA_TOUCH = 8
+
+
+_EMA_REASON_TEMPLATES = (
+    "",
+    "EMAs not initialized",
+    "Position too small",
+    "Cooldown active",
+    "No EMA trigger",
+    "Long in uptrend: price {pct:.2f}% above {ema} (defensive profit-taking)",
+    "Long in downtrend: price near {ema} ({pct:.2f}% - defensive exit)",
+    "Short in downtrend: price {apct:.2f}% below {ema} (defensive profit-taking)",
+    "Short in uptrend: price near {ema} ({pct:.2f}% - defensive exit)",
+)
+
+# Trend label -> sign, so long/short x up/down collapses to one product
+TREND_SIGN = {"UPTREND": 1, "DOWNTREND": -1}
+
+
+class EmaCheck(NamedTuple):
+    should_rebalance: bool
+    reason_code: EmaReason
+    suggested_ratio: float  # 0.0 to 1.0, portion of position to reduce
+    price_vs_ema_pct: float = 0.0
+    ema_period: int = 0  # only used to label the reason
+
+    @property
+    def reason(self) -> str:
+        """Human-readable reason, formatted only when someone asks for it."""
+        ema = f"EMA{self.ema_period}" if self.ema_period else "EMA"
+        pct = self.price_vs_ema_pct
+        return _EMA_REASON_TEMPLATES[self.reason_code].format(pct=pct, apct=abs(pct), ema=ema)
+
+
+def ema_trigger(
+    position_usdt: float,
+    trend: str,
+    price_vs_ema_pct: float,
+    breakout_pct: float,
+    touch_pct: float,
+) -> EmaReason:
+    """
+    Shared EMA trigger test. With dir = sign(position) and trend as +1/-1:
+    - dir * trend > 0 (riding the trend): trigger when price is breakout_pct past the EMA in our favour
+    - dir * trend < 0 (against the trend): trigger when price is back within touch_pct of the EMA
+    """
+    direction = (position_usdt > 0) - (position_usdt < 0)
+    aligned = direction * TREND_SIGN.get(trend, 0)
+    if aligned > 0 and direction * price_vs_ema_pct >= breakout_pct:
+        return EmaReason.LONG_BREAKOUT if direction > 0 else EmaReason.SHORT_BREAKOUT
+    if aligned < 0 and abs(price_vs_ema_pct) <= touch_pct:
+        return EmaReason.LONG_EMA_TOUCH if direction > 0 else EmaReason.SHORT_EMA_TOUCH
+    return EmaReason.NO_TRIGGER
+
+
+# Shared results for the common no-action cases, so per-tick calls don't allocate
+DECISION_NONE = Decision(RebalanceAction.NONE, 0.0)
+EMA_DISABLED = EmaCheck(False, EmaReason.DISABLED, 0.0)
+EMA_NOT_INITIALIZED = EmaCheck(False, EmaReason.NOT_INITIALIZED, 0.0)
+EMA_POSITION_TOO_SMALL = EmaCheck(False, EmaReason.POSITION_TOO_SMALL, 0.0)
+EMA_COOLDOWN = EmaCheck(False, EmaReason.COOLDOWN, 0.0)
+EMA_NO_TRIGGER = EmaCheck(False, EmaReason.NO_TRIGGER, 0.0)
 
 
 @dataclass
@@ -23,6 +108,61 @@ class EmaRebalanceConfig:
     ema_partial_ratio: float = 0.3
 
 
+def _effective_thresholds(
+    soft: float,
+    hard: float,
+    units_is_base: bool,
+    spot_notional_quote: float,
+    mark_price: float,
+    combined_bias: float,
+    bias_strength: float,
+) -> Tuple[float, float]:
+    """Scalar kernel behind RebalancePolicy.compute_effective_thresholds (primitives only)."""
+    if not units_is_base:
+        # percent of spot notional — convert to base: value * notional_quote / mark_price,
+        # with one division shared by both thresholds
+        scale = spot_notional_quote / (mark_price if mark_price > 1e-12 else 1e-12)
+        soft *= scale
+        hard *= scale
+    bs = 0.0 if bias_strength < 0.0 else 1.0 if bias_strength > 1.0 else bias_strength
+    cb = -1.0 if combined_bias < -1.0 else 1.0 if combined_bias > 1.0 else combined_bias
+    eff_soft = soft * (1.0 + bs * cb)
+    eff_hard = hard * (1.0 + 0.5 * bs * cb)
+    # enforce ordering and floor
+    if eff_soft < 0.0:
+        eff_soft = 0.0
+    if eff_hard < eff_soft:
+        eff_hard = eff_soft
+    return eff_soft, eff_hard
+
+
+def _decide_kernel(
+    gap: float,
+    eff_soft: float,
+    eff_hard: float,
+    partial_ratio: float,
+    hysteresis_fraction: float,
+    last_thr: float,
+    last_side: int,
+) -> Tuple[RebalanceAction, float, float, int]:
+    """
+    Scalar kernel behind RebalancePolicy.decide. last_side == 0 means no prior action.
+    Returns (action_code, target_trade_base, new_last_thr, new_last_side).
+    """
+    side_needed = (gap > 0.0) - (gap < 0.0)
+    abs_gap = gap if gap >= 0 else -gap
+
+    # Hysteresis check: the product is -1 only for a side flip (0 when either side is unset)
+    if side_needed * last_side == -1 and abs_gap < hysteresis_fraction * last_thr:
+        return RebalanceAction.NONE, 0.0, last_thr, last_side
+
+    if abs_gap >= eff_hard and eff_hard > 0:
+        return RebalanceAction.FULL, -gap, eff_hard, side_needed  # full restore
+    if abs_gap >= eff_soft and eff_soft > 0:
+        return RebalanceAction.PARTIAL, -partial_ratio * gap, eff_soft, side_needed
+    return RebalanceAction.NONE, 0.0, last_thr, last_side
+
+
 class RebalancePolicy:
     def __init__(
         self,
@@ -34,15 +174,16 @@ class RebalancePolicy:
         self.th = thresholds
         self.partial_ratio = max(0.0, min(1.0, partial_ratio))
         self.hysteresis_fraction = max(0.0, min(1.0, hysteresis_fraction))
-        self._last_action_threshold_used_abs: float | None = None
-        self._last_action_side: int | None = None  # +1 sell, -1 buy
+        self._units_is_base = thresholds.units == 'base'
+        self._last_action_threshold_used_abs: float = 0.0
+        self._last_action_side: int = 0  # +1 sell, -1 buy, 0 no action yet
         
         # EMA-based opportunistic rebalancing
         self.ema_config = ema_config or EmaRebalanceConfig(enabled=False)
-        self._last_ema_rebalance_time: float = 0.0
+        self._last_ema_rebalance_time: float = float('-inf')  # time.monotonic() of the last EMA rebalance
 
     def _to_base_units(self, value: float, spot_notional_quote: float, mark_price: float) -> float:
-        if self.th.units == 'base':
+        if self._units_is_base:
             return value
         # percent of spot notional — convert to base: (value * notional_quote) / mark_price
         return (value * spot_notional_quote) / max(mark_price, 1e-12)
@@ -55,16 +196,10 @@ class RebalancePolicy:
         bias_strength: float,
     ) -> tuple[float, float]:
         """Return (soft_base, hard_base) with bias expansion/shrink."""
-        base_soft = self._to_base_units(self.th.soft, spot_notional_quote, mark_price)
-        base_hard = self._to_base_units(self.th.hard, spot_notional_quote, mark_price)
-        bs = max(0.0, min(1.0, bias_strength))
-        cb = max(-1.0, min(1.0, combined_bias))
-        eff_soft = base_soft * (1.0 + bs * cb)
-        eff_hard = base_hard * (1.0 + 0.5 * bs * cb)
-        # enforce ordering and floor
-        eff_soft = max(0.0, eff_soft)
-        eff_hard = max(eff_soft, eff_hard)
-        return eff_soft, eff_hard
+        return _effective_thresholds(
+            self.th.soft, self.th.hard, self._units_is_base,
+            spot_notional_quote, mark_price, combined_bias, bias_strength,
+        )
 
     def check_ema_rebalance_opportunity(
         self,
@@ -73,7 +208,7 @@ class RebalancePolicy:
         trend: str,
         position_usdt: float,
         current_time: float,
-    ) -> dict:
+    ) -> EmaCheck:
         """
         Check if EMA-based opportunistic rebalancing should trigger.
         
@@ -81,67 +216,31 @@ class RebalancePolicy:
         - If long in uptrend: rebalance when price breaks X% above fast EMA (take profits defensively)
         - If long in downtrend: rebalance when price comes back to fast EMA (defensive exit opportunity)
         
-        Returns dict with:
-          - should_rebalance: bool
-          - reason: str
-          - suggested_ratio: float (0.0 to 1.0, portion of position to reduce)
+        Returns an EmaCheck(should_rebalance, reason, suggested_ratio).
         """
         if not self.ema_config.enabled:
-            return {"should_rebalance": False, "reason": "", "suggested_ratio": 0.0}
+            return EMA_DISABLED
         
         # Only trigger if we have a meaningful position
         if abs(position_usdt) < self.ema_config.min_position_usdt:
-            return {"should_rebalance": False, "reason": "Position too small", "suggested_ratio": 0.0}
+            return EMA_POSITION_TOO_SMALL
         
         # Cooldown check (prevent too frequent EMA-based rebalances)
         min_cooldown = 60.0  # Minimum 60 seconds between EMA rebalances
         if current_time - self._last_ema_rebalance_time < min_cooldown:
-            return {"should_rebalance": False, "reason": "Cooldown active", "suggested_ratio": 0.0}
+            return EMA_COOLDOWN
         
-        is_long = position_usdt > 0
         price_vs_ema_pct = ((current_price - ema_fast) / ema_fast) * 100.0 if ema_fast > 0 else 0.0
-        
-        # Case 1: Long position in uptrend - rebalance when price breaks X% above fast EMA
-        if is_long and trend == "UPTREND":
-            if price_vs_ema_pct >= self.ema_config.uptrend_breakout_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Long in uptrend: price {price_vs_ema_pct:.2f}% above EMA (defensive profit-taking)",
-                    "suggested_ratio": self.ema_config.ema_partial_ratio
-                }
-        
-        # Case 2: Long position in downtrend - rebalance when price comes back to fast EMA
-        elif is_long and trend == "DOWNTREND":
-            # In downtrend, we want to exit when price rallies back near the EMA
-            # Check if price is within X% of the EMA (either side)
-            if abs(price_vs_ema_pct) <= self.ema_config.downtrend_ema_touch_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Long in downtrend: price near EMA ({price_vs_ema_pct:.2f}% - defensive exit)",
-                    "suggested_ratio": self.ema_config.ema_partial_ratio
-                }
-        
-        # Case 3: Short position logic (mirror of long logic)
-        elif not is_long and position_usdt < 0:
-            # Short in downtrend: rebalance when price breaks X% below fast EMA
-            if trend == "DOWNTREND" and price_vs_ema_pct <= -self.ema_config.uptrend_breakout_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Short in downtrend: price {abs(price_vs_ema_pct):.2f}% below EMA (defensive profit-taking)",
-                    "suggested_ratio": self.ema_config.ema_partial_ratio
-                }
-            # Short in uptrend: rebalance when price comes back to fast EMA
-            elif trend == "UPTREND" and abs(price_vs_ema_pct) <= self.ema_config.downtrend_ema_touch_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Short in uptrend: price near EMA ({price_vs_ema_pct:.2f}% - defensive exit)",
-                    "suggested_ratio": self.ema_config.ema_partial_ratio
-                }
-        
-        return {"should_rebalance": False, "reason": "No EMA trigger", "suggested_ratio": 0.0}
+        cfg = self.ema_config
+        code = ema_trigger(
+            position_usdt, trend, price_vs_ema_pct, cfg.uptrend_breakout_pct, cfg.downtrend_ema_touch_pct
+        )
+        if code is EmaReason.NO_TRIGGER:
+            return EMA_NO_TRIGGER
+        return EmaCheck(True, code, cfg.ema_partial_ratio, price_vs_ema_pct)
 
     def mark_ema_rebalance(self, current_time: float):
-        """Mark that an EMA-based rebalance occurred"""
+        """Mark that an EMA-based rebalance occurred (current_time from time.monotonic())"""
         self._last_ema_rebalance_time = current_time
 
     def decide(
@@ -149,33 +248,18 @@ class RebalancePolicy:
         delta_gap_base: float,
         eff_soft: float,
         eff_hard: float,
-    ) -> dict:
+    ) -> Decision:
         """
-        Returns a decision dict with keys:
-          - action: 'none' | 'partial' | 'full'
+        Returns Decision(action, target_trade_base):
+          - action: RebalanceAction.NONE | PARTIAL | FULL
           - target_trade_base: float (signed, + buy base, - sell base)
         Hysteresis: require a fraction of the last threshold in the opposite direction before acting again.
         """
-        gap = delta_gap_base  # positive => long vs desired; we need to SELL spot
-        side_needed = 1 if gap > 0 else -1 if gap < 0 else 0
-
-        # Hysteresis check
-        if self._last_action_threshold_used_abs is not None and self._last_action_side is not None:
-            if side_needed != 0 and side_needed == -self._last_action_side:
-                required = self.hysteresis_fraction * self._last_action_threshold_used_abs
-                if abs(gap) < required:
-                    return {"action": "none", "target_trade_base": 0.0}
-
-        if abs(gap) >= eff_hard and eff_hard > 0:
-            target = -gap  # full restore
-            self._last_action_threshold_used_abs = eff_hard
-            self._last_action_side = side_needed
-            return {"action": "full", "target_trade_base": target}
-        if abs(gap) >= eff_soft and eff_soft > 0:
-            target = -self.partial_ratio * gap
-            self._last_action_threshold_used_abs = eff_soft
-            self._last_action_side = side_needed
-            return {"action": "partial", "target_trade_base": target}
-        return {"action": "none", "target_trade_base": 0.0}
-
-
+        # positive gap => long vs desired; we need to SELL spot
+        action, target, self._last_action_threshold_used_abs, self._last_action_side = _decide_kernel(
+            delta_gap_base, eff_soft, eff_hard, self.partial_ratio, self.hysteresis_fraction,
+            self._last_action_threshold_used_abs, self._last_action_side,
+        )
+        if action is RebalanceAction.NONE:
+            return DECISION_NONE
+        return Decision(action, target)
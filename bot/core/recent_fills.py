@@ -1,10 +1,14 @@
+import logging
 import time
-from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
 class Fill:
     ts: float
     side: str  # 'Buy' or 'Sell'
@@ -12,12 +16,38 @@ class Fill:
     qty: float  # base units
 
 
+def _vwap_kernel(
+    ts: np.ndarray, price: np.ndarray, qty: np.ndarray, side: np.ndarray, cutoff: float
+) -> Tuple[float, float, float, float, float, int]:
+    """
+    Windowed side-split reduction over the fill columns.
+    Returns (buy_notional, buy_qty, sell_notional, sell_qty, net_imbalance_base, count).
+    """
+    # Out-of-window rows get zero weight; side > 0 picks the bincount bucket (0 sell, 1 buy)
+    q = np.where(ts >= cutoff, qty, 0.0)
+    bucket = side > 0
+    qty_by_side = np.bincount(bucket, weights=q, minlength=2)
+    notional_by_side = np.bincount(bucket, weights=q * price, minlength=2)
+    sell_qty, buy_qty = float(qty_by_side[0]), float(qty_by_side[1])
+    return (
+        float(notional_by_side[1]), buy_qty,
+        float(notional_by_side[0]), sell_qty,
+        buy_qty - sell_qty,
+        int(np.count_nonzero(q)),
+    )
+
+
 class RecentFillsAnchor:
     """
     Maintains a rolling window of the user's spot executions and computes
     side-specific VWAPs (buy_vwap, sell_vwap) and net base imbalance.
 
     Data source: Bybit private executions API (category='spot').
+
+    Fills are stored as parallel NumPy columns (ts, price, qty, side sign) so the
+    VWAP reduction runs as masked array ops. The live window is the contiguous
+    slice [_start, _end) of buffers sized 2 * max_cached; when the tail reaches the
+    end the live rows are copied back to the front (amortized O(1) per append).
     """
 
     def __init__(
@@ -27,101 +57,158 @@ class RecentFillsAnchor:
         window_seconds: int = 600,
         poll_interval_s: float = 3.0,
         max_cached: int = 500,
+        cache_bucket_s: float = 1.0,
     ):
         self.client = client
         self.symbol = symbol
         self.window_seconds = max(60, int(window_seconds))
         self.poll_interval_s = max(1.0, float(poll_interval_s))
-        self.fills: Deque[Fill] = deque(maxlen=max_cached)
-        self._last_poll_time: float = 0.0
-        self._last_exec_id: Optional[str] = None
+        self.max_cached = max(1, int(max_cached))
+        cap = 2 * self.max_cached
+        self._ts = np.zeros(cap, dtype=np.float64)
+        self._price = np.zeros(cap, dtype=np.float64)
+        self._qty = np.zeros(cap, dtype=np.float64)
+        self._side = np.zeros(cap, dtype=np.int8)  # +1 Buy, -1 Sell
+        self._start = 0
+        self._end = 0
+        # Exec times normally arrive in order; one out-of-order row drops pruning
+        # back to the linear scan until the window empties
+        self._ts_sorted = True
+        # get_anchor() memo: reused until a fill is appended or the window cutoff
+        # crosses into a new cache_bucket_s bucket (0 disables the memo)
+        self.cache_bucket_s = max(0.0, float(cache_bucket_s))
+        self._appended = 0
+        self._anchor_key: Optional[Tuple[int, int]] = None
+        self._anchor: dict = {}
+        self._last_poll_time: float = float('-inf')  # time.monotonic()
+        # execIds already ingested (insertion-ordered so the oldest half can be evicted);
+        # every poll re-reads the latest 100 executions, so most records are repeats
+        self._seen_exec_ids: Dict[str, None] = {}
+        # Field names Bybit uses in execution records, detected from the first record
+        self._k_id: Optional[str] = None
+        self._k_price = "execPrice"
+        self._k_qty = "execQty"
+        self._k_ts = "execTime"
 
     def _fetch_new_fills(self) -> None:
-        now = time.time()
-        if now - self._last_poll_time < self.poll_interval_s:
+        t = time.monotonic()
+        if t - self._last_poll_time < self.poll_interval_s:
             return
-        self._last_poll_time = now
-
-        try:
-            resp = self.client.get_executions(category="spot", symbol=self.symbol, limit=100)
-            if not resp or resp.get("retCode") != 0:
-                return
-            records = resp.get("result", {}).get("list", []) or []
-            # API returns most recent first typically; process oldest→newest
-            records = list(reversed(records))
-
-            for r in records:
-                # Use execId as unique; skip ones we've already processed
-                exec_id = r.get("execId") or r.get("execID")
-                if self._last_exec_id is not None and exec_id is not None:
-                    # fast path: if seen id matches, likely older ones too
-                    # but to be safe we won't break; we skip duplicates
-                    pass
-
-                try:
-                    side = r.get("side")
-                    price = float(r.get("execPrice") or r.get("price") or 0)
-                    qty = float(r.get("execQty") or r.get("qty") or 0)
-                    # execTime may be in ms
-                    ts_raw = r.get("execTime") or r.get("time")
-                    ts_sec = float(ts_raw) / 1000.0 if ts_raw and int(ts_raw) > 1e12 else float(ts_raw or 0)
-                except (TypeError, ValueError):
-                    continue
-
-                if price <= 0 or qty <= 0 or side not in ("Buy", "Sell"):
-                    continue
-
-                # Avoid duplicate append by comparing last element
-                if self.fills and exec_id is not None:
-                    # crude duplicate check: same ts, side, qty, price
-                    last = self.fills[-1]
-                    if (
-                        abs(last.ts - ts_sec) < 1e-6
-                        and last.side == side
-                        and abs(last.price - price) < 1e-12
-                        and abs(last.qty - qty) < 1e-12
-                    ):
-                        continue
-
-                self.fills.append(Fill(ts=ts_sec or now, side=side, price=price, qty=qty))
-                self._last_exec_id = exec_id or self._last_exec_id
-
-            self._prune_old()
-        except Exception:
-            # Silent fail; upstream handles logging
-            pass
-
-    def _prune_old(self) -> None:
-        cutoff = time.time() - self.window_seconds
-        while self.fills and self.fills[0].ts < cutoff:
-            self.fills.popleft()
+        self._last_poll_time = t
+        now = time.time()  # wall clock, for fills without an exec time
 
-    def update(self) -> None:
-        self._fetch_new_fills()
+        # The client already turns request failures into None; anything else raised here is a bug
+        resp = self.client.get_executions(category="spot", symbol=self.symbol, limit=100)
+        if not resp or resp.get("retCode") != 0:
+            logger.warning("Executions poll failed for %s: %s", self.symbol, resp.get("retMsg") if resp else "no response")
+            return
+        records = resp.get("result", {}).get("list", []) or []
+        if not records:
+            return
+        if self._k_id is None:
+            self._detect_schema(records[0])
+        k_id, k_price, k_qty, k_ts = self._k_id, self._k_price, self._k_qty, self._k_ts
+        seen = self._seen_exec_ids
+        # Locals for the per-record loop (saves attribute/global lookups per record)
+        append, remember, _float = self._append, self._remember_exec_id, float
+
+        # API returns most recent first typically; process oldest→newest
+        for r in reversed(records):
+            # Use execId as unique; skip ones we've already processed
+            exec_id = r.get(k_id) or None
+            if exec_id is not None and exec_id in seen:
+                continue
 
-    def _compute_vwaps(self) -> Tuple[Optional[float], Optional[float], float]:
-        cutoff = time.time() - self.window_seconds
-        buy_notional = 0.0
-        buy_qty = 0.0
-        sell_notional = 0.0
-        sell_qty = 0.0
-        net_imbalance_base = 0.0
+            try:
+                side = r["side"]
+                price = _float(r[k_price])
+                qty = _float(r[k_qty])
+                # execTime may be in ms
+                ts_sec = _float(r.get(k_ts) or 0)
+                if ts_sec > 1e12:
+                    ts_sec /= 1000.0
+            except (KeyError, TypeError, ValueError):
+                continue
 
-        for f in self.fills:
-            if f.ts < cutoff:
+            if price <= 0 or qty <= 0 or side not in ("Buy", "Sell"):
                 continue
-            if f.side == "Buy":
-                buy_notional += f.price * f.qty
-                buy_qty += f.qty
-                net_imbalance_base += f.qty
-            else:
-                sell_notional += f.price * f.qty
-                sell_qty += f.qty
-                net_imbalance_base -= f.qty
 
+            if exec_id is not None:
+                remember(exec_id)
+            append(ts_sec or now, 1 if side == "Buy" else -1, price, qty)
+
+        self._prune_old(now)
+
+    def _detect_schema(self, record: dict) -> None:
+        """Pick the execution field names once instead of trying fallbacks per record."""
+        self._k_id = "execId" if "execId" in record else "execID"
+        self._k_price = "execPrice" if "execPrice" in record else "price"
+        self._k_qty = "execQty" if "execQty" in record else "qty"
+        self._k_ts = "execTime" if "execTime" in record else "time"
+
+    def _remember_exec_id(self, exec_id: str) -> None:
+        seen = self._seen_exec_ids
+        seen[exec_id] = None
+        if len(seen) > 2000:
+            # Evict the oldest half; those executions are long past the API's latest-100 page
+            for old in list(seen)[:len(seen) // 2]:
+                del seen[old]
+
+    def _append(self, ts: float, sign: int, price: float, qty: float) -> None:
+        if self._end == len(self._ts):
+            # Keep at most max_cached - 1 rows so the new one fits within the cap
+            keep_from = max(self._start, self._end - self.max_cached + 1)
+            n = self._end - keep_from
+            for col in (self._ts, self._price, self._qty, self._side):
+                col[:n] = col[keep_from:self._end]
+            self._start, self._end = 0, n
+        i = self._end
+        if i > self._start and ts < self._ts[i - 1]:
+            self._ts_sorted = False
+        self._ts[i] = ts
+        self._side[i] = sign
+        self._price[i] = price
+        self._qty[i] = qty
+        self._end = i + 1
+        self._appended += 1
+        if self._end - self._start > self.max_cached:
+            self._start += 1  # bounded like deque(maxlen=max_cached)
+
+    @property
+    def fills(self) -> List[Fill]:
+        """Object view of the cached fills, oldest first."""
+        sl = slice(self._start, self._end)
+        return [
+            Fill(ts=float(t), side="Buy" if s > 0 else "Sell", price=float(p), qty=float(q))
+            for t, s, p, q in zip(self._ts[sl], self._side[sl], self._price[sl], self._qty[sl])
+        ]
+
+    def _prune_old(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        # Head still inside the window: nothing to expire
+        if self._start == self._end or self._ts[self._start] >= cutoff:
+            return
+        if self._ts_sorted:
+            self._start += int(np.searchsorted(self._ts[self._start:self._end], cutoff))
+        else:
+            while self._start < self._end and self._ts[self._start] < cutoff:
+                self._start += 1
+        if self._start == self._end:
+            self._ts_sorted = True
+
+    def update(self) -> None:
+        self._fetch_new_fills()
+
+    def _compute_vwaps(self, now: float) -> Tuple[Optional[float], Optional[float], float, int]:
+        """Returns (buy_vwap, sell_vwap, net_imbalance_base, sample_count) over the window ending at `now`."""
+        sl = slice(self._start, self._end)
+        buy_notional, buy_qty, sell_notional, sell_qty, net_imbalance_base, count = _vwap_kernel(
+            self._ts[sl], self._price[sl], self._qty[sl], self._side[sl],
+            now - self.window_seconds,
+        )
         buy_vwap = (buy_notional / buy_qty) if buy_qty > 0 else None
         sell_vwap = (sell_notional / sell_qty) if sell_qty > 0 else None
-        return buy_vwap, sell_vwap, net_imbalance_base
+        return buy_vwap, sell_vwap, net_imbalance_base, count
 
     def get_anchor(self) -> dict:
         """
@@ -134,14 +221,23 @@ class RecentFillsAnchor:
             'sample_count': int
           }
         """
-        self._prune_old()
-        buy_vwap, sell_vwap, net_imbalance = self._compute_vwaps()
-        return {
+        now = time.time()  # one clock read shared by the memo key, pruning and the VWAP window
+        if self.cache_bucket_s > 0:
+            key = (self._appended, int(now // self.cache_bucket_s))
+            if key == self._anchor_key:
+                return dict(self._anchor)
+        else:
+            key = None
+        self._prune_old(now)
+        buy_vwap, sell_vwap, net_imbalance, sample_count = self._compute_vwaps(now)
+        self._anchor = {
             "buy_vwap": buy_vwap,
             "sell_vwap": sell_vwap,
             "net_fill_imbalance_base": net_imbalance,
             "window_s": self.window_seconds,
-            "sample_count": sum(1 for f in self.fills if f.ts >= time.time() - self.window_seconds),
+            "sample_count": sample_count,
         }
+        self._anchor_key = key
+        return dict(self._anchor)
 
 
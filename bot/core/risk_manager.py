@@ -6,10 +6,13 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+HALT_COOLDOWN_SECONDS = 3600.0
+
+@dataclass(slots=True)
 class RiskMetrics:
     """Risk metrics tracking"""
     max_drawdown_pct: float = 0.0
@@ -19,7 +22,7 @@ class RiskMetrics:
     peak_balance: float = 0.0
     current_balance: float = 0.0
     
-@dataclass
+@dataclass(slots=True)
 class RiskLimits:
     """Risk limit configuration"""
     max_drawdown_pct: float = 20.0  # Maximum drawdown allowed
@@ -42,14 +45,26 @@ class RiskManager:
             current_balance=initial_balance
         )
         
-        # Daily tracking
-        self.daily_pnl_history: Dict[str, float] = {}
-        self.trade_history: List[Dict] = []
+        # Daily tracking, keyed by local date ordinal (date.fromordinal() for display)
+        self.daily_pnl_history: Dict[int, float] = {}
+        self.trade_history: List[Dict] = []  # 'timestamp' is epoch seconds
+        # Running performance aggregates, folded in by record_trade so metrics are O(1)
+        self._n_trades = 0
+        self._n_wins = 0
+        self._n_losses = 0
+        self._total_wins = 0.0
+        self._total_losses = 0.0  # sum of losing P&L (<= 0)
+        self._ret_mean = 0.0  # Welford running mean / sum of squared deviations of return_pct
+        self._ret_m2 = 0.0
+        # Current local day and the epoch second it ends, so record_trade only
+        # touches datetime once per day
+        self._day_key = 0
+        self._day_end = 0.0
         
         # Circuit breaker states
         self.trading_halted = False
         self.halt_reason = None
-        self.halt_time = None
+        self.halt_time: Optional[float] = None  # time.monotonic() when halted
         
     def update_balance(self, new_balance: float):
         """Update current balance and calculate metrics"""
@@ -73,8 +88,9 @@ class RiskManager:
     def record_trade(self, pnl: float, entry_price: float, 
                     exit_price: float, quantity: float):
         """Record a completed trade"""
+        now = time.time()
         trade = {
-            'timestamp': datetime.now(),
+            'timestamp': now,
             'pnl': pnl,
             'entry_price': entry_price,
             'exit_price': exit_price,
@@ -83,6 +99,7 @@ class RiskManager:
         }
         
         self.trade_history.append(trade)
+        self._fold_trade(pnl, trade['return_pct'])
         
         # Update consecutive losses
         if pnl < 0:
@@ -91,15 +108,22 @@ class RiskManager:
             self.metrics.consecutive_losses = 0
             
         # Update daily P&L
-        today = datetime.now().date().isoformat()
-        if today not in self.daily_pnl_history:
-            self.daily_pnl_history[today] = 0
-        self.daily_pnl_history[today] += pnl
-        self.metrics.daily_pnl = self.daily_pnl_history[today]
+        today = self._day_key if now < self._day_end else self._roll_day(now)
+        day_pnl = self.daily_pnl_history.get(today, 0) + pnl
+        self.daily_pnl_history[today] = day_pnl
+        self.metrics.daily_pnl = day_pnl
         
         # Update balance
         self.update_balance(self.metrics.current_balance + pnl)
         
+    def _roll_day(self, now: float) -> int:
+        """Advance the cached local day to the one containing `now`; returns its key."""
+        day = datetime.fromtimestamp(now).date()
+        next_midnight = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        self._day_key = day.toordinal()
+        self._day_end = next_midnight.timestamp()
+        return self._day_key
+        
     def check_risk_limits(self) -> tuple[bool, Optional[str]]:
         """
         Check if any risk limits are breached
@@ -202,9 +226,47 @@ class RiskManager:
         
         return risk_reward_ratio >= self.limits.min_risk_reward_ratio
         
+    def _fold_trade(self, pnl: float, return_pct: float):
+        """Update the running win/loss totals and return mean/variance with one trade."""
+        n = self._n_trades = self._n_trades + 1
+        if pnl > 0:
+            self._n_wins += 1
+            self._total_wins += pnl
+        elif pnl < 0:
+            self._n_losses += 1
+            self._total_losses += pnl
+        delta = return_pct - self._ret_mean
+        self._ret_mean += delta / n
+        self._ret_m2 += delta * (return_pct - self._ret_mean)
+        
+    def _recompute_performance(self):
+        """Rebuild the running aggregates from trade_history in a single pass."""
+        n = n_wins = n_losses = 0
+        total_wins = total_losses = mean = m2 = 0.0
+        for t in self.trade_history:
+            p = t['pnl']
+            r = t['return_pct']
+            n += 1
+            if p > 0:
+                n_wins += 1
+                total_wins += p
+            elif p < 0:
+                n_losses += 1
+                total_losses += p
+            delta = r - mean
+            mean += delta / n
+            m2 += delta * (r - mean)
+        self._n_trades, self._n_wins, self._n_losses = n, n_wins, n_losses
+        self._total_wins, self._total_losses = total_wins, total_losses
+        self._ret_mean, self._ret_m2 = mean, m2
+        
     def get_performance_metrics(self) -> Dict:
         """Calculate comprehensive performance metrics"""
-        if not self.trade_history:
+        if self._n_trades != len(self.trade_history):
+            # History was edited outside record_trade (trimmed, reloaded): resync
+            self._recompute_performance()
+        n = self._n_trades
+        if not n:
             return {
                 'total_trades': 0,
                 'win_rate': 0,
@@ -215,28 +277,25 @@ class RiskManager:
                 'avg_loss': 0
             }
             
-        wins = [t for t in self.trade_history if t['pnl'] > 0]
-        losses = [t for t in self.trade_history if t['pnl'] < 0]
-        
-        total_wins = sum(t['pnl'] for t in wins)
-        total_losses = abs(sum(t['pnl'] for t in losses))
+        n_wins, n_losses = self._n_wins, self._n_losses
+        total_wins = self._total_wins
+        total_losses = abs(self._total_losses)
         
         metrics = {
-            'total_trades': len(self.trade_history),
-            'win_rate': (len(wins) / len(self.trade_history) * 100) if self.trade_history else 0,
+            'total_trades': n,
+            'win_rate': n_wins / n * 100,
             'profit_factor': (total_wins / total_losses) if total_losses > 0 else 0,
             'max_drawdown': self.metrics.max_drawdown_pct,
-            'avg_win': (total_wins / len(wins)) if wins else 0,
-            'avg_loss': (total_losses / len(losses)) if losses else 0,
+            'avg_win': (total_wins / n_wins) if n_wins else 0,
+            'avg_loss': (total_losses / n_losses) if n_losses else 0,
             'current_drawdown': self.metrics.current_drawdown_pct,
             'consecutive_losses': self.metrics.consecutive_losses
         }
         
-        # Calculate Sharpe ratio (simplified)
-        if len(self.trade_history) > 1:
-            returns = [t['return_pct'] for t in self.trade_history]
-            avg_return = sum(returns) / len(returns)
-            std_return = (sum((r - avg_return) ** 2 for r in returns) / len(returns)) ** 0.5
+        # Calculate Sharpe ratio (simplified, population std)
+        if n > 1:
+            avg_return = self._ret_mean
+            std_return = (self._ret_m2 / n) ** 0.5
             metrics['sharpe_ratio'] = (avg_return / std_return) if std_return > 0 else 0
         else:
             metrics['sharpe_ratio'] = 0
@@ -247,7 +306,7 @@ class RiskManager:
         """Halt trading due to risk breach"""
         self.trading_halted = True
         self.halt_reason = reason
-        self.halt_time = datetime.now()
+        self.halt_time = time.monotonic()
         logger.error(f"TRADING HALTED: {reason}")
         
     def _should_resume_trading(self) -> bool:
@@ -256,8 +315,7 @@ class RiskManager:
             return True
             
         # Resume after 1 hour cooldown
-        cooldown_period = timedelta(hours=1)
-        return datetime.now() - self.halt_time > cooldown_period
+        return time.monotonic() - self.halt_time > HALT_COOLDOWN_SECONDS
         
     def generate_risk_report(self) -> str:
         """Generate a risk report"""
@@ -3,15 +3,44 @@
 Simplified EMA Strategy - Single source of truth: exchange position
 No base position tracking, no inventory management, just clean trading logic
 """
+import logging
 import time
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union
 from dataclasses import dataclass
+from functools import lru_cache
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from bot.utils import safe_float
+from bot.utils.instrument_cache import get_instrument_info_cached
+
+logger = logging.getLogger(__name__)
+
+# Bybit position side -> sign of the size ('None' and unknown sides map to flat)
+_SIDE_SIGN = {'Buy': 1.0, 'Sell': -1.0}
+
+# Worker pools shared by every strategy instance (threads start lazily and are joined at exit)
+# rather than created, and leaked, per instance.
+# Two workers so the position and open-orders REST lookups in sync_all overlap
+_SYNC_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="strategy-sync")
+# Order placement runs off the tick; acks are applied by _drain_order_acks on the strategy's thread
+_ORDER_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="strategy-orders")
+
+# In-memory trade log: a fixed-size columnar ring; action/reason strings are stored as label codes
+TRADE_BUFFER_SIZE = 10_000
+# Max orders per /v5/order/cancel-batch request
+CANCEL_BATCH_SIZE = {'spot': 10}
+CANCEL_BATCH_SIZE_DEFAULT = 20
+_TRADE_DTYPE = np.dtype([
+    ('ts', 'f8'), ('action', 'u2'), ('reason', 'u2'), ('price', 'f8'), ('qty', 'f8'),
+    ('pos_before', 'f8'), ('pos_after', 'f8'), ('pnl', 'f8'),
+])
 
 @dataclass
 class TradeLog:
-    """Simple trade logging"""
+    """Simple trade logging (a materialized row of the trade ring)"""
     timestamp: float
     action: str  # 'BUY', 'SELL', 'STOP_LOSS', 'TAKE_PROFIT'
     price: float
@@ -21,11 +50,72 @@ class TradeLog:
     reason: str
     pnl: Optional[float] = None
 
+@dataclass(slots=True)
+class LimitOrder:
+    """Resting entry order placed at one of the EMAs"""
+    ema: str  # '9' or '21'
+    price: float
+    side: str
+    qty: float
+    usdt_amount: float  # USDT allocation locked by this order
+
+@lru_cache(maxsize=64)
+def _ema_decay_weights(alpha: float, n: int) -> np.ndarray:
+    """(1-a)^(n-1) ... (1-a)^0, shared read-only across calls with the same period and tail length."""
+    decay = (1 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    decay.flags.writeable = False
+    return decay
+
+def _ema_from_seed(seed: float, tail: np.ndarray, alpha: float) -> float:
+    """
+    Closed form of running the EMA recurrence e = a*x + (1-a)*e over `tail` from `seed`:
+    e_n = (1-a)^n * seed + sum_j a * (1-a)^(n-1-j) * x_j, evaluated as one dot product.
+    """
+    decay = _ema_decay_weights(alpha, len(tail))
+    return float((1 - alpha) ** len(tail) * seed + alpha * np.dot(decay, tail))
+
+def _step_decimals(step: float) -> int:
+    """Number of decimal places implied by an exchange step size (0.001 -> 3)."""
+    if step >= 1:
+        return 0
+    # Format rather than log10 so steps like 0.0005 count their digits exactly
+    step_str = f"{step:.10f}".rstrip('0').rstrip('.')
+    return len(step_str.split('.')[1]) if '.' in step_str else 0
+
 class SimplifiedEMAStrategy:
     """
     Clean EMA strategy without base position complexity
     Assumes dedicated subaccount - ALL positions are bot positions
     """
+    __slots__ = (
+        'client', 'symbol', 'config',
+        'position', 'avg_entry_price', '_position_value_usdt', 'original_position_size',
+        'delta_tracker', 'ema9_position_value', 'ema21_position_value',
+        'limit_orders', '_pending_by_ema', '_pending_usdt_by_ema', 'last_ema9_order_time', 'last_ema21_order_time', 'order_placement_cooldown',
+        '_tp_hit_mask', 'tp_orders', '_tp_ladder', '_tp_ladder_key', 'last_position_size',
+        'ema_fast', 'ema_slow', 'trend',
+        '_last_ema_ratio', '_ema_separation_pct', '_ratio_fast', '_ratio_slow',
+        'stop_loss_price', 'stop_loss_order_id', 'trailing_stop_price', 'hard_stop_price',
+        'last_candle_close', 'conditional_stop_triggered',
+        '_inflight_orders',
+        'last_entry_time', 'last_update_time', 'last_order_update_time',
+        '_last_debug_time', '_last_order_debug_time', '_last_trend_msg_time', '_max_alloc_warning_time',
+        '_delta_skip_warning_time',
+        '_trend_strength_debug_count', '_delta_debug_count', '_skip_count',
+        '_no_allocation_count', '_order_check_count',
+        'realized_pnl', '_trades_buf', '_trade_head', '_trade_labels', '_trade_label_codes',
+        'qty_step', 'price_step', 'min_order_qty', '_qty_decimals', '_price_decimals',
+        # setup_config
+        'category', 'ema_fast_period', 'ema_slow_period',
+        '_alpha_fast', '_alpha_slow', '_keep_fast', '_keep_slow',
+        'trend_threshold_pct', '_trend_upper', '_trend_lower',
+        'max_allocation_usdt', 'ema9_allocation_usdt', 'ema21_allocation_usdt',
+        'take_profit_levels', 'tp_execution_method',
+        '_tp_bits', '_tp_market_levels', '_tp_min_pct',
+        'stop_loss_pct', 'hard_stop_loss_pct',
+        '_stop_mult_long_cond', '_stop_mult_long_hard', '_stop_mult_short_cond', '_stop_mult_short_hard',
+        'entry_cooldown', 'order_update_threshold_pct',
+    )
     
     def __init__(self, client, symbol: str, config: dict):
         self.client = client
@@ -35,6 +125,7 @@ class SimplifiedEMAStrategy:
         # Position tracking - SINGLE SOURCE OF TRUTH
         self.position = 0.0  # Current position from exchange
         self.avg_entry_price = 0.0  # Weighted average entry
+        self._position_value_usdt = 0.0  # abs(position) * avg_entry_price, refreshed on sync
         self.original_position_size = 0.0  # Track original position for TP calculations
         
         # Delta management (will be set by runner if provided)
@@ -46,22 +137,34 @@ class SimplifiedEMAStrategy:
         self.ema21_position_value = 0.0  # USDT value of position from EMA21 entries
         
         # Limit orders
-        self.limit_orders = {}  # order_id -> {'ema': '9' or '21', 'price': x, 'qty': x}
+        self.limit_orders: Dict[str, LimitOrder] = {}  # order_id -> LimitOrder
+        # Per-EMA index over resting and in-flight entry orders (order_id, or the future while
+        # in flight) and their summed USDT, so allocation and duplicate checks don't scan
+        self._pending_by_ema: Dict[str, set] = {'9': set(), '21': set()}
+        self._pending_usdt_by_ema: Dict[str, float] = {'9': 0.0, '21': 0.0}
         
         # Order placement throttling - prevent placing multiple orders at same EMA too quickly
-        self.last_ema9_order_time = 0
-        self.last_ema21_order_time = 0
+        self.last_ema9_order_time = float('-inf')  # time.monotonic() readings
+        self.last_ema21_order_time = float('-inf')
         self.order_placement_cooldown = 10  # Minimum 10 seconds between orders at same EMA
         
         # TP/SL tracking
-        self.tp_levels_hit = set()  # Track which TP levels have been hit
+        self._tp_hit_mask = 0  # Bitmask of TP levels already hit (see _tp_bits)
         self.tp_orders = {}  # Track active TP orders: tp_level -> order_id
+        # Formatted TP prices/quantities for the current entry (see _get_tp_ladder)
+        self._tp_ladder = None
+        self._tp_ladder_key = None
         self.last_position_size = 0.0  # Track position size changes
         
         # Indicators
         self.ema_fast = None
         self.ema_slow = None
         self.trend = "NEUTRAL"  # UPTREND, DOWNTREND, NEUTRAL
+        # Last fast/slow ratio, its separation in %, and the EMA values they were computed from
+        self._last_ema_ratio = None
+        self._ema_separation_pct = None
+        self._ratio_fast = None
+        self._ratio_slow = None
         
         # Stop tracking - Two-tier system
         self.stop_loss_price = None
@@ -71,18 +174,38 @@ class SimplifiedEMAStrategy:
         self.last_candle_close = None
         self.conditional_stop_triggered = False  # Track if conditional stop was breached during candle
         
-        # Timing
-        self.last_entry_time = 0
-        self.last_update_time = 0
-        self.last_order_update_time = 0
+        # In-flight _ORDER_POOL submissions, drained by _drain_order_acks.
+        # Entries are (future, kind, key, LimitOrder or None, message printed on success)
+        self._inflight_orders = []
+        
+        # Timing (time.monotonic() readings; only used for intervals)
+        self.last_entry_time = float('-inf')
+        self.last_update_time = float('-inf')
+        self.last_order_update_time = float('-inf')
+        # Throttles for manage_entry_orders' periodic messages
+        self._last_debug_time = float('-inf')
+        self._last_order_debug_time = float('-inf')
+        self._last_trend_msg_time = float('-inf')
+        self._max_alloc_warning_time = float('-inf')
+        self._delta_skip_warning_time = float('-inf')
+        # Counters that thin out repeated messages
+        self._trend_strength_debug_count = 0
+        self._delta_debug_count = 0
+        self._skip_count = {}  # ema_type -> skips
+        self._no_allocation_count = 0
+        self._order_check_count = 0
         
         # P&L and logging
         self.realized_pnl = 0
-        self.trades = []  # List of TradeLog entries
+        self._trades_buf = np.zeros(TRADE_BUFFER_SIZE, dtype=_TRADE_DTYPE)
+        self._trade_head = 0  # Trades logged so far; the next row is _trade_head % TRADE_BUFFER_SIZE
+        self._trade_labels: List[str] = []  # code -> action/reason string
+        self._trade_label_codes: Dict[str, int] = {}
         
         # Instrument info for proper formatting
         self.qty_step = 0.001  # Default, will be updated
         self.price_step = 0.0001  # Default, will be updated
+        self._update_step_decimals()
         self.min_order_qty = 1.0  # Default, will be updated
         
         # Extract config
@@ -97,7 +220,14 @@ class SimplifiedEMAStrategy:
         self.category = c.get('category', 'linear')
         self.ema_fast_period = c.get('ema_fast_period', 9)
         self.ema_slow_period = c.get('ema_slow_period', 21)
+        # EMA smoothing factors and their complements, fixed by the periods
+        self._alpha_fast = 2 / (self.ema_fast_period + 1)
+        self._alpha_slow = 2 / (self.ema_slow_period + 1)
+        self._keep_fast = 1 - self._alpha_fast
+        self._keep_slow = 1 - self._alpha_slow
         self.trend_threshold_pct = c.get('trend_threshold_pct', 0.1)
+        self._trend_upper = 1 + self.trend_threshold_pct / 100
+        self._trend_lower = 1 - self.trend_threshold_pct / 100
         
         # Position sizing with inventory management
         self.max_allocation_usdt = c.get('max_allocation_usdt', 1000)
@@ -112,9 +242,23 @@ class SimplifiedEMAStrategy:
             'tp3': {'pct': 1.0, 'exit_pct': 50}
         })
         self.tp_execution_method = c.get('tp_execution_method', 'limit')  # 'limit' or 'market'
+        # One bit per configured TP level, plus the levels checked by market execution in order
+        self._tp_bits = {tp_name: 1 << i for i, tp_name in enumerate(self.take_profit_levels)}
+        self._tp_market_levels = tuple(
+            (tp_name, self._tp_bits[tp_name], self.take_profit_levels[tp_name])
+            for tp_name in ('tp1', 'tp2', 'tp3')
+            if self.take_profit_levels.get(tp_name)
+        )
+        # Below the lowest threshold no level can fire, so check_exits can skip the loop
+        self._tp_min_pct = min((cfg['pct'] for _, _, cfg in self._tp_market_levels), default=float('inf'))
         # Two-tier stop loss configuration
         self.stop_loss_pct = c.get('stop_loss_pct', 0.25)           # Conditional stop (candle close)
         self.hard_stop_loss_pct = c.get('hard_stop_loss_pct', 1.0)  # Hard stop (immediate)
+        # Stop multipliers applied to the slow EMA (long side below, short side above)
+        self._stop_mult_long_cond = 1 - self.stop_loss_pct / 100
+        self._stop_mult_long_hard = 1 - self.hard_stop_loss_pct / 100
+        self._stop_mult_short_cond = 1 + self.stop_loss_pct / 100
+        self._stop_mult_short_hard = 1 + self.hard_stop_loss_pct / 100
         
         # Entry parameters
         self.entry_cooldown = c.get('entry_cooldown_seconds', 120)
@@ -156,9 +300,10 @@ class SimplifiedEMAStrategy:
             return False
             
         # Calculate initial EMAs
-        closes = [float(k[4]) for k in reversed(klines['result']['list'])]
+        # Bybit returns newest first; the reversed slice is a view, not a copy
+        closes = np.array([k[4] for k in klines['result']['list']], dtype=np.float64)[::-1]
         print(f"📊 Using {len(closes)} {timeframe}-minute candles for EMA calculation")
-        print(f"📊 Recent closes: {closes[-5:]}")  # Show last 5 closes
+        print(f"📊 Recent closes: {closes[-5:].tolist()}")  # Show last 5 closes
         print(f"📊 Current close: {closes[-1]:.5f}")
         self.calculate_initial_emas(closes)
         print(f"📊 Initial EMAs: EMA9={self.ema_fast:.5f}, EMA21={self.ema_slow:.5f}")
@@ -173,7 +318,7 @@ class SimplifiedEMAStrategy:
         # This is critical to prevent re-allocating the same capital
         if self.position != 0 and self.avg_entry_price > 0:
             if self.ema9_position_value == 0 and self.ema21_position_value == 0:
-                position_value_usdt = abs(self.position) * self.avg_entry_price
+                position_value_usdt = self._position_value_usdt
                 ema9_pct = self.ema9_allocation_usdt / self.max_allocation_usdt
                 ema21_pct = self.ema21_allocation_usdt / self.max_allocation_usdt
                 
@@ -200,35 +345,40 @@ class SimplifiedEMAStrategy:
     def get_instrument_info(self):
         """Get instrument specifications for proper order formatting"""
         try:
-            response = self.client.get_instruments_info(
-                category=self.category,
-                symbol=self.symbol
+            # Steps rarely change, so a restart reuses the on-disk copy while it's fresh
+            info = get_instrument_info_cached(
+                self.client, self.category, self.symbol,
+                ttl_seconds=self.config.get('instrument_cache_ttl_seconds', 86400)
             )
             
-            if response and response.get('retCode') == 0:
-                instruments = response['result']['list']
-                if instruments:
-                    info = instruments[0]
-                    
-                    # Parse lot size filter for quantity step
-                    lot_size = info.get('lotSizeFilter', {})
-                    self.qty_step = float(lot_size.get('qtyStep', '0.001'))
-                    self.min_order_qty = float(lot_size.get('minOrderQty', '1'))
-                    
-                    # Parse price filter for price step
-                    price_filter = info.get('priceFilter', {})
-                    self.price_step = float(price_filter.get('tickSize', '0.0001'))
-                    
-                    print(f"📏 Instrument specs for {self.symbol}: qtyStep={self.qty_step}, minOrderQty={self.min_order_qty}, priceStep={self.price_step}")
-                    
+            if info:
+                # Parse lot size filter for quantity step
+                lot_size = info.get('lotSizeFilter', {})
+                self.qty_step = float(lot_size.get('qtyStep', '0.001'))
+                self.min_order_qty = float(lot_size.get('minOrderQty', '1'))
+                
+                # Parse price filter for price step
+                price_filter = info.get('priceFilter', {})
+                self.price_step = float(price_filter.get('tickSize', '0.0001'))
+                
+                self._update_step_decimals()
+                print(f"📏 Instrument specs for {self.symbol}: qtyStep={self.qty_step}, minOrderQty={self.min_order_qty}, priceStep={self.price_step}")
+                
         except Exception as e:
             print(f"⚠️ Could not get instrument info for {self.symbol}: {e}")
             # Use conservative defaults - most spot pairs require 3 decimal places or less
             self.qty_step = 0.001
             self.min_order_qty = 1.0
             self.price_step = 0.0001
+            self._update_step_decimals()
             print(f"📏 Using default specs: qtyStep={self.qty_step}, minOrderQty={self.min_order_qty}, priceStep={self.price_step}")
             
+    def _update_step_decimals(self):
+        """Cache decimal places for the current qty/price steps"""
+        # Most spot pairs don't allow more than 3 decimal places on quantity
+        self._qty_decimals = min(_step_decimals(self.qty_step), 3)
+        self._price_decimals = _step_decimals(self.price_step)
+        
     def format_quantity(self, qty: float) -> float:
         """Format quantity according to instrument specifications"""
         if qty <= 0:
@@ -242,63 +392,34 @@ class SimplifiedEMAStrategy:
         if formatted_qty < self.min_order_qty:
             formatted_qty = self.min_order_qty
             
-        # Calculate decimal places from qty_step to avoid precision issues
-        if self.qty_step >= 1:
-            decimal_places = 0
-        else:
-            # Count decimal places in qty_step string to avoid floating point issues
-            qty_step_str = f"{self.qty_step:.10f}".rstrip('0').rstrip('.')
-            if '.' in qty_step_str:
-                decimal_places = len(qty_step_str.split('.')[1])
-            else:
-                decimal_places = 0
-        
-        # Round to the calculated decimal places
-        formatted_qty = round(formatted_qty, decimal_places)
-        
-        # Additional safety: ensure we don't exceed reasonable precision for spot trading
-        # Most spot pairs don't allow more than 3 decimal places
-        if decimal_places > 3:
-            formatted_qty = round(formatted_qty, 3)
-            
-        return formatted_qty
+        # Round to the step's decimal places to avoid floating point residue
+        return round(formatted_qty, self._qty_decimals)
         
     def format_price(self, price: float) -> float:
         """Format price according to instrument specifications"""
         steps = round(price / self.price_step)
-        formatted_price = steps * self.price_step
-        
-        # Round to avoid floating point precision issues
-        decimal_places = len(str(self.price_step).split('.')[-1])
-        return round(formatted_price, decimal_places)
+        return round(steps * self.price_step, self._price_decimals)
         
-    def calculate_initial_emas(self, closes: List[float]):
+    def calculate_initial_emas(self, closes: Union[np.ndarray, List[float]]):
         """Calculate initial EMA values"""
         if len(closes) < self.ema_slow_period:
             return
             
-        # Simple EMA calculation
-        self.ema_fast = sum(closes[-self.ema_fast_period:]) / self.ema_fast_period
-        self.ema_slow = sum(closes[-self.ema_slow_period:]) / self.ema_slow_period
-        
-        # Then apply EMA formula for recent closes
-        alpha_fast = 2 / (self.ema_fast_period + 1)
-        alpha_slow = 2 / (self.ema_slow_period + 1)
+        closes_arr = np.asarray(closes, dtype=np.float64)
         
-        for close in closes[-50:]:
-            self.ema_fast = close * alpha_fast + self.ema_fast * (1 - alpha_fast)
-            self.ema_slow = close * alpha_slow + self.ema_slow * (1 - alpha_slow)
+        # Seed with the SMA of the last `period` closes, then apply the EMA formula
+        # over the recent closes (both EMAs share the same tail)
+        tail = closes_arr[-50:]
+        self.ema_fast = _ema_from_seed(closes_arr[-self.ema_fast_period:].mean(), tail, self._alpha_fast)
+        self.ema_slow = _ema_from_seed(closes_arr[-self.ema_slow_period:].mean(), tail, self._alpha_slow)
             
     def update_emas(self, price: float):
         """Update EMA values with new price"""
         if self.ema_fast is None or self.ema_slow is None:
             return
             
-        alpha_fast = 2 / (self.ema_fast_period + 1)
-        alpha_slow = 2 / (self.ema_slow_period + 1)
-        
-        self.ema_fast = price * alpha_fast + self.ema_fast * (1 - alpha_fast)
-        self.ema_slow = price * alpha_slow + self.ema_slow * (1 - alpha_slow)
+        self.ema_fast = price * self._alpha_fast + self.ema_fast * self._keep_fast
+        self.ema_slow = price * self._alpha_slow + self.ema_slow * self._keep_slow
         
         # Update trend after EMA calculation
         self.calculate_trend()
@@ -309,14 +430,13 @@ class SimplifiedEMAStrategy:
             return
             
         # Update trend using configurable threshold
-        threshold_multiplier = self.trend_threshold_pct / 100
-        upper_threshold = 1 + threshold_multiplier
-        lower_threshold = 1 - threshold_multiplier
+        upper_threshold = self._trend_upper
+        lower_threshold = self._trend_lower
         
         # Debug trend calculation
-        ema_ratio = self.ema_fast / self.ema_slow
-        print(f"🔍 Trend Debug: EMA9={self.ema_fast:.5f}, EMA21={self.ema_slow:.5f}")
-        print(f"🔍 Ratio: {ema_ratio:.6f}, Upper: {upper_threshold:.6f}, Lower: {lower_threshold:.6f}")
+        ema_ratio = self._ema_ratio()
+        logger.debug("🔍 Trend Debug: EMA9=%.5f, EMA21=%.5f, Ratio: %.6f, Upper: %.6f, Lower: %.6f",
+                     self.ema_fast, self.ema_slow, ema_ratio, upper_threshold, lower_threshold)
         
         if self.ema_fast > self.ema_slow * upper_threshold:
             self.trend = "UPTREND"
@@ -325,8 +445,17 @@ class SimplifiedEMAStrategy:
         else:
             self.trend = "NEUTRAL"
             
-        print(f"🔍 Result: {self.trend}")
+        logger.debug("🔍 Result: %s", self.trend)
     
+    def _ema_ratio(self) -> float:
+        """Fast/slow EMA ratio (and _ema_separation_pct), recomputed only when either EMA has changed"""
+        if self.ema_fast != self._ratio_fast or self.ema_slow != self._ratio_slow:
+            self._ratio_fast = self.ema_fast
+            self._ratio_slow = self.ema_slow
+            self._last_ema_ratio = self.ema_fast / self.ema_slow
+            self._ema_separation_pct = abs(1 - self._last_ema_ratio) * 100
+        return self._last_ema_ratio
+        
     def _has_sufficient_trend_strength(self) -> bool:
         """
         Check if EMAs have sufficient separation to justify placing orders.
@@ -336,15 +465,13 @@ class SimplifiedEMAStrategy:
             return False
             
         # Calculate EMA separation as percentage
-        ema_ratio = self.ema_fast / self.ema_slow
-        separation_pct = abs(1 - ema_ratio) * 100
+        ema_ratio = self._ema_ratio()
+        separation_pct = self._ema_separation_pct
         
         # Require minimum separation defined by trend_threshold_pct
         min_separation = self.trend_threshold_pct
         
         if separation_pct < min_separation:
-            if not hasattr(self, '_trend_strength_debug_count'):
-                self._trend_strength_debug_count = 0
             self._trend_strength_debug_count += 1
             
             # Only log occasionally to avoid spam
@@ -358,14 +485,32 @@ class SimplifiedEMAStrategy:
             
     def sync_position(self):
         """Sync position with exchange - SINGLE SOURCE OF TRUTH"""
+        try:
+            snapshot = self._fetch_position()
+        except Exception as e:
+            print(f"Error syncing position: {e}")
+            return
+        self._apply_position(snapshot)
+        
+    def _fetch_position(self):
+        """REST reads behind sync_position; touches no strategy state so it can run off-thread"""
+        if self.category == 'spot':
+            # For spot trading, get coin balance instead of positions
+            base_symbol = self.symbol.replace('USDT', '')
+            spot_value = self.client.get_spot_position_value(base_symbol, "USDT")
+            return spot_value, self.get_current_price()
+        # For futures trading, use positions API
+        return self.client.get_positions(
+            category=self.category,
+            symbol=self.symbol
+        )
+        
+    def _apply_position(self, snapshot):
+        """Update position state from a _fetch_position result"""
         try:
             if self.category == 'spot':
-                # For spot trading, get coin balance instead of positions
-                base_symbol = self.symbol.replace('USDT', '')
-                spot_value = self.client.get_spot_position_value(base_symbol, "USDT")
-                
                 # Convert USDT value to base quantity using current price
-                current_price = self.get_current_price()
+                spot_value, current_price = snapshot
                 if current_price and current_price > 0:
                     base_quantity = spot_value / current_price
                     self.position = base_quantity
@@ -373,12 +518,9 @@ class SimplifiedEMAStrategy:
                 else:
                     self.position = 0.0
                     self.avg_entry_price = 0.0
+                self._update_position_value()
             else:
-                # For futures trading, use positions API
-                response = self.client.get_positions(
-                    category=self.category,
-                    symbol=self.symbol
-                )
+                response = snapshot
                 
                 if response and response.get('retCode') == 0:
                     positions = response['result']['list']
@@ -389,17 +531,11 @@ class SimplifiedEMAStrategy:
                         
                         # Update position
                         old_position = self.position
-                        self.position = size if side == 'Buy' else -size if side == 'Sell' else 0
+                        self.position = size * _SIDE_SIGN.get(side, 0.0)
                         
-                        # Handle empty avgPrice strings
-                        avg_price_str = pos.get('avgPrice', '0')
-                        if avg_price_str == '' or avg_price_str is None:
-                            self.avg_entry_price = 0.0
-                        else:
-                            try:
-                                self.avg_entry_price = float(avg_price_str)
-                            except (ValueError, TypeError):
-                                self.avg_entry_price = 0.0
+                        # Empty or malformed avgPrice strings parse as 0
+                        self.avg_entry_price = safe_float(pos.get('avgPrice'))
+                        self._update_position_value()
                     
                     if old_position != self.position:
                         print(f"📊 Position synced: {old_position:.3f} → {self.position:.3f}")
@@ -408,7 +544,7 @@ class SimplifiedEMAStrategy:
                         if old_position == 0 and self.position != 0:
                             self.original_position_size = abs(self.position)
                             self.last_position_size = abs(self.position)
-                            self.tp_levels_hit = set()
+                            self._tp_hit_mask = 0
                             print(f"🎯 New position opened: {self.original_position_size:.3f} - TP levels reset")
                             
                             # Place TP orders for the new position based on execution method
@@ -419,7 +555,7 @@ class SimplifiedEMAStrategy:
                             # This handles the case when bot starts with an existing position
                             if self.ema9_position_value == 0 and self.ema21_position_value == 0 and self.avg_entry_price > 0:
                                 # Assume position came proportionally from both EMAs based on config
-                                position_value_usdt = abs(self.position) * self.avg_entry_price
+                                position_value_usdt = self._position_value_usdt
                                 ema9_pct = self.ema9_allocation_usdt / self.max_allocation_usdt
                                 ema21_pct = self.ema21_allocation_usdt / self.max_allocation_usdt
                                 
@@ -439,7 +575,7 @@ class SimplifiedEMAStrategy:
                         elif self.position == 0:
                             self.trailing_stop_price = None
                             self.original_position_size = 0.0
-                            self.tp_levels_hit = set()
+                            self._tp_hit_mask = 0
                             # Reset per-EMA allocations when position closes
                             self.ema9_position_value = 0.0
                             self.ema21_position_value = 0.0
@@ -448,7 +584,7 @@ class SimplifiedEMAStrategy:
                         # CRITICAL FIX: If position changed but didn't close, recalculate EMA allocations
                         # This handles partial exits (TPs) and ensures allocations match actual position
                         elif self.position != 0 and self.avg_entry_price > 0:
-                            actual_position_value = abs(self.position) * self.avg_entry_price
+                            actual_position_value = self._position_value_usdt
                             total_tracked = self.ema9_position_value + self.ema21_position_value
                             
                             # Check if tracking is out of sync (more than 5% difference)
@@ -471,58 +607,158 @@ class SimplifiedEMAStrategy:
                 else:
                     self.position = 0
                     self.avg_entry_price = 0
+                    self._position_value_usdt = 0.0
                     self.trailing_stop_price = None
                     self.original_position_size = 0.0
-                    self.tp_levels_hit = set()
+                    self._tp_hit_mask = 0
                     
         except Exception as e:
             print(f"Error syncing position: {e}")
             
+    def _update_position_value(self):
+        """Refresh the cached USDT value of the position after position/avg_entry_price change"""
+        self._position_value_usdt = abs(self.position) * self.avg_entry_price if self.avg_entry_price > 0 else 0.0
+        
     def sync_orders(self):
         """Sync internal order tracking with exchange reality"""
         try:
-            response = self.client.get_open_orders(
-                category=self.category,
-                symbol=self.symbol
-            )
-            
+            response = self._fetch_open_orders()
+        except Exception as e:
+            print(f"Error syncing orders: {e}")
+            return
+        self._apply_open_orders(response)
+        
+    def _fetch_open_orders(self):
+        return self.client.get_open_orders(
+            category=self.category,
+            symbol=self.symbol
+        )
+        
+    def _apply_open_orders(self, response):
+        """Reconcile limit_orders against an open-orders response"""
+        try:
             if response and response.get('retCode') == 0:
                 exchange_orders = response['result']['list']
                 exchange_order_ids = {order['orderId'] for order in exchange_orders}
                 
-                # Find orders we think exist but don't exist on exchange
-                stale_orders = []
-                for order_id in list(self.limit_orders.keys()):
-                    if order_id not in exchange_order_ids:
-                        stale_orders.append(order_id)
+                # Orders we think exist but don't exist on exchange, and the reverse
+                our_order_ids = self.limit_orders.keys()
+                stale_orders = our_order_ids - exchange_order_ids
+                unknown_orders = exchange_order_ids - our_order_ids
                         
                 # Clean up stale orders AND update per-EMA position tracking
                 # These are likely filled orders, so we need to lock their allocation
                 for order_id in stale_orders:
-                    order_info = self.limit_orders.get(order_id)
-                    if order_info:
-                        # Assume order was filled and lock the allocation
-                        usdt_amount = order_info.get('usdt_amount', 0)
-                        if order_info['ema'] == '9':
-                            self.ema9_position_value += usdt_amount
-                            print(f"🧹 Order filled: EMA9 +${usdt_amount:.0f} → ${self.ema9_position_value:.0f} locked")
-                        elif order_info['ema'] == '21':
-                            self.ema21_position_value += usdt_amount
-                            print(f"🧹 Order filled: EMA21 +${usdt_amount:.0f} → ${self.ema21_position_value:.0f} locked")
-                    
-                    del self.limit_orders[order_id]
+                    # Assume order was filled and lock the allocation
+                    order_info = self.limit_orders.pop(order_id)
+                    self._unindex_limit_order(order_id, order_info)
+                    usdt_amount = order_info.usdt_amount
+                    if order_info.ema == '9':
+                        self.ema9_position_value += usdt_amount
+                        print(f"🧹 Order filled: EMA9 +${usdt_amount:.0f} → ${self.ema9_position_value:.0f} locked")
+                    elif order_info.ema == '21':
+                        self.ema21_position_value += usdt_amount
+                        print(f"🧹 Order filled: EMA21 +${usdt_amount:.0f} → ${self.ema21_position_value:.0f} locked")
                     
-                # Also check for orders on exchange we don't know about
-                unknown_orders = exchange_order_ids - set(self.limit_orders.keys())
+                # Also report orders on exchange we don't know about
                 if unknown_orders:
                     print(f"⚠️ Found {len(unknown_orders)} unknown orders on exchange")
                     
         except Exception as e:
             print(f"Error syncing orders: {e}")
             
+    def sync_all(self):
+        """sync_position + sync_orders with both REST round-trips in flight at once"""
+        position_future = _SYNC_POOL.submit(self._fetch_position)
+        orders_future = _SYNC_POOL.submit(self._fetch_open_orders)
+        # Results are applied here, in order, so strategy state is only touched by this thread
+        try:
+            self._apply_position(position_future.result())
+        except Exception as e:
+            print(f"Error syncing position: {e}")
+        try:
+            self._apply_open_orders(orders_future.result())
+        except Exception as e:
+            print(f"Error syncing orders: {e}")
+
+    def _submit_order(self, kind: str, key: str, info: Optional[LimitOrder], message: str, **order):
+        """Hand a place_order call to the order pool and return without waiting for the ack"""
+        future = _ORDER_POOL.submit(
+            self.client.place_order, category=self.category, symbol=self.symbol, verbose=False, **order)
+        self._inflight_orders.append((future, kind, key, info, message))
+        if kind == 'limit':
+            self._index_limit_order(future, info)
+
+    def _drain_order_acks(self, wait: bool = False, now: Optional[float] = None):
+        """Record acked orders in limit_orders/tp_orders; with wait=True, block until none are in flight"""
+        if not self._inflight_orders:
+            return
+        ack_time = time.monotonic() if now is None or wait else now
+        still_inflight = []
+        for entry in self._inflight_orders:
+            future, kind, key, info, message = entry
+            if not wait and not future.done():
+                still_inflight.append(entry)
+                continue
+            if kind == 'limit':
+                self._unindex_limit_order(future, info)
+            try:
+                response = future.result()
+            except Exception as e:
+                response = None
+                print(f"❌ {kind} order {key} failed: {e}")
+            if not response or response.get('retCode') != 0:
+                if response:
+                    print(f"❌ {kind} order {key} rejected: {response.get('retMsg', 'Unknown error')}")
+                continue
+            order_id = response['result']['orderId']
+            if kind == 'limit':
+                self.limit_orders[order_id] = info
+                self._index_limit_order(order_id, info)
+                # Update last order time for this EMA
+                if key == '9':
+                    self.last_ema9_order_time = ack_time
+                elif key == '21':
+                    self.last_ema21_order_time = ack_time
+            else:
+                self.tp_orders[key] = order_id
+            print(message)
+        self._inflight_orders = still_inflight
+
+    def _index_limit_order(self, key, info: LimitOrder):
+        self._pending_by_ema[info.ema].add(key)
+        self._pending_usdt_by_ema[info.ema] += info.usdt_amount
+
+    def _unindex_limit_order(self, key, info: LimitOrder):
+        keys = self._pending_by_ema[info.ema]
+        if key not in keys:
+            return
+        keys.discard(key)
+        if keys:
+            self._pending_usdt_by_ema[info.ema] -= info.usdt_amount
+        else:
+            # Reset to exactly zero once empty so float drift can't accumulate
+            self._pending_usdt_by_ema[info.ema] = 0.0
+
+    def _clear_limit_orders(self):
+        """Drop all resting entry orders from tracking (in-flight ones stay indexed)"""
+        for order_id, info in self.limit_orders.items():
+            self._unindex_limit_order(order_id, info)
+        self.limit_orders.clear()
+            
     def update(self, price: float, is_new_candle: bool = False, candle_close_price: float = None):
         """Main update method"""
-        current_time = time.time()
+        current_time = time.monotonic()
+        can_place_new = current_time - self.last_entry_time > self.entry_cooldown
+        self._drain_order_acks(now=current_time)
+        
+        # Quiet-tick gate: flat with nothing resting, no new candle and no sync due, while
+        # entries are impossible anyway (NEUTRAL never places orders, nor does the entry
+        # cooldown) - every step below would be a no-op
+        if (not is_new_candle and self.position == 0 and not self.limit_orders and not self._inflight_orders
+                and (self.trend == "NEUTRAL" or not can_place_new)
+                and current_time - self.last_update_time <= 30):
+            return
         
         # Update EMAs on new candle only (like most charts)
         if is_new_candle:
@@ -533,8 +769,7 @@ class SimplifiedEMAStrategy:
             
         # Sync position and orders every 30 seconds
         if current_time - self.last_update_time > 30:
-            self.sync_position()
-            self.sync_orders()
+            self.sync_all()
             self.last_update_time = current_time
             
         # Check exit conditions and manage stops
@@ -545,13 +780,14 @@ class SimplifiedEMAStrategy:
             self.manage_stops(stop_check_price, is_new_candle)
             
         # Always manage entry orders (based on available inventory, not position)
-        self.manage_entry_orders(price, current_time - self.last_entry_time > self.entry_cooldown)
+        self.manage_entry_orders(price, can_place_new, current_time)
         
         # Manage TP orders dynamically when position size changes
         self.manage_tp_orders(price)
         
-        # Place TP orders if we have a position but no TP orders
-        if self.position != 0 and not self.tp_orders:
+        # Place TP orders if we have a position but no TP orders (placed or in flight)
+        if self.position != 0 and not self.tp_orders and not any(
+                kind == 'tp' for _, kind, _, _, _ in self._inflight_orders):
             if self.tp_execution_method == 'limit':
                 self.place_tp_limit_orders(price)
             # For 'market' method, TP levels are checked in check_exits()
@@ -576,30 +812,24 @@ class SimplifiedEMAStrategy:
             pnl_pct = (self.avg_entry_price - price) / self.avg_entry_price * 100
             
         # Check Take Profit levels based on execution method
-        if self.tp_execution_method == 'market':
+        if self.tp_execution_method == 'market' and pnl_pct >= self._tp_min_pct:
             # Market execution - check levels and execute immediately
-            for tp_name in ['tp1', 'tp2', 'tp3']:
-                if tp_name in self.tp_levels_hit:
-                    continue  # Already hit this level
-                    
-                tp_config = self.take_profit_levels.get(tp_name)
-                if not tp_config:
-                    continue
-                    
-                if pnl_pct >= tp_config['pct']:
+            # Levels reached and not already hit; only the first one fires per update
+            for tp_name, tp_bit, tp_config in self._tp_market_levels:
+                if not self._tp_hit_mask & tp_bit and pnl_pct >= tp_config['pct']:
                     self.execute_tp_level(price, tp_name, tp_config)
-                    self.tp_levels_hit.add(tp_name)
-                    break  # Only hit one TP level per update
+                    self._tp_hit_mask |= tp_bit
+                    break
         # For 'limit' method, TP levels are managed via limit orders on the exchange
             
         # Trend Strength Exit - exit when trend strength falls below threshold (NEUTRAL or opposing trend)
         if self.position > 0 and self.trend in ["NEUTRAL", "DOWNTREND"]:
-            ema_ratio = self.ema_fast / self.ema_slow
+            ema_ratio = self._ema_ratio()
             print(f"🔴 TREND WEAKENING: Long position but trend is {self.trend} (EMA ratio: {ema_ratio:.6f}) - Exiting")
             self.execute_full_exit(price, "TREND_WEAKENING")
             return
         elif self.position < 0 and self.trend in ["NEUTRAL", "UPTREND"]:
-            ema_ratio = self.ema_fast / self.ema_slow
+            ema_ratio = self._ema_ratio()
             print(f"🟢 TREND WEAKENING: Short position but trend is {self.trend} (EMA ratio: {ema_ratio:.6f}) - Exiting")
             self.execute_full_exit(price, "TREND_WEAKENING")
             return
@@ -613,75 +843,53 @@ class SimplifiedEMAStrategy:
         if self.position == 0 or self.avg_entry_price == 0:
             return
             
+        # One code path for both sides: with sign = +1 (long) / -1 (short), "price at or
+        # beyond the stop" is sign*price <= sign*stop and stops only ratchet towards sign*+inf
         if self.position > 0:  # Long position
-            # Calculate stop levels based on slow EMA
-            conditional_stop = self.ema_slow * (1 - self.stop_loss_pct / 100)
-            hard_stop = self.ema_slow * (1 - self.hard_stop_loss_pct / 100)
-            
-            # Initialize or update stops (only move up, never down)
-            if self.trailing_stop_price is None:
-                self.trailing_stop_price = conditional_stop
-                self.hard_stop_price = hard_stop
-            else:
-                if conditional_stop > self.trailing_stop_price:
-                    self.trailing_stop_price = conditional_stop
-                if hard_stop > self.hard_stop_price:
-                    self.hard_stop_price = hard_stop
-            
-            # Check hard stop first (1% - immediate trigger)
-            if price <= self.hard_stop_price:
-                print(f"🚨 HARD STOP triggered: ${price:.4f} <= ${self.hard_stop_price:.4f} (EMA{self.ema_slow_period}: ${self.ema_slow:.4f}, -{self.hard_stop_loss_pct}%)")
-                self.execute_full_exit(price, "HARD_STOP")
-                return
-                
-            # Track if conditional stop level was breached during candle
-            if price <= self.trailing_stop_price:
-                self.conditional_stop_triggered = True
-                
-            # Check conditional stop on candle close (0.25% - only if candle CLOSES below stop)
-            if is_new_candle and price <= self.trailing_stop_price:
-                print(f"🛑 CONDITIONAL STOP triggered on candle close: ${price:.4f} <= ${self.trailing_stop_price:.4f} (EMA{self.ema_slow_period}: ${self.ema_slow:.4f}, -{self.stop_loss_pct}%)")
-                self.execute_full_exit(price, "CONDITIONAL_STOP")
-                return
-                
-            # Reset conditional stop flag on new candle regardless of where it closes
-            if is_new_candle:
-                self.conditional_stop_triggered = False
-                
+            sign, cmp, pct_sign = 1.0, "<=", "-"
+            conditional_stop = self.ema_slow * self._stop_mult_long_cond
+            hard_stop = self.ema_slow * self._stop_mult_long_hard
         else:  # Short position
-            # Calculate stop levels based on slow EMA
-            conditional_stop = self.ema_slow * (1 + self.stop_loss_pct / 100)
-            hard_stop = self.ema_slow * (1 + self.hard_stop_loss_pct / 100)
-            
-            # Initialize or update stops (only move down, never up)
-            if self.trailing_stop_price is None:
+            sign, cmp, pct_sign = -1.0, ">=", "+"
+            conditional_stop = self.ema_slow * self._stop_mult_short_cond
+            hard_stop = self.ema_slow * self._stop_mult_short_hard
+        
+        # Initialize or update stops (longs only move up, shorts only move down)
+        if self.trailing_stop_price is None:
+            self.trailing_stop_price = conditional_stop
+            self.hard_stop_price = hard_stop
+        else:
+            if sign * conditional_stop > sign * self.trailing_stop_price:
                 self.trailing_stop_price = conditional_stop
+            if sign * hard_stop > sign * self.hard_stop_price:
                 self.hard_stop_price = hard_stop
-            else:
-                if conditional_stop < self.trailing_stop_price:
-                    self.trailing_stop_price = conditional_stop
-                if hard_stop < self.hard_stop_price:
-                    self.hard_stop_price = hard_stop
-            
-            # Check hard stop first (1% - immediate trigger)
-            if price >= self.hard_stop_price:
-                print(f"🚨 HARD STOP triggered: ${price:.4f} >= ${self.hard_stop_price:.4f} (EMA{self.ema_slow_period}: ${self.ema_slow:.4f}, +{self.hard_stop_loss_pct}%)")
-                self.execute_full_exit(price, "HARD_STOP")
-                return
-                
-            # Track if conditional stop level was breached during candle
-            if price >= self.trailing_stop_price:
-                self.conditional_stop_triggered = True
-                
-            # Check conditional stop on candle close (0.25% - only if candle CLOSES above stop)
-            if is_new_candle and price >= self.trailing_stop_price:
-                print(f"🛑 CONDITIONAL STOP triggered on candle close: ${price:.4f} >= ${self.trailing_stop_price:.4f} (EMA{self.ema_slow_period}: ${self.ema_slow:.4f}, +{self.stop_loss_pct}%)")
-                self.execute_full_exit(price, "CONDITIONAL_STOP")
-                return
-                
-            # Reset conditional stop flag on new candle regardless of where it closes
-            if is_new_candle:
-                self.conditional_stop_triggered = False
+        
+        signed_price = sign * price
+        
+        # Check hard stop first (1% - immediate trigger)
+        if signed_price <= sign * self.hard_stop_price:
+            logger.warning("🚨 HARD STOP triggered: $%.4f %s $%.4f (EMA%s: $%.4f, %s%s%%)",
+                           price, cmp, self.hard_stop_price, self.ema_slow_period, self.ema_slow,
+                           pct_sign, self.hard_stop_loss_pct)
+            self.execute_full_exit(price, "HARD_STOP")
+            return
+        
+        # Track if conditional stop level was breached during candle
+        breached = signed_price <= sign * self.trailing_stop_price
+        if breached:
+            self.conditional_stop_triggered = True
+            
+        # Check conditional stop on candle close (0.25% - only if candle CLOSES beyond stop)
+        if is_new_candle and breached:
+            logger.warning("🛑 CONDITIONAL STOP triggered on candle close: $%.4f %s $%.4f (EMA%s: $%.4f, %s%s%%)",
+                           price, cmp, self.trailing_stop_price, self.ema_slow_period, self.ema_slow,
+                           pct_sign, self.stop_loss_pct)
+            self.execute_full_exit(price, "CONDITIONAL_STOP")
+            return
+            
+        # Reset conditional stop flag on new candle regardless of where it closes
+        if is_new_candle:
+            self.conditional_stop_triggered = False
             
     def execute_tp_level(self, price: float, tp_name: str, tp_config: dict):
         """Execute a specific take profit level"""
@@ -708,7 +916,7 @@ class SimplifiedEMAStrategy:
         
         # Double-check position before placing order
         if abs(self.position) < 0.001:
-            print(f"⚠️ Position became zero before {tp_name.upper()}, skipping")
+            logger.warning("⚠️ Position became zero before %s, skipping", tp_name.upper())
             return
         
         self.log_trade(
@@ -754,14 +962,10 @@ class SimplifiedEMAStrategy:
                 self.ema9_position_value = max(0, self.ema9_position_value)
                 self.ema21_position_value = max(0, self.ema21_position_value)
             
-            print(f"""
-            🎯 {tp_name.upper()} HIT - {tp_config['exit_pct']}% EXIT
-            Price: ${price:.4f} (Target: {tp_config['pct']}%)
-            Quantity: {exit_qty:.3f}
-            P&L: ${pnl:.2f}
-            Total P&L: ${self.realized_pnl:.2f}
-            EMA9 freed: ${ema9_freed:.0f}, EMA21 freed: ${ema21_freed:.0f}
-            """)
+            logger.info("🎯 %s HIT - %s%% EXIT | Price: $%.4f (Target: %s%%) | Quantity: %.3f | "
+                        "P&L: $%.2f | Total P&L: $%.2f | EMA9 freed: $%.0f, EMA21 freed: $%.0f",
+                        tp_name.upper(), tp_config['exit_pct'], price, tp_config['pct'], exit_qty,
+                        pnl, self.realized_pnl, ema9_freed, ema21_freed)
             
             # Sync position from exchange immediately after TP exit
             # This is critical to ensure position tracking stays accurate
@@ -791,10 +995,19 @@ class SimplifiedEMAStrategy:
             reason=reason
         )
         
-        # Cancel all limit orders, TP orders, and stop orders first
-        self.cancel_all_orders()
-        self.cancel_tp_orders()
-        self.cancel_stop_order()
+        # Cancel all limit orders, TP orders, and stop orders first, in one batch
+        # (after letting in-flight placements land so none of them survive the exit)
+        self._drain_order_acks(wait=True)
+        order_ids = list(self.limit_orders)
+        order_ids.extend(self.tp_orders.values())
+        if self.stop_loss_order_id:
+            order_ids.append(self.stop_loss_order_id)
+        if order_ids:
+            cancelled = self._cancel_batch(order_ids)
+            logger.info("🗑️ Cancelled %d/%d open orders before exit", len(cancelled), len(order_ids))
+        self._clear_limit_orders()
+        self.tp_orders.clear()
+        self.stop_loss_order_id = None
         
         # Execute market order
         response = self.client.place_market_order(
@@ -811,13 +1024,8 @@ class SimplifiedEMAStrategy:
             pnl = self.calculate_pnl(self.avg_entry_price, price, exit_qty)
             self.realized_pnl += pnl
             
-            print(f"""
-            ⛔ FULL EXIT ({reason})
-            Price: ${price:.4f}
-            Quantity: {exit_qty:.3f}
-            P&L: ${pnl:.2f}
-            Total P&L: ${self.realized_pnl:.2f}
-            """)
+            logger.info("⛔ FULL EXIT (%s) | Price: $%.4f | Quantity: %.3f | P&L: $%.2f | Total P&L: $%.2f",
+                        reason, price, exit_qty, pnl, self.realized_pnl)
             
             # Sync position from exchange immediately after full exit
             # This ensures position tracking stays accurate
@@ -829,12 +1037,13 @@ class SimplifiedEMAStrategy:
             self.conditional_stop_triggered = False
             self.stop_loss_order_id = None
             self.original_position_size = 0.0
-            self.tp_levels_hit = set()
-            self.last_entry_time = time.time()  # Cooldown before new entry
+            self._tp_hit_mask = 0
+            self._tp_ladder = None
+            self.last_entry_time = time.monotonic()  # Cooldown before new entry
             
-    def manage_entry_orders(self, price: float, can_place_new: bool = True):
+    def manage_entry_orders(self, price: float, can_place_new: bool = True, now: Optional[float] = None):
         """Place and update limit orders at EMAs with per-EMA allocation tracking"""
-        current_time = time.time()
+        current_time = time.monotonic() if now is None else now
         
         # Always update existing orders every 5 seconds
         if current_time - self.last_order_update_time > 5:
@@ -842,15 +1051,13 @@ class SimplifiedEMAStrategy:
             self.last_order_update_time = current_time
         
         # Check minimum trend strength before placing any orders
+        # (_has_sufficient_trend_strength reports the shortfall itself, throttled)
         if not self._has_sufficient_trend_strength():
-            ema_ratio = self.ema_fast / self.ema_slow
-            separation_pct = abs(1 - ema_ratio) * 100
-            print(f"🚫 Insufficient trend strength: {separation_pct:.3f}% < {self.trend_threshold_pct:.3f}% required")
             return
             
         # Don't place new orders when trend is neutral (unless forced)
         if self.trend == "NEUTRAL" and not can_place_new:
-            print(f"🚫 Trend is NEUTRAL and can_place_new={can_place_new}")
+            logger.debug("🚫 Trend is NEUTRAL and can_place_new=%s", can_place_new)
             return
         
         # For existing positions, only place orders in the same direction
@@ -858,7 +1065,7 @@ class SimplifiedEMAStrategy:
             # Don't add to position if we're in opposing trend
             if (self.position > 0 and self.trend == "DOWNTREND") or \
                (self.position < 0 and self.trend == "UPTREND"):
-                print(f"🚫 Position {self.position:.3f} opposes trend {self.trend}")
+                logger.debug("🚫 Position %.3f opposes trend %s", self.position, self.trend)
                 return
         
         # Calculate available allocation per EMA level
@@ -867,7 +1074,7 @@ class SimplifiedEMAStrategy:
         spot_position_usdt = 0.0
         if self.delta_tracker:
             delta_status = self.delta_tracker.get_status(price)
-            spot_position_usdt = abs(delta_status.get('spot_position_usdt', 0.0))
+            spot_position_usdt = abs(delta_status.spot_position_usdt)
         
         # Calculate total exposure and adjust available capital accordingly
         total_futures_locked = self.ema9_position_value + self.ema21_position_value
@@ -882,12 +1089,9 @@ class SimplifiedEMAStrategy:
         ema9_available = (self.ema9_allocation_usdt - self.ema9_position_value) * exposure_factor
         ema21_available = (self.ema21_allocation_usdt - self.ema21_position_value) * exposure_factor
         
-        # Also check for pending orders and subtract their allocation
-        for order_info in self.limit_orders.values():
-            if order_info['ema'] == '9':
-                ema9_available -= order_info.get('usdt_amount', 0)
-            elif order_info['ema'] == '21':
-                ema21_available -= order_info.get('usdt_amount', 0)
+        # Also subtract the allocation of pending orders (resting or still in flight)
+        ema9_available -= self._pending_usdt_by_ema['9']
+        ema21_available -= self._pending_usdt_by_ema['21']
         
         # Ensure non-negative and cap at very small minimum to avoid tiny orders
         ema9_available = max(0, ema9_available)
@@ -900,26 +1104,29 @@ class SimplifiedEMAStrategy:
             ema21_available = 0
         
         # Only show debug info occasionally to reduce noise
-        current_time = time.time()
-        if not hasattr(self, '_last_debug_time') or current_time - self._last_debug_time > 30:
-            print(f"💰 EMA Allocations:")
-            print(f"   EMA9: ${self.ema9_position_value:.0f} locked, ${ema9_available:.0f} available (of ${self.ema9_allocation_usdt:.0f})")
-            print(f"   EMA21: ${self.ema21_position_value:.0f} locked, ${ema21_available:.0f} available (of ${self.ema21_allocation_usdt:.0f})")
+        if current_time - self._last_debug_time > 30:
+            logger.debug("💰 EMA Allocations:")
+            logger.debug("   EMA9: $%.0f locked, $%.0f available (of $%.0f)",
+                         self.ema9_position_value, ema9_available, self.ema9_allocation_usdt)
+            logger.debug("   EMA21: $%.0f locked, $%.0f available (of $%.0f)",
+                         self.ema21_position_value, ema21_available, self.ema21_allocation_usdt)
             if spot_position_usdt > 0:
-                print(f"   Spot: ${spot_position_usdt:.0f} | Total Exposure: ${total_exposure:.0f} / ${self.max_allocation_usdt:.0f}")
-            print(f"🔍 Current orders: {len(self.limit_orders)}")
+                logger.debug("   Spot: $%.0f | Total Exposure: $%.0f / $%.0f",
+                             spot_position_usdt, total_exposure, self.max_allocation_usdt)
+            logger.debug("🔍 Current orders: %d", len(self.limit_orders))
             for order_id, info in self.limit_orders.items():
-                print(f"   Order {order_id[:8]}...: EMA{info['ema']} {info['side']} @ ${info['price']:.4f} (${info.get('usdt_amount', 0):.0f})")
+                logger.debug("   Order %s...: EMA%s %s @ $%.4f ($%.0f)",
+                             order_id[:8], info.ema, info.side, info.price, info.usdt_amount)
             self._last_debug_time = current_time
         
         # Safety check: Don't place ANY orders if we're at or over the total allocation limit
         # Include spot positions in total exposure calculation
         if total_exposure >= self.max_allocation_usdt:
-            if not hasattr(self, '_max_alloc_warning_count') or time.time() - getattr(self, '_max_alloc_warning_time', 0) > 60:
-                print(f"🚫 Maximum allocation reached: ${total_exposure:.0f} / ${self.max_allocation_usdt:.0f} - no new orders")
-                print(f"   Futures: ${total_futures_locked:.0f} | Spot: ${spot_position_usdt:.0f}")
-                self._max_alloc_warning_count = 0
-                self._max_alloc_warning_time = time.time()
+            if current_time - self._max_alloc_warning_time > 60:
+                logger.warning("🚫 Maximum allocation reached: $%.0f / $%.0f - no new orders",
+                               total_exposure, self.max_allocation_usdt)
+                logger.warning("   Futures: $%.0f | Spot: $%.0f", total_futures_locked, spot_position_usdt)
+                self._max_alloc_warning_time = current_time
             return
         
         # Only place new orders if allowed (cooldown respected)
@@ -931,13 +1138,13 @@ class SimplifiedEMAStrategy:
                     return
             
             # Check which EMA levels need orders
-            existing_emas = {info['ema'] for info in self.limit_orders.values()}
-            needs_ema9 = '9' not in existing_emas
-            needs_ema21 = '21' not in existing_emas
+            needs_ema9 = not self._pending_by_ema['9']
+            needs_ema21 = not self._pending_by_ema['21']
             
             # Only show order needs info occasionally
-            if not hasattr(self, '_last_order_debug_time') or current_time - self._last_order_debug_time > 30:
-                print(f"🔍 Order needs: EMA9={needs_ema9} (${ema9_available:.0f} avail), EMA21={needs_ema21} (${ema21_available:.0f} avail)")
+            if current_time - self._last_order_debug_time > 30:
+                logger.debug("🔍 Order needs: EMA9=%s ($%.0f avail), EMA21=%s ($%.0f avail)",
+                             needs_ema9, ema9_available, needs_ema21, ema21_available)
                 self._last_order_debug_time = current_time
             
             # Minimum order size to prevent dust orders
@@ -946,22 +1153,24 @@ class SimplifiedEMAStrategy:
         # Determine order parameters - more aggressive approach
         if self.trend == "UPTREND":
             # Place buy orders in uptrend regardless of price position relative to EMAs
-            if not hasattr(self, '_last_trend_msg_time') or current_time - self._last_trend_msg_time > 60:
-                print(f"🟢 UPTREND: placing buy orders (price: ${price:.4f}, EMA9: ${self.ema_fast:.4f}, EMA21: ${self.ema_slow:.4f})")
+            if current_time - self._last_trend_msg_time > 60:
+                logger.info("🟢 UPTREND: placing buy orders (price: $%.4f, EMA9: $%.4f, EMA21: $%.4f)",
+                            price, self.ema_fast, self.ema_slow)
                 self._last_trend_msg_time = current_time
             if needs_ema9 and ema9_available >= min_order_value:
-                self.place_limit_order("Buy", self.ema_fast, "9", ema9_available)
+                self.place_limit_order("Buy", self.ema_fast, "9", ema9_available, current_time)
             if needs_ema21 and ema21_available >= min_order_value:
-                self.place_limit_order("Buy", self.ema_slow, "21", ema21_available)
+                self.place_limit_order("Buy", self.ema_slow, "21", ema21_available, current_time)
         elif self.trend == "DOWNTREND":
             # Place sell orders in downtrend regardless of price position relative to EMAs
-            if not hasattr(self, '_last_trend_msg_time') or current_time - self._last_trend_msg_time > 60:
-                print(f"🔴 DOWNTREND: placing sell orders (price: ${price:.4f}, EMA9: ${self.ema_fast:.4f}, EMA21: ${self.ema_slow:.4f})")
+            if current_time - self._last_trend_msg_time > 60:
+                logger.info("🔴 DOWNTREND: placing sell orders (price: $%.4f, EMA9: $%.4f, EMA21: $%.4f)",
+                            price, self.ema_fast, self.ema_slow)
                 self._last_trend_msg_time = current_time
             if needs_ema9 and ema9_available >= min_order_value:
-                self.place_limit_order("Sell", self.ema_fast, "9", ema9_available)
+                self.place_limit_order("Sell", self.ema_fast, "9", ema9_available, current_time)
             if needs_ema21 and ema21_available >= min_order_value:
-                self.place_limit_order("Sell", self.ema_slow, "21", ema21_available)
+                self.place_limit_order("Sell", self.ema_slow, "21", ema21_available, current_time)
         # No logging for neutral conditions to reduce noise
     
     def manage_tp_orders(self, price: float):
@@ -985,117 +1194,120 @@ class SimplifiedEMAStrategy:
         print(f"   Position: {self.position:.3f} @ ${self.avg_entry_price:.4f}")
         
         # Place TP orders for each level
-        for tp_name, tp_config in self.take_profit_levels.items():
-            if tp_name in self.tp_levels_hit:
+        for tp_name, tp_bit, tp_price, exit_qty, exit_pct, side in self._get_tp_ladder():
+            if self._tp_hit_mask & tp_bit:
                 continue  # Skip levels already hit
-                
-            # Calculate TP price
-            if self.position > 0:  # Long position
-                tp_price = self.avg_entry_price * (1 + tp_config['pct'] / 100)
-            else:  # Short position
-                tp_price = self.avg_entry_price * (1 - tp_config['pct'] / 100)
-            
-            # Calculate quantity to exit (based on ORIGINAL position size)
-            exit_qty = self.original_position_size * (tp_config['exit_pct'] / 100)
-            exit_qty = self.format_quantity(exit_qty)
             
             if exit_qty < self.min_order_qty:
                 print(f"   ⚠️ {tp_name.upper()}: Quantity {exit_qty:.3f} below minimum, skipping")
                 continue
-                
-            # Format price
-            tp_price = self.format_price(tp_price)
-            
-            # Determine side
-            side = "Sell" if self.position > 0 else "Buy"
             
             # Place TP limit order
-            response = self.client.place_order(
-                category=self.category,
-                symbol=self.symbol,
+            self._submit_order(
+                'tp', tp_name, None,
+                f"   ✅ {tp_name.upper()}: {side} {exit_qty:.3f} @ ${tp_price:.4f} ({exit_pct}% of {self.original_position_size:.3f})",
                 side=side,
                 orderType="Limit",
                 qty=exit_qty,
                 price=tp_price,
                 timeInForce="GTC",
-                reduce_only=True,
-                verbose=False
+                reduce_only=True
             )
-            
-            if response and response.get('retCode') == 0:
-                order_id = response['result']['orderId']
-                self.tp_orders[tp_name] = order_id
-                print(f"   ✅ {tp_name.upper()}: {side} {exit_qty:.3f} @ ${tp_price:.4f} ({tp_config['exit_pct']}% of {self.original_position_size:.3f})")
+    
+    def _get_tp_ladder(self) -> list:
+        """
+        (tp_name, bit, formatted tp_price, formatted exit_qty of the original size, exit_pct, side)
+        per configured level. Rebuilt only when the entry price, original size or side changes.
+        """
+        key = (self.avg_entry_price, self.original_position_size, self.position > 0)
+        if self._tp_ladder is not None and self._tp_ladder_key == key:
+            return self._tp_ladder
+        
+        is_long = self.position > 0
+        side = "Sell" if is_long else "Buy"
+        ladder = []
+        for tp_name, tp_config in self.take_profit_levels.items():
+            # Long TPs sit above entry, short TPs below
+            if is_long:
+                tp_price = self.avg_entry_price * (1 + tp_config['pct'] / 100)
             else:
-                print(f"   ❌ {tp_name.upper()}: Failed to place order - {response.get('retMsg', 'Unknown error')}")
+                tp_price = self.avg_entry_price * (1 - tp_config['pct'] / 100)
+            # Quantity to exit is based on the ORIGINAL position size
+            exit_qty = self.format_quantity(self.original_position_size * (tp_config['exit_pct'] / 100))
+            ladder.append((tp_name, self._tp_bits[tp_name], self.format_price(tp_price),
+                           exit_qty, tp_config['exit_pct'], side))
+        self._tp_ladder = ladder
+        self._tp_ladder_key = key
+        return ladder
     
     def update_tp_orders(self, price: float):
         """Update take profit orders based on current position"""
         if self.position == 0 or self.avg_entry_price == 0:
             return
             
-        # Cancel existing TP orders
+        # Cancel existing TP orders, including any still in flight
+        self._drain_order_acks(wait=True)
         self.cancel_tp_orders()
         
-        # Place new TP orders for each level
-        for tp_name, tp_config in self.take_profit_levels.items():
-            if tp_name in self.tp_levels_hit:
+        # Place new TP orders for each level (prices from the cached ladder)
+        current_size = abs(self.position)
+        for tp_name, tp_bit, tp_price, _, exit_pct, side in self._get_tp_ladder():
+            if self._tp_hit_mask & tp_bit:
                 continue  # Skip levels already hit
-                
-            # Calculate TP price
-            if self.position > 0:  # Long position
-                tp_price = self.avg_entry_price * (1 + tp_config['pct'] / 100)
-            else:  # Short position
-                tp_price = self.avg_entry_price * (1 - tp_config['pct'] / 100)
             
             # Calculate quantity to exit (based on CURRENT position, not original)
-            exit_qty = abs(self.position) * (tp_config['exit_pct'] / 100)
-            exit_qty = self.format_quantity(exit_qty)
+            exit_qty = self.format_quantity(current_size * (exit_pct / 100))
             
             if exit_qty < self.min_order_qty:
                 continue
-                
-            # Format price
-            tp_price = self.format_price(tp_price)
-            
-            # Determine side
-            side = "Sell" if self.position > 0 else "Buy"
             
             # Place TP order
-            response = self.client.place_order(
-                category=self.category,
-                symbol=self.symbol,
+            self._submit_order(
+                'tp', tp_name, None,
+                f"🎯 TP{tp_name.upper()} order placed: {side} {exit_qty:.3f} @ ${tp_price:.4f} ({exit_pct}% of {current_size:.3f})",
                 side=side,
                 orderType="Limit",
                 qty=exit_qty,
                 price=tp_price,
                 timeInForce="GTC",
-                reduce_only=True,
-                verbose=False
+                reduce_only=True
             )
-            
-            if response and response.get('retCode') == 0:
-                order_id = response['result']['orderId']
-                self.tp_orders[tp_name] = order_id
-                print(f"🎯 TP{tp_name.upper()} order placed: {side} {exit_qty:.3f} @ ${tp_price:.4f} ({tp_config['exit_pct']}% of {abs(self.position):.3f})")
     
     def cancel_tp_orders(self):
         """Cancel all active TP orders"""
-        for tp_name, order_id in list(self.tp_orders.items()):
+        if not self.tp_orders:
+            return
+        cancelled = self._cancel_batch(list(self.tp_orders.values()))
+        for tp_name, order_id in self.tp_orders.items():
+            if order_id in cancelled:
+                print(f"🗑️ Cancelled TP{tp_name.upper()} order")
+        self.tp_orders.clear()
+
+    def _cancel_batch(self, order_ids) -> set:
+        """
+        Cancel order_ids with one cancel-batch request per chunk.
+        Returns the IDs the exchange confirmed as cancelled; the rest were
+        already filled/cancelled or errored and are picked up by the next sync.
+        """
+        cancelled = set()
+        chunk = CANCEL_BATCH_SIZE.get(self.category, CANCEL_BATCH_SIZE_DEFAULT)
+        for i in range(0, len(order_ids), chunk):
+            ids = order_ids[i:i + chunk]
             try:
-                response = self.client.cancel_order(
-                    category=self.category,
-                    symbol=self.symbol,
-                    orderId=order_id
-                )
-                if response and response.get('retCode') == 0:
-                    print(f"🗑️ Cancelled TP{tp_name.upper()} order")
-                del self.tp_orders[tp_name]
+                response = self.client.cancel_batch(self.category, self.symbol, ids)
             except Exception as e:
-                print(f"⚠️ Error cancelling TP{tp_name.upper()} order: {e}")
-                del self.tp_orders[tp_name]
+                print(f"⚠️ Error cancelling {len(ids)} orders: {e}")
+                continue
+            if not response or response.get('retCode') != 0:
+                continue
+            results = response['result'].get('list', [])
+            codes = (response.get('retExtInfo') or {}).get('list', [])
+            for j, result in enumerate(results):
+                if j >= len(codes) or codes[j].get('code') == 0:
+                    cancelled.add(result.get('orderId'))
+        return cancelled
     
-    def _should_place_orders_given_delta(self, delta_status: dict, price: float) -> bool:
+    def _should_place_orders_given_delta(self, delta_status, price: float) -> bool:
         """
         Check if we should place orders given current delta status.
         Returns True if orders should be placed, False otherwise.
@@ -1104,18 +1316,21 @@ class SimplifiedEMAStrategy:
             return True  # No delta constraints if no tracker
         
         # If we need rebalancing, be more restrictive about new entries
-        if delta_status['needs_rebalance']:
-            print("🚫 Skipping new orders: Delta rebalancing needed")
+        if delta_status.needs_rebalance:
+            current_time = time.monotonic()
+            if current_time - self._delta_skip_warning_time > 60:
+                logger.warning("🚫 Skipping new orders: Delta rebalancing needed")
+                self._delta_skip_warning_time = current_time
             return False
         
         # Check if new entries would push us further from desired delta
         # Calculate available capital for delta check, accounting for spot positions
-        current_position_value = abs(self.position) * self.avg_entry_price if self.avg_entry_price > 0 else 0
-        spot_position_usdt = abs(delta_status.get('spot_position_usdt', 0.0))
+        current_position_value = self._position_value_usdt
+        spot_position_usdt = abs(delta_status.spot_position_usdt)
         total_exposure = current_position_value + spot_position_usdt
         total_entry_usdt = self.max_allocation_usdt - total_exposure
-        current_delta = delta_status['total_delta']
-        desired_delta = delta_status['desired_delta']
+        current_delta = delta_status.total_delta
+        desired_delta = delta_status.desired_delta
         
         # Simulate the impact of new orders
         if self.trend == "UPTREND":
@@ -1132,8 +1347,6 @@ class SimplifiedEMAStrategy:
         projected_divergence = abs(projected_delta - desired_delta)
         
         # Debug output (only occasionally to avoid spam)
-        if not hasattr(self, '_delta_debug_count'):
-            self._delta_debug_count = 0
         self._delta_debug_count += 1
         
         # Delta check debug removed to reduce noise
@@ -1144,38 +1357,40 @@ class SimplifiedEMAStrategy:
         # Only block trades if projected divergence exceeds the threshold AND we're already close to it
         if projected_divergence > threshold and current_divergence > (threshold * 0.7):
             trend_direction = "LONG" if self.trend == "UPTREND" else "SHORT"
-            print(f"🚫 Skipping {trend_direction} orders: Would exceed delta threshold (${projected_divergence:+,.0f} > ${threshold:,.0f})")
+            current_time = time.monotonic()
+            if current_time - self._delta_skip_warning_time > 60:
+                logger.warning("🚫 Skipping %s orders: Would exceed delta threshold ($%+.0f > $%.0f)",
+                               trend_direction, projected_divergence, threshold)
+                self._delta_skip_warning_time = current_time
             return False
         
         return True
             
-    def place_limit_order(self, side: str, ema_price: float, ema_type: str, allocation_usdt: float):
+    def place_limit_order(self, side: str, ema_price: float, ema_type: str, allocation_usdt: float,
+                          now: Optional[float] = None):
         """Place a single limit order based on available allocation"""
-        current_time = time.time()
-        
-        # Check if we already have an order at this EMA
-        for order_info in self.limit_orders.values():
-            if order_info['ema'] == ema_type:
-                # Only log this occasionally to reduce noise
-                if not hasattr(self, '_skip_count'):
-                    self._skip_count = {}
-                if ema_type not in self._skip_count:
-                    self._skip_count[ema_type] = 0
-                self._skip_count[ema_type] += 1
-                if self._skip_count[ema_type] <= 2 or self._skip_count[ema_type] % 10 == 0:
-                    print(f"📍 EMA{ema_type} order already exists, skipping")
-                return
+        current_time = time.monotonic() if now is None else now
+        
+        # Check if we already have an order at this EMA (resting or in flight)
+        if self._pending_by_ema[ema_type]:
+            # Only log this occasionally to reduce noise
+            if ema_type not in self._skip_count:
+                self._skip_count[ema_type] = 0
+            self._skip_count[ema_type] += 1
+            if self._skip_count[ema_type] <= 2 or self._skip_count[ema_type] % 10 == 0:
+                logger.debug("📍 EMA%s order already exists, skipping", ema_type)
+            return
         
         # Check if we recently placed an order at this EMA (throttling)
         if ema_type == '9':
             if current_time - self.last_ema9_order_time < self.order_placement_cooldown:
                 time_remaining = self.order_placement_cooldown - (current_time - self.last_ema9_order_time)
-                print(f"⏳ EMA9 order cooldown: {time_remaining:.0f}s remaining")
+                logger.debug("⏳ EMA9 order cooldown: %.0fs remaining", time_remaining)
                 return
         elif ema_type == '21':
             if current_time - self.last_ema21_order_time < self.order_placement_cooldown:
                 time_remaining = self.order_placement_cooldown - (current_time - self.last_ema21_order_time)
-                print(f"⏳ EMA21 order cooldown: {time_remaining:.0f}s remaining")
+                logger.debug("⏳ EMA21 order cooldown: %.0fs remaining", time_remaining)
                 return
         
         # Apply entry offset to improve fill probability
@@ -1192,11 +1407,9 @@ class SimplifiedEMAStrategy:
         # Skip if no allocation available
         if allocation_usdt <= 0:
             # Only show this message occasionally to reduce noise
-            if not hasattr(self, '_no_allocation_count'):
-                self._no_allocation_count = 0
             self._no_allocation_count += 1
             if self._no_allocation_count <= 2 or self._no_allocation_count % 20 == 0:
-                print(f"❌ Skipping EMA{ema_type} order: No allocation available (${allocation_usdt:.2f})")
+                logger.debug("❌ Skipping EMA%s order: No allocation available ($%.2f)", ema_type, allocation_usdt)
             return
                 
         # Calculate quantity based on available allocation (use adjusted price for accurate allocation)
@@ -1207,84 +1420,73 @@ class SimplifiedEMAStrategy:
         
         # Check if formatted quantity is meaningful
         if qty < self.min_order_qty:
-            print(f"⚠️ Calculated quantity {qty} too small for {ema_type} EMA order")
+            logger.warning("⚠️ Calculated quantity %s too small for %s EMA order", qty, ema_type)
             return
         
         # Format price properly
         formatted_price = self.format_price(adjusted_price)
         
         # Debug output for order parameters
-        print(f"🔍 Order params: qty={qty} (raw: {allocation_usdt / adjusted_price:.6f}), price={formatted_price}, qty_step={self.qty_step}")
+        logger.debug("🔍 Order params: qty=%s (raw: %.6f), price=%s, qty_step=%s",
+                     qty, allocation_usdt / adjusted_price, formatted_price, self.qty_step)
         
-        # Place order
-        response = self.client.place_order(
-            category=self.category,
-            symbol=self.symbol,
+        # Place order; the ack is recorded in limit_orders by _drain_order_acks
+        order_info = LimitOrder(
+            ema=ema_type,
+            price=formatted_price,
+            side=side,
+            qty=qty,
+            usdt_amount=allocation_usdt  # Track USDT amount for this order
+        )
+        self._submit_order(
+            'limit', ema_type, order_info,
+            f"📍 {side} order placed at EMA{ema_type}: ${formatted_price:.4f} (EMA: ${ema_price:.4f}, offset: {entry_offset_pct:.3f}%, qty: {qty:.3f}, ${allocation_usdt:.0f})",
             side=side,
             orderType="Limit",
             qty=qty,
             price=formatted_price,
-            timeInForce="GTC",
-            verbose=False
+            timeInForce="GTC"
         )
-        
-        if response and response.get('retCode') == 0:
-            order_id = response['result']['orderId']
-            self.limit_orders[order_id] = {
-                'ema': ema_type,
-                'price': formatted_price,
-                'side': side,
-                'qty': qty,
-                'usdt_amount': allocation_usdt  # Track USDT amount for this order
-            }
-            
-            # Update last order time for this EMA
-            if ema_type == '9':
-                self.last_ema9_order_time = time.time()
-            elif ema_type == '21':
-                self.last_ema21_order_time = time.time()
-            
-            print(f"📍 {side} order placed at EMA{ema_type}: ${formatted_price:.4f} (EMA: ${ema_price:.4f}, offset: {entry_offset_pct:.3f}%, qty: {qty:.3f}, ${allocation_usdt:.0f})")
             
     def update_limit_orders(self):
         """Update or cancel stale limit orders and replace with current EMA prices"""
         # First, check if any orders would violate capital limits
-        current_position_value = abs(self.position) * self.avg_entry_price if self.avg_entry_price > 0 else 0
+        current_position_value = self._position_value_usdt
         
         # Account for spot positions in available capital calculation
         spot_position_usdt = 0.0
         if self.delta_tracker:
             delta_status = self.delta_tracker.get_status()
-            spot_position_usdt = abs(delta_status.get('spot_position_usdt', 0.0))
+            spot_position_usdt = abs(delta_status.spot_position_usdt)
         
         total_exposure = current_position_value + spot_position_usdt
         available_capital = self.max_allocation_usdt - total_exposure
         
         for order_id, info in list(self.limit_orders.items()):
             # Check if this order would exceed capital limits if filled
-            order_usdt_value = info.get('usdt_amount', 0)
+            order_usdt_value = info.usdt_amount
             
             if order_usdt_value > available_capital * 1.1:  # 10% buffer for price movement
-                print(f"🚫 Cancelling {info['ema']} EMA order: Would exceed capital limits")
+                print(f"🚫 Cancelling {info.ema} EMA order: Would exceed capital limits")
                 print(f"   Order value: ${order_usdt_value:.0f}, Available capital: ${available_capital:.0f}")
                 self.cancel_order(order_id)
                 continue
             
-            current_ema = self.ema_fast if info['ema'] == '9' else self.ema_slow
+            current_ema = self.ema_fast if info.ema == '9' else self.ema_slow
             
             # Calculate what the order price SHOULD be (EMA + offset)
             entry_offset_pct = self.config.get('entry_offset_pct', 0.0)
-            if info['side'] == "Buy":
+            if info.side == "Buy":
                 target_price = current_ema * (1 + entry_offset_pct / 100)
             else:  # Sell
                 target_price = current_ema * (1 - entry_offset_pct / 100)
             
             # Check if order price needs updating based on configurable threshold
-            price_diff_pct = abs(info['price'] - target_price) / target_price
+            price_diff_pct = abs(info.price - target_price) / target_price
             threshold = self.order_update_threshold_pct / 100  # Convert percentage to decimal
             
             if price_diff_pct > threshold:
-                print(f"🔄 Updating {info['ema']} EMA order: ${info['price']:.4f} → ${target_price:.4f} (diff: {price_diff_pct*100:.2f}% > {self.order_update_threshold_pct}%)")
+                print(f"🔄 Updating {info.ema} EMA order: ${info.price:.4f} → ${target_price:.4f} (diff: {price_diff_pct*100:.2f}% > {self.order_update_threshold_pct}%)")
                 
                 # Cancel old order - if it was already filled, don't place a new one
                 was_filled = self.cancel_order(order_id)
@@ -1292,24 +1494,22 @@ class SimplifiedEMAStrategy:
                 if not was_filled:
                     # Only place new order if the old one wasn't already filled
                     # Recalculate allocation based on CURRENT available capital (including spot positions)
-                    current_position_value = abs(self.position) * self.avg_entry_price if self.avg_entry_price > 0 else 0
+                    current_position_value = self._position_value_usdt
                     current_available = self.max_allocation_usdt - (current_position_value + spot_position_usdt)
-                    ema_pct = self.ema9_allocation_usdt if info['ema'] == '9' else self.ema21_allocation_usdt
+                    ema_pct = self.ema9_allocation_usdt if info.ema == '9' else self.ema21_allocation_usdt
                     new_allocation = current_available * (ema_pct / self.max_allocation_usdt)
                     
                     if new_allocation > 0:
-                        self.place_limit_order(info['side'], current_ema, info['ema'], new_allocation)
+                        self.place_limit_order(info.side, current_ema, info.ema, new_allocation)
                     else:
-                        print(f"  ⚠️ No capital available for new {info['ema']} EMA order")
+                        print(f"  ⚠️ No capital available for new {info.ema} EMA order")
                 else:
-                    print(f"  ✅ Not placing new order since {info['ema']} EMA order was already filled")
+                    print(f"  ✅ Not placing new order since {info.ema} EMA order was already filled")
             else:
                 # Only show this debug info occasionally to avoid spam
-                if not hasattr(self, '_order_check_count'):
-                    self._order_check_count = 0
                 self._order_check_count += 1
                 if self._order_check_count <= 3 or self._order_check_count % 20 == 0:
-                    print(f"📍 {info['ema']} EMA order OK: ${info['price']:.4f} vs ${target_price:.4f} (diff: {price_diff_pct*100:.2f}% < {self.order_update_threshold_pct}%)")
+                    print(f"📍 {info.ema} EMA order OK: ${info.price:.4f} vs ${target_price:.4f} (diff: {price_diff_pct*100:.2f}% < {self.order_update_threshold_pct}%)")
                 
     def cancel_order(self, order_id: str):
         """Cancel a single order and restore inventory if not filled"""
@@ -1331,6 +1531,11 @@ class SimplifiedEMAStrategy:
             elif response is None:
                 # Client already printed error, treat as potentially filled
                 was_filled = True
+            elif response.get('retCode') != 0:
+                # Rejected (e.g. rate limit): the order is still live, so keep tracking it -
+                # its EMA stays indexed and place_limit_order won't stack a replacement
+                print(f"  ⚠️ Cancel of order {order_id[:8]}... rejected: {response.get('retMsg', 'Unknown error')}")
+                return False
             else:
                 # Order was successfully cancelled
                 print(f"  ✅ Order {order_id[:8]}... cancelled successfully")
@@ -1340,9 +1545,10 @@ class SimplifiedEMAStrategy:
             # Don't assume filled on error - check if order still exists
             was_filled = False
         
-        # Always remove from tracking regardless of result
-        if order_id in self.limit_orders:
-            del self.limit_orders[order_id]
+        # Otherwise remove from tracking regardless of result
+        if order_info is not None:
+            self._unindex_limit_order(order_id, order_info)
+        self.limit_orders.pop(order_id, None)
         
         return was_filled
             
@@ -1373,31 +1579,56 @@ class SimplifiedEMAStrategy:
             
     def log_trade(self, action: str, price: float, quantity: float, reason: str):
         """Log a trade for analysis"""
-        trade = TradeLog(
-            timestamp=time.time(),
-            action=action,
-            price=price,
-            quantity=quantity,
-            position_before=self.position,
-            position_after=self.position,  # Will be updated after trade
-            reason=reason,
-            pnl=None  # Will be calculated if exit
+        timestamp = time.time()
+        # position_after is updated after the trade; pnl stays NaN unless calculated on exit
+        self._trades_buf[self._trade_head % TRADE_BUFFER_SIZE] = (
+            timestamp, self._trade_label(action), self._trade_label(reason), price, quantity,
+            self.position, self.position, np.nan,
         )
-        self.trades.append(trade)
+        self._trade_head += 1
         
         # Also save to file for persistence
         with open('trades.json', 'a') as f:
             trade_dict = {
-                'timestamp': trade.timestamp,
-                'datetime': datetime.fromtimestamp(trade.timestamp).isoformat(),
-                'action': trade.action,
-                'price': trade.price,
-                'quantity': trade.quantity,
-                'position_before': trade.position_before,
-                'reason': trade.reason
+                'timestamp': timestamp,
+                'datetime': datetime.fromtimestamp(timestamp).isoformat(),
+                'action': action,
+                'price': price,
+                'quantity': quantity,
+                'position_before': self.position,
+                'reason': reason
             }
             f.write(json.dumps(trade_dict) + '\n')
             
+    def _trade_label(self, label: str) -> int:
+        """Code for an action/reason string, interned on first use"""
+        code = self._trade_label_codes.get(label)
+        if code is None:
+            code = self._trade_label_codes[label] = len(self._trade_labels)
+            self._trade_labels.append(label)
+        return code
+        
+    def _trade_row(self, n: int) -> TradeLog:
+        """Materialize the n-th logged trade (must still be in the ring)"""
+        row = self._trades_buf[n % TRADE_BUFFER_SIZE]
+        pnl = float(row['pnl'])
+        return TradeLog(
+            timestamp=float(row['ts']),
+            action=self._trade_labels[row['action']],
+            price=float(row['price']),
+            quantity=float(row['qty']),
+            position_before=float(row['pos_before']),
+            position_after=float(row['pos_after']),
+            reason=self._trade_labels[row['reason']],
+            pnl=None if pnl != pnl else pnl
+        )
+        
+    @property
+    def trades(self) -> List[TradeLog]:
+        """Trades still held in the ring, oldest first"""
+        start = max(0, self._trade_head - TRADE_BUFFER_SIZE)
+        return [self._trade_row(n) for n in range(start, self._trade_head)]
+            
     def get_status(self, current_price: float = None) -> dict:
         """Get current status for monitoring"""
         current_pnl_pct = 0
@@ -1421,8 +1652,8 @@ class SimplifiedEMAStrategy:
             'trailing_stop': self.trailing_stop_price,
             'hard_stop': self.hard_stop_price,
             'conditional_stop_triggered': self.conditional_stop_triggered,
-            'tp_levels_hit': list(self.tp_levels_hit),
-            'last_trade': self.trades[-1] if self.trades else None
+            'tp_levels_hit': [name for name, bit in self._tp_bits.items() if self._tp_hit_mask & bit],
+            'last_trade': self._trade_row(self._trade_head - 1) if self._trade_head else None
         }
         
     def calculate_current_pnl_pct(self, current_price: float) -> float:
@@ -2,10 +2,28 @@
 
 from pybit.unified_trading import HTTP
 import websocket
+import hashlib
+import hmac
 import json
+import socket
 import threading
 import time
+import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
+from pybit.exceptions import InvalidRequestError
+from requests.adapters import HTTPAdapter
+
+class _LowLatencyAdapter(HTTPAdapter):
+    """Pooled HTTPS adapter whose sockets disable Nagle and keep idle connections alive."""
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
 
 class BybitClient:
     def __init__(self, api_key, api_secret, testnet=False):
@@ -15,10 +33,91 @@ class BybitClient:
                 api_key=api_key,
                 api_secret=api_secret,
             )
+            # pybit sends everything through one requests.Session; give it a tuned pool
+            self.session.client.mount("https://", _LowLatencyAdapter(pool_connections=4, pool_maxsize=16))
             print("✅ Bybit client initialized successfully.")
         except Exception as e:
             print(f"❌ Error initializing Bybit client: {e}")
             self.session = None
+        # Optional BybitWsTrader: order create/amend/cancel go over it while it's up, else REST
+        self.ws_trader = None
+        self._keepalive_stop = threading.Event()
+        self._keepalive_thread = None
+
+    def start_keepalive(self, interval=20.0):
+        """Ping /v5/market/time every `interval` seconds so the pooled TLS connection stays warm."""
+        if not self.session or self._keepalive_thread is not None:
+            return
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop, args=(interval,), daemon=True)
+        self._keepalive_thread.start()
+
+    def stop_keepalive(self):
+        self._keepalive_stop.set()
+        self._keepalive_thread = None
+
+    def _keepalive_loop(self, interval):
+        while not self._keepalive_stop.wait(interval):
+            try:
+                self.session.get_server_time()
+            except Exception:
+                # Next real request reconnects; nothing to do here
+                pass
+
+    def attach_ws_trader(self, trader):
+        self.ws_trader = trader
+
+    def _submit(self, op, params, rest_call):
+        """
+        Send an order op over the trade websocket when it's ready, otherwise over REST.
+        Both paths return the REST-shaped dict, exchange rejects included (non-zero retCode);
+        None means the outcome is unknown. order.create gets an orderLinkId so an unacked
+        order can be looked up instead of being reported as failed and placed again.
+        """
+        if op == "order.create" and "orderLinkId" not in params:
+            params["orderLinkId"] = uuid.uuid4().hex
+        trader = self.ws_trader
+        if trader is not None and trader.is_ready:
+            response = trader.request(op, params)
+            if response is None and op == "order.create":
+                response = self._find_order_by_link_id(params["category"], params["symbol"], params["orderLinkId"])
+            return response
+        try:
+            return rest_call(**params)
+        except InvalidRequestError as e:
+            # pybit raises on a non-zero retCode; hand it back in the same shape as the WS path
+            return {"retCode": e.status_code, "retMsg": e.message, "result": {}, "retExtInfo": {}}
+        except Exception:
+            if op != "order.create":
+                raise
+            # Transport failure after the request may have reached the exchange
+            response = self._find_order_by_link_id(params["category"], params["symbol"], params["orderLinkId"])
+            if response is None:
+                raise
+            return response
+
+    def _find_order_by_link_id(self, category, symbol, order_link_id):
+        """
+        Look up an order whose create ack never arrived. Returns a successful create response
+        if the exchange has it (open or already finished), else None.
+        """
+        for lookup in (self.session.get_open_orders, self.session.get_order_history):
+            try:
+                response = lookup(category=category, symbol=symbol, orderLinkId=order_link_id)
+            except Exception as e:
+                print(f"  ⚠️ Could not look up order {order_link_id}: {e}")
+                return None
+            orders = response.get("result", {}).get("list", []) if response else []
+            if orders:
+                print(f"  🔎 Unacked order {order_link_id} found on exchange: {orders[0]['orderId']}")
+                return {
+                    "retCode": 0,
+                    "retMsg": "OK",
+                    "result": {"orderId": orders[0]["orderId"], "orderLinkId": order_link_id},
+                    "retExtInfo": {},
+                }
+        return None
 
     # --- NEW METHOD ---
     # Gets historical candle data
@@ -106,7 +205,7 @@ class BybitClient:
             if position_idx is not None:
                 params["positionIdx"] = position_idx
 
-            response = self.session.place_order(**params)
+            response = self._submit("order.create", params, self.session.place_order)
             
             if response and response.get("retCode") == 0:
                 order_id = response["result"].get("orderId", "N/A")
@@ -114,7 +213,7 @@ class BybitClient:
                     print(f"  ✅ Order placed successfully! Order ID: {order_id}")
             else:
                 if verbose:
-                    print(f"  ❌ API Error: {response.get('retMsg', 'Unknown error')}")
+                    print(f"  ❌ API Error: {response.get('retMsg', 'Unknown error') if response else 'No response'}")
             return response
         except Exception as e:
             print(f"  ❌ An exception occurred: {e}")
@@ -151,7 +250,7 @@ class BybitClient:
             if triggerDirection is not None:
                 params["triggerDirection"] = triggerDirection
 
-            response = self.session.place_order(**params)
+            response = self._submit("order.create", params, self.session.place_order)
             
             if response and response.get("retCode") == 0:
                 order_id = response["result"].get("orderId", "N/A")
@@ -159,12 +258,63 @@ class BybitClient:
                     print(f"  ✅ Order placed successfully! Order ID: {order_id}")
             else:
                 if verbose:
-                    print(f"  ❌ API Error: {response.get('retMsg', 'Unknown error')}")
+                    print(f"  ❌ API Error: {response.get('retMsg', 'Unknown error') if response else 'No response'}")
             return response
         except Exception as e:
             print(f"  ❌ An exception occurred: {e}")
             return None
 
+    def place_batch_order(self, category, orders, verbose=True):
+        """
+        Place several orders of one category in a single request (/v5/order/create-batch).
+        Each order is a dict of place_order fields (symbol, side, orderType, qty, price, ...).
+        Per-order results are in result.list, per-order retCodes in retExtInfo.list.
+        """
+        if not self.session:
+            print("  ❌ API session not initialized.")
+            return None
+
+        if verbose:
+            print(f"  Attempting to place batch of {len(orders)} {category.upper()} orders...")
+
+        try:
+            request = []
+            for order in orders:
+                params = {k: v for k, v in order.items() if k != "category" and v is not None}
+                for field in ("qty", "price", "triggerPrice"):
+                    if field in params:
+                        params[field] = str(params[field])
+                request.append(params)
+
+            response = self.session.place_batch_order(category=category, request=request)
+
+            if verbose:
+                if response and response.get("retCode") == 0:
+                    print(f"  ✅ Batch submitted ({len(orders)} orders)")
+                else:
+                    print(f"  ❌ API Error: {response.get('retMsg', 'Unknown error') if response else 'No response'}")
+            return response
+        except Exception as e:
+            print(f"  ❌ An exception occurred while placing batch: {e}")
+            return None
+
+    def cancel_batch(self, category, symbol, order_ids):
+        """
+        Cancel several orders of one symbol in a single request (/v5/order/cancel-batch).
+        Bybit accepts at most 20 orders per call (10 for spot); callers chunk.
+        Per-order retCodes are in retExtInfo.list, aligned with result.list.
+        """
+        if not self.session:
+            print("  ❌ API session not initialized.")
+            return None
+
+        try:
+            request = [{"symbol": symbol, "orderId": order_id} for order_id in order_ids]
+            return self.session.cancel_batch_order(category=category, request=request)
+        except Exception as e:
+            print(f"  ❌ An exception occurred while cancelling batch: {e}")
+            return None
+
     def cancel_order(self, category, symbol, orderId):
         """Cancel an order"""
         if not self.session:
@@ -172,18 +322,34 @@ class BybitClient:
             return None
 
         try:
-            response = self.session.cancel_order(
-                category=category,
-                symbol=symbol,
-                orderId=orderId
-            )
+            params = {"category": category, "symbol": symbol, "orderId": orderId}
+            response = self._submit("order.cancel", params, self.session.cancel_order)
             return response
         except Exception as e:
             print(f"  ❌ An exception occurred while cancelling order: {e}")
             return None
 
-    def get_open_orders(self, category, symbol=None, orderId=None):
-        """Get open orders"""
+    def amend_order(self, category, symbol, orderId, qty=None, price=None):
+        """Amend the price and/or quantity of a live order"""
+        if not self.session:
+            print("  ❌ API session not initialized.")
+            return None
+
+        try:
+            params = {"category": category, "symbol": symbol, "orderId": orderId}
+            if qty is not None:
+                params["qty"] = str(qty)
+            if price is not None:
+                params["price"] = str(price)
+
+            response = self._submit("order.amend", params, self.session.amend_order)
+            return response
+        except Exception as e:
+            print(f"  ❌ An exception occurred while amending order: {e}")
+            return None
+
+    def get_open_orders(self, category, symbol=None, orderId=None, limit=None, cursor=None):
+        """Get open orders (pass result.nextPageCursor back as `cursor` for the next page)"""
         if not self.session:
             print("  ❌ API session not initialized.")
             return None
@@ -194,6 +360,10 @@ class BybitClient:
                 params["symbol"] = symbol
             if orderId:
                 params["orderId"] = orderId
+            if limit:
+                params["limit"] = limit
+            if cursor:
+                params["cursor"] = cursor
             
             response = self.session.get_open_orders(**params)
             return response
@@ -201,8 +371,8 @@ class BybitClient:
             print(f"  ❌ An exception occurred while fetching open orders: {e}")
             return None
 
-    def get_executions(self, category, symbol=None, orderId=None, limit=50):
-        """Get order executions/fills"""
+    def get_executions(self, category, symbol=None, orderId=None, limit=50, startTime=None, cursor=None):
+        """Get order executions/fills (pass result.nextPageCursor back as `cursor` for the next page)"""
         if not self.session:
             print("  ❌ API session not initialized.")
             return None
@@ -215,6 +385,10 @@ class BybitClient:
                 params["orderId"] = orderId
             if limit:
                 params["limit"] = limit
+            if startTime:
+                params["startTime"] = int(startTime)
+            if cursor:
+                params["cursor"] = cursor
             
             response = self.session.get_executions(**params)
             return response
@@ -308,6 +482,79 @@ class BybitClient:
             print(f"  ❌ Error calculating spot position value: {e}")
             return 0.0
 
+
+class CachedBybitClient:
+    """
+    Wraps a BybitClient and memoizes read-only position/balance calls for a short TTL,
+    so components polling the same data within one loop iteration share a single
+    REST round trip. Any order placement or cancellation drops the whole cache.
+    Everything else is delegated to the wrapped client unchanged.
+    """
+    def __init__(self, client, ttl_ms: float = 250.0):
+        self._client = client
+        self.ttl_seconds = max(0.0, float(ttl_ms)) / 1000.0
+        self._cache = {}  # (method, args, frozenset(kwargs)) -> (monotonic_ts, response)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def _cached_call(self, method, *args, **kwargs):
+        key = (method, args, frozenset(kwargs.items()))
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < self.ttl_seconds:
+            return hit[1]
+        response = getattr(self._client, method)(*args, **kwargs)
+        if response is not None:
+            self._cache[key] = (now, response)
+        return response
+
+    def invalidate(self):
+        """Drop all cached responses (positions/balances may have changed)."""
+        self._cache.clear()
+
+    def get_positions(self, *args, **kwargs):
+        return self._cached_call("get_positions", *args, **kwargs)
+
+    def get_coin_balance(self, *args, **kwargs):
+        return self._cached_call("get_coin_balance", *args, **kwargs)
+
+    def get_wallet_balance(self, *args, **kwargs):
+        return self._cached_call("get_wallet_balance", *args, **kwargs)
+
+    def get_spot_position_value(self, *args, **kwargs):
+        return self._cached_call("get_spot_position_value", *args, **kwargs)
+
+    def place_market_order(self, *args, **kwargs):
+        response = self._client.place_market_order(*args, **kwargs)
+        self.invalidate()
+        return response
+
+    def place_order(self, *args, **kwargs):
+        response = self._client.place_order(*args, **kwargs)
+        self.invalidate()
+        return response
+
+    def place_batch_order(self, *args, **kwargs):
+        response = self._client.place_batch_order(*args, **kwargs)
+        self.invalidate()
+        return response
+
+    def cancel_order(self, *args, **kwargs):
+        response = self._client.cancel_order(*args, **kwargs)
+        self.invalidate()
+        return response
+
+    def cancel_batch(self, *args, **kwargs):
+        response = self._client.cancel_batch(*args, **kwargs)
+        self.invalidate()
+        return response
+
+    def amend_order(self, *args, **kwargs):
+        response = self._client.amend_order(*args, **kwargs)
+        self.invalidate()
+        return response
+
 # Helper function to create an instance of your class
 def get_bybit_client():
     from . import config
@@ -341,6 +588,8 @@ class BybitWebSocketManager:
         self.fallback_mode = False
         self.fallback_price = None
         self.last_price = None  # cache last known price
+        self.best_bid = None  # top of book from orderbook.1
+        self.best_ask = None
         
         # Connection health monitoring
         self.last_message_time = None
@@ -395,6 +644,17 @@ class BybitWebSocketManager:
                 except (TypeError, ValueError) as e:
                     print(f"⚠️ WebSocket: Error parsing ticker price: {e}")
                     
+            # Top-of-book updates (depth 1 always pushes full snapshots)
+            if "topic" in data and data["topic"].startswith("orderbook."):
+                book = data.get("data", {})
+                try:
+                    if book.get("b"):
+                        self.best_bid = float(book["b"][0][0])
+                    if book.get("a"):
+                        self.best_ask = float(book["a"][0][0])
+                except (TypeError, ValueError, IndexError) as e:
+                    print(f"⚠️ WebSocket: Error parsing orderbook data: {e}")
+
             # Kline/candle updates
             if "topic" in data and "kline" in data["topic"]:
                 kline_list = data.get("data", [])
@@ -445,13 +705,14 @@ class BybitWebSocketManager:
             "op": "subscribe",
             "args": [
                 f"tickers.{self.symbol}",
-                f"kline.{self.interval}.{self.symbol}"
+                f"kline.{self.interval}.{self.symbol}",
+                f"orderbook.1.{self.symbol}"
             ]
         }
         
         try:
             self.ws.send(json.dumps(subs))
-            print(f"📡 WebSocket: Subscribed to tickers.{self.symbol} and kline.{self.interval}.{self.symbol}")
+            print(f"📡 WebSocket: Subscribed to tickers.{self.symbol}, kline.{self.interval}.{self.symbol} and orderbook.1.{self.symbol}")
             self.is_connected = True
         except Exception as e:
             print(f"❌ WebSocket: Failed to send subscription: {e}")
@@ -532,6 +793,10 @@ class BybitWebSocketManager:
         # Return None if no price data available
         return None
 
+    def get_best_bid_ask(self):
+        """Returns (best_bid, best_ask) from the orderbook stream; either may be None."""
+        return self.best_bid, self.best_ask
+
     def get_latest_closed_candle(self):
         """Returns (close_price, close_ts_ms) for the latest closed 1m candle, if available."""
         if self.latest_candle_close is not None and self.latest_candle_ts is not None:
@@ -638,3 +903,371 @@ class BybitWebSocketManager:
             
         return status
 
+
+
+# Order statuses after which an order will never fill further
+TERMINAL_ORDER_STATUSES = ("Filled", "Cancelled", "Rejected", "PartiallyFilledCanceled", "Deactivated")
+# Finished orders PositionStore keeps around for late wait_for_order() callers before evicting
+MAX_TERMINAL_ORDERS = 500
+
+
+class PositionStore:
+    """
+    Local position/wallet/order cache fed by Bybit's private websocket topics `position`, `wallet`
+    and `order`.
+    The websocket thread is the only writer; readers take plain dict gets. Seed it once over REST
+    at startup, after which pushes keep it current without polling. After a drop the socket
+    re-dials on its own and the store re-seeds from REST to cover whatever was missed.
+    """
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
+        self.ws_url = (
+            "wss://stream-testnet.bybit.com/v5/private" if testnet else "wss://stream.bybit.com/v5/private"
+        )
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.ws = None
+        self.is_connected = False
+        self.is_authenticated = False
+
+        # symbol -> {'size': float, 'side': str, 'markPrice': float}
+        self.futures = {}
+        # coin -> walletBalance
+        self.spot = {}
+        # orderId -> {'status': str, 'cumExecQty': float}; waiters block on _order_cond.
+        # Finished orders are evicted oldest-first once more than MAX_TERMINAL_ORDERS pile up.
+        self.orders = OrderedDict()
+        self._terminal_order_ids = deque()
+        self._order_cond = threading.Condition()
+
+        # (client, symbol, coin) from seed(), replayed on reconnect
+        self._seed_args = None
+        self._has_connected = False
+
+        # Connection health (monotonic; pongs count as traffic so a quiet account stays fresh)
+        self.last_update_time = None
+
+    @property
+    def last_update_age(self) -> float:
+        """Seconds since the last message from the private stream (inf if none yet)."""
+        if self.last_update_time is None:
+            return float("inf")
+        return time.monotonic() - self.last_update_time
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        return self.is_connected and self.is_authenticated and self.last_update_age <= max_age_seconds
+
+    def seed(self, client, symbol: str, coin: str):
+        """Populate the store from REST once so readers have data before the first push."""
+        self._seed_args = (client, symbol, coin)
+        resp = client.get_positions(category='linear', symbol=symbol)
+        if resp and resp.get('retCode') == 0:
+            for pos in resp.get('result', {}).get('list', []) or []:
+                self._store_position(pos)
+        resp = client.get_coin_balance(coin)
+        if resp and resp.get('retCode') == 0:
+            self._store_wallet(resp.get('result', {}).get('list', []) or [])
+
+    def _store_position(self, pos: dict):
+        try:
+            self.futures[pos['symbol']] = {
+                'size': float(pos.get('size') or 0),
+                'side': pos.get('side', 'None'),
+                'markPrice': float(pos.get('markPrice') or 0),
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"⚠️ PositionStore: Error parsing position update: {e}")
+
+    def _store_wallet(self, accounts: list):
+        for account in accounts:
+            for coin_info in account.get('coin', []) or []:
+                try:
+                    self.spot[coin_info['coin']] = float(coin_info.get('walletBalance') or 0)
+                except (KeyError, TypeError, ValueError) as e:
+                    print(f"⚠️ PositionStore: Error parsing wallet update: {e}")
+
+    def _store_order(self, order: dict):
+        try:
+            order_id = order['orderId']
+            status = order.get('orderStatus', '')
+            cum_exec_qty = float(order.get('cumExecQty') or 0)
+            with self._order_cond:
+                previous = self.orders.get(order_id)
+                self.orders[order_id] = {'status': status, 'cumExecQty': cum_exec_qty}
+                if status in TERMINAL_ORDER_STATUSES and (
+                        previous is None or previous['status'] not in TERMINAL_ORDER_STATUSES):
+                    self._terminal_order_ids.append(order_id)
+                    while len(self._terminal_order_ids) > MAX_TERMINAL_ORDERS:
+                        self.orders.pop(self._terminal_order_ids.popleft(), None)
+                self._order_cond.notify_all()
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"⚠️ PositionStore: Error parsing order update: {e}")
+
+    def wait_for_order(self, order_id: str, timeout: float):
+        """
+        Block until the order reaches a terminal status or the timeout expires.
+        Returns the order's state dict if it finished, else None.
+        """
+        def finished():
+            order = self.orders.get(order_id)
+            return order is not None and order['status'] in TERMINAL_ORDER_STATUSES
+
+        with self._order_cond:
+            if self._order_cond.wait_for(finished, timeout=max(0.0, timeout)):
+                return self.orders[order_id]
+        return None
+
+    def _auth_message(self) -> dict:
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(
+            self.api_secret.encode("utf-8"),
+            f"GET/realtime{expires}".encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+        return {"op": "auth", "args": [self.api_key, expires, signature]}
+
+    def _on_message(self, ws, message):
+        try:
+            self.last_update_time = time.monotonic()
+            data = json.loads(message)
+
+            op = data.get("op")
+            if op == "auth":
+                self.is_authenticated = bool(data.get("success"))
+                if self.is_authenticated:
+                    ws.send(json.dumps({"op": "subscribe", "args": ["position", "wallet", "order"]}))
+                    print("✅ PositionStore: Authenticated, subscribed to position, wallet and order")
+                else:
+                    print(f"❌ PositionStore: Authentication failed: {data.get('ret_msg')}")
+                return
+            if op == "subscribe":
+                if not data.get("success"):
+                    print(f"❌ PositionStore: Failed to subscribe: {data}")
+                return
+
+            topic = data.get("topic")
+            if topic == "position":
+                for pos in data.get("data", []) or []:
+                    self._store_position(pos)
+            elif topic == "wallet":
+                self._store_wallet(data.get("data", []) or [])
+            elif topic == "order":
+                for order in data.get("data", []) or []:
+                    self._store_order(order)
+
+        except json.JSONDecodeError as e:
+            print(f"❌ PositionStore: Error decoding message: {e}")
+        except Exception as e:
+            print(f"❌ PositionStore: Unexpected error in _on_message: {e}")
+
+    def _on_pong(self, ws, message):
+        self.last_update_time = time.monotonic()
+
+    def _on_error(self, ws, error):
+        print(f"❌ PositionStore Error: {error}")
+        self.is_connected = False
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        print(f"⚠️ PositionStore Closed - Code: {close_status_code}, Message: {close_msg}; reconnecting in 5s")
+        self.is_connected = False
+        self.is_authenticated = False
+
+    def _reseed(self):
+        client, symbol, coin = self._seed_args
+        try:
+            self.seed(client, symbol, coin)
+            print("🔄 PositionStore: Re-seeded positions and wallet after reconnect")
+        except Exception as e:
+            print(f"⚠️ PositionStore: Re-seed after reconnect failed: {e}")
+
+    def _on_open(self, ws):
+        print(f"✅ PositionStore: Connection opened to {self.ws_url}")
+        self.is_connected = True
+        self.last_update_time = time.monotonic()
+        # Pushes sent while we were down are lost; refresh from REST off the socket thread
+        if self._has_connected and self._seed_args is not None:
+            threading.Thread(target=self._reseed, daemon=True).start()
+        self._has_connected = True
+        try:
+            ws.send(json.dumps(self._auth_message()))
+        except Exception as e:
+            print(f"❌ PositionStore: Failed to send auth: {e}")
+            self.is_connected = False
+
+    def connect(self):
+        """Start the private stream in a background thread."""
+        print(f"🔌 PositionStore: Connecting to {self.ws_url}...")
+        try:
+            self.ws = websocket.WebSocketApp(self.ws_url,
+                                             on_open=self._on_open,
+                                             on_message=self._on_message,
+                                             on_error=self._on_error,
+                                             on_close=self._on_close,
+                                             on_pong=self._on_pong)
+            # reconnect= re-dials after a drop; _on_open re-authenticates and re-seeds
+            wst = threading.Thread(target=lambda: self.ws.run_forever(ping_interval=20, ping_timeout=10, reconnect=5))
+            wst.daemon = True
+            wst.start()
+        except Exception as e:
+            print(f"❌ PositionStore: Failed to initialize connection: {e}")
+            self.is_connected = False
+
+    def disconnect(self):
+        try:
+            if self.ws:
+                self.ws.close()
+        except Exception as e:
+            print(f"⚠️ PositionStore: Error during disconnect: {e}")
+        finally:
+            self.is_connected = False
+            self.is_authenticated = False
+
+
+class BybitWsTrader:
+    """
+    Order entry over Bybit's v5 trade websocket (`order.create` / `order.amend` / `order.cancel`).
+    One authenticated connection is kept open, so each order skips the HTTP request/TLS cost.
+    Callers block on a per-request event until the matching `reqId` ack arrives; responses are
+    reshaped to the REST form (`retCode`, `retMsg`, `result`) so BybitClient can return either.
+    """
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False,
+                 recv_window_ms: int = 5000, ack_timeout: float = 5.0):
+        self.ws_url = (
+            "wss://stream-testnet.bybit.com/v5/trade" if testnet else "wss://stream.bybit.com/v5/trade"
+        )
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.recv_window_ms = str(recv_window_ms)
+        self.ack_timeout = ack_timeout
+        self.ws = None
+        self.is_connected = False
+        self.is_authenticated = False
+
+        # reqId -> [threading.Event, response]; the websocket thread fills in the response
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._next_req_id = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.is_connected and self.is_authenticated
+
+    def request(self, op: str, params: dict, timeout: float = None):
+        """
+        Send one trade op and wait for its ack. Returns the REST-shaped response, or None if the
+        ack didn't arrive in time (the order may still have been accepted - don't resend blindly).
+        """
+        with self._pending_lock:
+            self._next_req_id += 1
+            req_id = f"t{self._next_req_id}"
+            slot = [threading.Event(), None]
+            self._pending[req_id] = slot
+        message = {
+            "reqId": req_id,
+            "header": {
+                "X-BAPI-TIMESTAMP": str(int(time.time() * 1000)),
+                "X-BAPI-RECV-WINDOW": self.recv_window_ms,
+            },
+            "op": op,
+            "args": [params],
+        }
+        try:
+            self.ws.send(json.dumps(message))
+            if not slot[0].wait(self.ack_timeout if timeout is None else timeout):
+                print(f"⚠️ WsTrader: No ack for {op} ({req_id}) within timeout")
+                return None
+            return slot[1]
+        except Exception as e:
+            print(f"❌ WsTrader: Failed to send {op}: {e}")
+            return None
+        finally:
+            with self._pending_lock:
+                self._pending.pop(req_id, None)
+
+    def _auth_message(self) -> dict:
+        expires = int((time.time() + 10) * 1000)
+        signature = hmac.new(
+            self.api_secret.encode("utf-8"),
+            f"GET/realtime{expires}".encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+        return {"op": "auth", "args": [self.api_key, expires, signature]}
+
+    def _on_message(self, ws, message):
+        try:
+            data = json.loads(message)
+
+            op = data.get("op")
+            if op == "auth":
+                self.is_authenticated = data.get("retCode") == 0
+                if self.is_authenticated:
+                    print("✅ WsTrader: Authenticated")
+                else:
+                    print(f"❌ WsTrader: Authentication failed: {data.get('retMsg')}")
+                return
+            if op in ("pong", "ping"):
+                return
+
+            with self._pending_lock:
+                slot = self._pending.get(data.get("reqId"))
+            if slot is not None:
+                slot[1] = {
+                    "retCode": data.get("retCode"),
+                    "retMsg": data.get("retMsg", ""),
+                    "result": data.get("data") or {},
+                    "retExtInfo": data.get("retExtInfo") or {},
+                }
+                slot[0].set()
+
+        except json.JSONDecodeError as e:
+            print(f"❌ WsTrader: Error decoding message: {e}")
+        except Exception as e:
+            print(f"❌ WsTrader: Unexpected error in _on_message: {e}")
+
+    def _on_error(self, ws, error):
+        print(f"❌ WsTrader Error: {error}")
+        self.is_connected = False
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        print(f"⚠️ WsTrader Closed - Code: {close_status_code}, Message: {close_msg}")
+        self.is_connected = False
+        self.is_authenticated = False
+        # Release anyone still waiting; their requests get no ack
+        with self._pending_lock:
+            for slot in self._pending.values():
+                slot[0].set()
+
+    def _on_open(self, ws):
+        print(f"✅ WsTrader: Connection opened to {self.ws_url}")
+        self.is_connected = True
+        try:
+            ws.send(json.dumps(self._auth_message()))
+        except Exception as e:
+            print(f"❌ WsTrader: Failed to send auth: {e}")
+            self.is_connected = False
+
+    def connect(self):
+        """Start the trade stream in a background thread."""
+        print(f"🔌 WsTrader: Connecting to {self.ws_url}...")
+        try:
+            self.ws = websocket.WebSocketApp(self.ws_url,
+                                             on_open=self._on_open,
+                                             on_message=self._on_message,
+                                             on_error=self._on_error,
+                                             on_close=self._on_close)
+            # reconnect= re-dials after a drop; _on_open re-authenticates (REST covers the gap)
+            wst = threading.Thread(target=lambda: self.ws.run_forever(ping_interval=20, ping_timeout=10, reconnect=5))
+            wst.daemon = True
+            wst.start()
+        except Exception as e:
+            print(f"❌ WsTrader: Failed to initialize connection: {e}")
+            self.is_connected = False
+
+    def disconnect(self):
+        try:
+            if self.ws:
+                self.ws.close()
+        except Exception as e:
+            print(f"⚠️ WsTrader: Error during disconnect: {e}")
+        finally:
+            self.is_connected = False
+            self.is_authenticated = False
@@ -20,11 +20,18 @@ class TrendDetector:
     ):
         self.ema_fast_period = ema_fast_period
         self.ema_slow_period = ema_slow_period
+        # EMA smoothing factors, fixed for the detector's lifetime
+        self._alpha_fast = 2 / (ema_fast_period + 1)
+        self._alpha_slow = 2 / (ema_slow_period + 1)
+        self._keep_fast = 1 - self._alpha_fast
+        self._keep_slow = 1 - self._alpha_slow
 
         # Smoothing configuration
         self.smoothing_type = (smoothing_type or 'none').lower()
         self.smoothing_window_fast = smoothing_window_fast or ema_fast_period
         self.smoothing_window_slow = smoothing_window_slow or ema_slow_period
+        self._smooth_alpha_fast = 2 / (self.smoothing_window_fast + 1)
+        self._smooth_alpha_slow = 2 / (self.smoothing_window_slow + 1)
         
         # Trend threshold configuration
         self.trend_threshold_pct = trend_threshold_pct
@@ -82,7 +89,7 @@ class TrendDetector:
 
         if self.smoothing_type == 'ema':
             if is_fast:
-                alpha2 = 2 / (self.smoothing_window_fast + 1)
+                alpha2 = self._smooth_alpha_fast
                 if self._ema_smooth_fast is None:
                     self._ema_smooth_fast = self.ema_fast_raw
                 else:
@@ -91,7 +98,7 @@ class TrendDetector:
                     )
                 self.ema_fast = self._ema_smooth_fast
             else:
-                alpha2 = 2 / (self.smoothing_window_slow + 1)
+                alpha2 = self._smooth_alpha_slow
                 if self._ema_smooth_slow is None:
                     self._ema_smooth_slow = self.ema_slow_raw
                 else:
@@ -109,7 +116,7 @@ class TrendDetector:
 
         # Seed fast EMA with SMA(fast)
         self.ema_fast_raw, idx_fast = self._seed_ema(historical_closes, self.ema_fast_period)
-        alpha_fast = 2 / (self.ema_fast_period + 1)
+        alpha_fast, keep_fast = self._alpha_fast, self._keep_fast
         # Walk forward computing raw EMA and building smoothing state
         # Include the seed point into smoothing windows as platforms usually start plotting from there
         self._fast_raw_window.clear()
@@ -119,7 +126,7 @@ class TrendDetector:
         self._apply_smoothing_after_append(is_fast=True)
         for i in range(idx_fast, len(historical_closes)):
             price = historical_closes[i]
-            self.ema_fast_raw = price * alpha_fast + self.ema_fast_raw * (1 - alpha_fast)
+            self.ema_fast_raw = price * alpha_fast + self.ema_fast_raw * keep_fast
             # update SMA smoothing window
             if len(self._fast_raw_window) == self._fast_raw_window.maxlen:
                 self._fast_raw_sum -= self._fast_raw_window[0]
@@ -129,7 +136,7 @@ class TrendDetector:
 
         # Seed slow EMA with SMA(slow)
         self.ema_slow_raw, idx_slow = self._seed_ema(historical_closes, self.ema_slow_period)
-        alpha_slow = 2 / (self.ema_slow_period + 1)
+        alpha_slow, keep_slow = self._alpha_slow, self._keep_slow
         self._slow_raw_window.clear()
         self._slow_raw_sum = 0.0
         self._slow_raw_window.append(self.ema_slow_raw)
@@ -137,7 +144,7 @@ class TrendDetector:
         self._apply_smoothing_after_append(is_fast=False)
         for i in range(idx_slow, len(historical_closes)):
             price = historical_closes[i]
-            self.ema_slow_raw = price * alpha_slow + self.ema_slow_raw * (1 - alpha_slow)
+            self.ema_slow_raw = price * alpha_slow + self.ema_slow_raw * keep_slow
             if len(self._slow_raw_window) == self._slow_raw_window.maxlen:
                 self._slow_raw_sum -= self._slow_raw_window[0]
             self._slow_raw_window.append(self.ema_slow_raw)
@@ -155,12 +162,9 @@ class TrendDetector:
         if self.ema_fast_raw is None or self.ema_slow_raw is None:
             return
 
-        alpha_fast = 2 / (self.ema_fast_period + 1)
-        alpha_slow = 2 / (self.ema_slow_period + 1)
-
-        # Update raw EMAs
-        self.ema_fast_raw = (close_price * alpha_fast) + (self.ema_fast_raw * (1 - alpha_fast))
-        self.ema_slow_raw = (close_price * alpha_slow) + (self.ema_slow_raw * (1 - alpha_slow))
+        # Update raw EMAs (O(1): only the previous value is needed)
+        self.ema_fast_raw = close_price * self._alpha_fast + self.ema_fast_raw * self._keep_fast
+        self.ema_slow_raw = close_price * self._alpha_slow + self.ema_slow_raw * self._keep_slow
 
         # Update SMA smoothing windows and smoothed values
         if self.smoothing_type == 'sma':
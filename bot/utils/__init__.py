@@ -2,5 +2,12 @@ from .formatting import (
     get_qty_precision,
     get_price_precision,
     format_quantity,
-    format_price
+    format_price,
+    get_base_symbol,
+    safe_float
+)
+from .instrument_cache import (
+    get_instrument_info_cached,
+    load_instrument_info,
+    save_instrument_info
 )
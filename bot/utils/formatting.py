@@ -1,5 +1,6 @@
 # bot/utils.py
 import math
+from functools import cache, lru_cache
 
 def get_qty_precision(qty_step: str) -> int:
     """Calculates the number of decimal places for quantity based on qtyStep."""
@@ -7,12 +8,15 @@ def get_qty_precision(qty_step: str) -> int:
         return len(qty_step.split('.')[1])
     return 0
 
+@lru_cache(maxsize=4096)
+def _fmt_qty_steps(steps: int, precision: int) -> str:
+    return f"{steps / 10 ** precision:.{precision}f}"
+
 def format_quantity(quantity: float, precision: int) -> str:
     """Formats the quantity to the required precision without rounding up."""
-    factor = 10 ** precision
-    # We use floor to always round down, preventing "insufficient balance" errors
-    formatted_qty = math.floor(quantity * factor) / factor
-    return f"{formatted_qty:.{precision}f}"
+    # We use floor to always round down, preventing "insufficient balance" errors.
+    # Keyed on the whole number of steps so repeated sizes hit the cache.
+    return _fmt_qty_steps(math.floor(quantity * 10 ** precision), precision)
 
 def get_price_precision(price_step: str) -> int:
     """Calculates the number of decimal places for price based on tickSize."""
@@ -20,6 +24,25 @@ def get_price_precision(price_step: str) -> int:
         return len(price_step.split('.')[1])
     return 0
 
+@lru_cache(maxsize=4096)
+def _fmt_price(price: float, precision: int) -> str:
+    return f"{price:.{precision}f}"
+
 def format_price(price: float, precision: int) -> str:
     """Formats the price to the required precision."""
-    return f"{price:.{precision}f}"
\ No newline at end of file
+    # Pre-round so nearby prices share a cache entry; the formatted string is unchanged
+    return _fmt_price(round(price, precision), precision)
+
+@cache
+def get_base_symbol(symbol: str) -> str:
+    """Strips the USDT quote suffix from a symbol (e.g. ETHUSDT -> ETH)."""
+    return symbol.replace("USDT", "") if symbol.endswith("USDT") else symbol
+
+def safe_float(value, default: float = 0.0) -> float:
+    """Parses a Bybit numeric string, returning default for empty or malformed values."""
+    if not value:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,64 @@
+# bot/utils/instrument_cache.py
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached payload changes shape so files written by older code are ignored
+SCHEMA_VERSION = 1
+DEFAULT_CACHE_DIR = '.instrument_cache'
+DEFAULT_TTL_SECONDS = 86400.0
+
+def _cache_path(category: str, symbol: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"instrument_{category}_{symbol}.json")
+
+def load_instrument_info(category: str, symbol: str, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                         cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[dict]:
+    """Returns the cached instrument entry if present, fresh and of the current schema."""
+    path = _cache_path(category, symbol, cache_dir)
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl_seconds:
+            return None
+        with open(path) as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get('schema_version') != SCHEMA_VERSION:
+        return None
+    info = payload.get('info')
+    return info if isinstance(info, dict) else None
+
+def save_instrument_info(category: str, symbol: str, info: dict, cache_dir: str = DEFAULT_CACHE_DIR):
+    """Atomically writes an instrument entry to the cache; failures are logged and ignored."""
+    path = _cache_path(category, symbol, cache_dir)
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'schema_version': SCHEMA_VERSION, 'info': info}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not cache instrument info to %s: %s", path, e)
+
+def get_instrument_info_cached(client, category: str, symbol: str,
+                               ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                               cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[dict]:
+    """
+    Instrument entry (lotSizeFilter, priceFilter, ...) for a symbol, read from the file cache
+    when fresh, otherwise fetched with get_instruments_info and written back.
+    Returns None if the exchange has no entry; client exceptions propagate.
+    """
+    info = load_instrument_info(category, symbol, ttl_seconds, cache_dir)
+    if info is not None:
+        return info
+    response = client.get_instruments_info(category=category, symbol=symbol)
+    if response and response.get('retCode') == 0:
+        instruments = response['result']['list']
+        if instruments:
+            info = instruments[0]
+            save_instrument_info(category, symbol, info, cache_dir)
+            return info
+    return None
@@ -0,0 +1,66 @@
+# bot/utils/logging.py
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_LOG_FILE_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_FILE_BACKUPS = 5
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records when the queue is full instead of blocking the caller.
+    Records are queued raw: the stdlib prepare() would format the message (and any traceback)
+    on the calling thread, which is the cost this handler exists to move off the tick path.
+    The listener lives in this process, so it can format the record itself.
+    """
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+def setup_logging(level=logging.INFO, queue_size: int = DEFAULT_QUEUE_SIZE,
+                  log_file: Optional[str] = None, max_bytes: int = DEFAULT_LOG_FILE_BYTES,
+                  backup_count: int = DEFAULT_LOG_FILE_BACKUPS) -> QueueListener:
+    """
+    Routes the root logger through a bounded queue drained by a background thread,
+    so callers on the tick path only pay for an enqueue. Records below `level`
+    are rejected before their %-args are formatted, and accepted ones are formatted
+    on the listener thread. Console output goes to stdout, the same stream as the
+    bot's print() status lines, so the two don't split across stdout/stderr. With
+    `log_file`, the listener also writes to a size-rotated file. Safe to call more
+    than once.
+    """
+    global _listener
+    if _listener is not None:
+        logging.getLogger().setLevel(level)
+        return _listener
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                            encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.Queue(maxsize=queue_size)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_DroppingQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(_listener.stop)
+    return _listener
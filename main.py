@@ -21,7 +21,14 @@ from datetime import datetime
 from dotenv import load_dotenv
 import os
 
-from bot.exchange.client import BybitClient, BybitWebSocketManager
+from bot.exchange.client import BybitClient, BybitWebSocketManager, BybitWsTrader, CachedBybitClient
+from bot.utils import safe_float
+from bot.utils.logging import setup_logging
+from bot.utils.instrument_cache import get_instrument_info_cached
+from bot.core.rebalance_policy import (
+    EmaCheck, EmaReason, TREND_SIGN, ema_trigger,
+    EMA_DISABLED, EMA_NOT_INITIALIZED, EMA_POSITION_TOO_SMALL, EMA_COOLDOWN, EMA_NO_TRIGGER,
+)
 
 
 class SpotRebalancer:
@@ -40,32 +47,67 @@ class SpotRebalancer:
         self.max_wait_seconds = int(r.get("max_wait_seconds", 30))
         self.use_limit_orders = bool(r.get("use_limit_orders", True))
         self.cooldown_seconds = int(r.get("cooldown_seconds", 10))
+        # Limit-order price edge vs last price, as per-side multipliers resolved once
+        limit_edge_frac = float(r.get("limit_edge_bps", 10.0)) / 1e4
+        self._limit_price_mult = {"Buy": 1 - limit_edge_frac, "Sell": 1 + limit_edge_frac}
         
         # Trend awareness
         self.use_trend = bool(r.get("use_trend", True))
         self.ema_fast_period = int(r.get("ema_fast_period", 9))
         self.ema_slow_period = int(r.get("ema_slow_period", 21))
+        # EMA smoothing factors and their complements, fixed by the periods
+        self._alpha_fast = 2 / (self.ema_fast_period + 1)
+        self._alpha_slow = 2 / (self.ema_slow_period + 1)
+        self._keep_fast = 1 - self._alpha_fast
+        self._keep_slow = 1 - self._alpha_slow
         self.trend_threshold_pct = float(r.get("trend_threshold_pct", 0.1))
         self.trend_multiplier = float(r.get("trend_multiplier", 1.5))  # How much more tolerant in favorable trend
+        self._trend_upper = 1 + self.trend_threshold_pct / 100  # fast/slow ratio bounds for update_trend
+        self._trend_lower = 1 - self.trend_threshold_pct / 100
         
         # EMA-based opportunistic rebalancing config
         self.ema_rebalance_config = r.get("ema_rebalance", {})
-        self.last_ema_rebalance_time = 0
+        # Resolved once; step() reads these on every tick
+        ema_rb = self.ema_rebalance_config
+        self._ema_rb_enabled = bool(ema_rb.get('enabled', False))
+        self._ema_rb_min_position_usdt = float(ema_rb.get('min_position_usdt', 100.0))
+        self._ema_rb_cooldown = float(ema_rb.get('cooldown_seconds', 60.0))
+        self._ema_rb_breakout_pct = float(ema_rb.get('uptrend_breakout_pct', 1.0))
+        self._ema_rb_touch_pct = float(ema_rb.get('downtrend_ema_touch_pct', 0.2))
+        self._ema_rb_partial_ratio = float(ema_rb.get('ema_partial_ratio', 0.3))
+        self.last_ema_rebalance_time = float('-inf')
         
         # EMA state
         self.ema_fast = None
         self.ema_slow = None
         self.trend = "NEUTRAL"
         
-        # State tracking
-        self.last_rebalance_time = 0
+        # State tracking (time.monotonic() readings; cooldowns are pure durations)
+        self.last_rebalance_time = float('-inf')
         self.rebalance_wait_start: Optional[float] = None
-        self.last_status_time = 0
+        self.last_status_time = float('-inf')
         self.status_interval = 30  # Show status every 30 seconds
         
         # Order tracking to prevent duplicates
         self.active_orders = set()  # Track active order IDs
-        self.last_order_cleanup = 0
+        self.last_order_cleanup = float('-inf')
+        
+        # Spot base balance only changes on our fills: cache it between steps and
+        # re-query after our own orders, while orders rest, or on a slow timer
+        self.balance_refresh_seconds = float(r.get("balance_refresh_seconds", 5.0))
+        self._cached_spot_base = 0.0
+        self._spot_balance_refresh_t = float('-inf')
+        self._balance_dirty = True
+        
+        # Instrument steps are cached on disk across restarts for this long
+        self.instrument_cache_ttl_seconds = float(r.get("instrument_cache_ttl_seconds", 86400))
+        
+        # Quiet-market fast path: step() skips re-evaluation while the price and
+        # closed candle are unchanged, for at most min_eval_interval_seconds
+        self.min_eval_interval_seconds = float(r.get("min_eval_interval_seconds", 2.0))
+        self._prev_price: Optional[float] = None
+        self._prev_kline_ts = None
+        self._last_eval_t = float('-inf')
         
         # Initialize EMAs if trend is enabled
         if self.use_trend:
@@ -108,12 +150,12 @@ class SpotRebalancer:
                     self.ema_slow = sum(closes[-self.ema_slow_period:]) / self.ema_slow_period
                     
                     # Apply EMA formula for smoothing
-                    alpha_fast = 2 / (self.ema_fast_period + 1)
-                    alpha_slow = 2 / (self.ema_slow_period + 1)
+                    alpha_fast, keep_fast = self._alpha_fast, self._keep_fast
+                    alpha_slow, keep_slow = self._alpha_slow, self._keep_slow
                     
                     for close in closes[-50:]:
-                        self.ema_fast = close * alpha_fast + self.ema_fast * (1 - alpha_fast)
-                        self.ema_slow = close * alpha_slow + self.ema_slow * (1 - alpha_slow)
+                        self.ema_fast = close * alpha_fast + self.ema_fast * keep_fast
+                        self.ema_slow = close * alpha_slow + self.ema_slow * keep_slow
                     
                     self.update_trend()
                     print(f"✅ EMAs initialized: Fast=${self.ema_fast:.4f}, Slow=${self.ema_slow:.4f}, Trend={self.trend}")
@@ -126,11 +168,8 @@ class SpotRebalancer:
         if not self.use_trend or self.ema_fast is None or self.ema_slow is None:
             return
         
-        alpha_fast = 2 / (self.ema_fast_period + 1)
-        alpha_slow = 2 / (self.ema_slow_period + 1)
-        
-        self.ema_fast = price * alpha_fast + self.ema_fast * (1 - alpha_fast)
-        self.ema_slow = price * alpha_slow + self.ema_slow * (1 - alpha_slow)
+        self.ema_fast = price * self._alpha_fast + self.ema_fast * self._keep_fast
+        self.ema_slow = price * self._alpha_slow + self.ema_slow * self._keep_slow
         
         self.update_trend()
 
@@ -141,11 +180,10 @@ class SpotRebalancer:
             return
         
         ratio = self.ema_fast / self.ema_slow
-        threshold = self.trend_threshold_pct / 100
         
-        if ratio > (1 + threshold):
+        if ratio > self._trend_upper:
             self.trend = "UPTREND"
-        elif ratio < (1 - threshold):
+        elif ratio < self._trend_lower:
             self.trend = "DOWNTREND"
         else:
             self.trend = "NEUTRAL"
@@ -156,23 +194,15 @@ class SpotRebalancer:
         - If divergence aligns with trend, use higher threshold (more tolerant)
         - If divergence opposes trend, use standard threshold (less tolerant)
         """
-        if not self.use_trend or self.trend == "NEUTRAL":
-            return self.rebalance_threshold_usdt
-        
-        # Positive divergence = too much long exposure
-        # Negative divergence = too much short exposure
-        
-        if divergence > 0 and self.trend == "UPTREND":
-            # Long exposure in uptrend - be more tolerant
+        # Positive divergence = too much long exposure, negative = too much short exposure.
+        # The product is positive only when the divergence runs with the trend
+        # (long in uptrend / short in downtrend); NEUTRAL has sign 0.
+        if self.use_trend and divergence * TREND_SIGN.get(self.trend, 0) > 0:
             return self.rebalance_threshold_usdt * self.trend_multiplier
-        elif divergence < 0 and self.trend == "DOWNTREND":
-            # Short exposure in downtrend - be more tolerant
-            return self.rebalance_threshold_usdt * self.trend_multiplier
-        else:
-            # Divergence opposes trend - use standard threshold
-            return self.rebalance_threshold_usdt
+        # Divergence opposes trend (or no trend) - use standard threshold
+        return self.rebalance_threshold_usdt
 
-    def check_ema_rebalance_opportunity(self, current_price: float, position_usdt: float, current_time: float) -> dict:
+    def check_ema_rebalance_opportunity(self, current_price: float, position_usdt: float, current_time: float) -> EmaCheck:
         """
         Check if EMA-based opportunistic rebalancing should trigger.
         
@@ -180,54 +210,31 @@ class SpotRebalancer:
         - If long in uptrend: rebalance when price breaks X% above fast EMA (take profits defensively)
         - If long in downtrend: rebalance when price comes back to fast EMA (defensive exit opportunity)
         """
-        config = self.ema_rebalance_config
-        
         # Check if feature is enabled
-        if not config.get('enabled', False):
-            return {"should_rebalance": False, "reason": "", "suggested_ratio": 0.0}
+        if not self._ema_rb_enabled:
+            return EMA_DISABLED
         
         # Check if EMAs are initialized
         if self.ema_fast is None or not self.use_trend:
-            return {"should_rebalance": False, "reason": "EMAs not initialized", "suggested_ratio": 0.0}
+            return EMA_NOT_INITIALIZED
         
         # Only trigger if we have a meaningful position
-        min_position_usdt = float(config.get('min_position_usdt', 100.0))
-        if abs(position_usdt) < min_position_usdt:
-            return {"should_rebalance": False, "reason": "Position too small", "suggested_ratio": 0.0}
+        if abs(position_usdt) < self._ema_rb_min_position_usdt:
+            return EMA_POSITION_TOO_SMALL
         
         # Cooldown check (prevent too frequent EMA-based rebalances)
-        min_cooldown = float(config.get('cooldown_seconds', 60.0))
-        if current_time - self.last_ema_rebalance_time < min_cooldown:
-            return {"should_rebalance": False, "reason": "Cooldown active", "suggested_ratio": 0.0}
+        if current_time - self.last_ema_rebalance_time < self._ema_rb_cooldown:
+            return EMA_COOLDOWN
         
-        is_long = position_usdt > 0
         price_vs_ema_pct = ((current_price - self.ema_fast) / self.ema_fast) * 100.0 if self.ema_fast > 0 else 0.0
         
-        uptrend_breakout_pct = float(config.get('uptrend_breakout_pct', 1.0))
-        downtrend_ema_touch_pct = float(config.get('downtrend_ema_touch_pct', 0.2))
-        ema_partial_ratio = float(config.get('ema_partial_ratio', 0.3))
-        
-        # Case 1: Long position in uptrend - rebalance when price breaks X% above fast EMA
-        if is_long and self.trend == "UPTREND":
-            if price_vs_ema_pct >= uptrend_breakout_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Long in uptrend: price {price_vs_ema_pct:.2f}% above EMA{self.ema_fast_period} (defensive profit-taking)",
-                    "suggested_ratio": ema_partial_ratio
-                }
-        
-        # Case 2: Long position in downtrend - rebalance when price comes back to fast EMA
-        elif is_long and self.trend == "DOWNTREND":
-            # In downtrend, we want to exit when price rallies back near the EMA
-            # Check if price is within X% of the EMA (either side)
-            if abs(price_vs_ema_pct) <= downtrend_ema_touch_pct:
-                return {
-                    "should_rebalance": True,
-                    "reason": f"Long in downtrend: price near EMA{self.ema_fast_period} ({price_vs_ema_pct:.2f}% - defensive exit)",
-                    "suggested_ratio": ema_partial_ratio
-                }
-        
-        return {"should_rebalance": False, "reason": "No EMA trigger", "suggested_ratio": 0.0}
+        # Spot can only be long: profit-take on an uptrend breakout, or exit on a downtrend EMA retest
+        code = ema_trigger(
+            position_usdt, self.trend, price_vs_ema_pct, self._ema_rb_breakout_pct, self._ema_rb_touch_pct
+        )
+        if code is not EmaReason.LONG_BREAKOUT and code is not EmaReason.LONG_EMA_TOUCH:
+            return EMA_NO_TRIGGER
+        return EmaCheck(True, code, self._ema_rb_partial_ratio, price_vs_ema_pct, self.ema_fast_period)
 
     def execute_ema_rebalance(self, side: str, qty_usdt: float, price: float, reason: str):
         """Execute an EMA-triggered rebalance"""
@@ -266,8 +273,8 @@ class SpotRebalancer:
             
             if response and response.get('retCode') == 0:
                 print(f"✅ EMA rebalance order executed successfully")
-                self.last_ema_rebalance_time = time.time()
-                self.last_rebalance_time = time.time()  # Update general rebalance time too
+                self._balance_dirty = True
+                self.last_ema_rebalance_time = self.last_rebalance_time = time.monotonic()  # Update general rebalance time too
             else:
                 print(f"❌ EMA rebalance order failed: {response.get('retMsg', 'Unknown error')}")
                 
@@ -276,19 +283,24 @@ class SpotRebalancer:
 
     def get_spot_position_usdt(self, price: float) -> float:
         """Get spot position value in USDT"""
-        try:
-            resp = self.client.get_coin_balance(self.base_symbol)
-            total_base = 0.0
-            if resp and resp.get('retCode') == 0:
-                for acct in resp.get('result', {}).get('list', []) or []:
-                    for coin in acct.get('coin', []) or []:
-                        if coin.get('coin') == self.base_symbol:
-                            v = float(coin.get('walletBalance') or 0)
-                            total_base += v
-            return total_base * price
-        except Exception as e:
-            print(f"⚠️ Error getting spot position: {e}")
-            return 0.0
+        now = time.monotonic()
+        if (not self._balance_dirty and not self.active_orders
+                and now - self._spot_balance_refresh_t < self.balance_refresh_seconds):
+            return self._cached_spot_base * price
+        # The client already turns request failures into None; check the shape explicitly
+        resp = self.client.get_coin_balance(self.base_symbol)
+        if not resp or resp.get('retCode') != 0:
+            print(f"⚠️ Error getting spot position: {resp.get('retMsg') if resp else 'no response'}")
+            return self._cached_spot_base * price  # last known balance
+        total_base = 0.0
+        for acct in resp.get('result', {}).get('list', []) or []:
+            for coin in acct.get('coin', []) or []:
+                if coin.get('coin') == self.base_symbol:
+                    total_base += safe_float(coin.get('walletBalance'))
+        self._cached_spot_base = total_base
+        self._spot_balance_refresh_t = now
+        self._balance_dirty = False
+        return total_base * price
 
     def get_available_balance(self) -> float:
         """Get available balance for the base symbol"""
@@ -366,19 +378,28 @@ class SpotRebalancer:
 
     def step(self):
         """Main rebalancer loop"""
-        now = time.time()
+        now = time.monotonic()
         
         # Get current price
         price = self.ws.get_latest_price()
         if price is None:
             return
         
+        closed = self.ws.get_latest_closed_kline() if self.use_trend else None
+        new_candle = closed is not None and closed['ts'] != self._prev_kline_ts
+        
+        # Nothing actionable changed since the last evaluation: no new price or candle,
+        # no limit-order wait running and no own order awaiting a balance re-read
+        if (price == self._prev_price and not new_candle and self.rebalance_wait_start is None
+                and not self._balance_dirty and now - self._last_eval_t < self.min_eval_interval_seconds):
+            return
+        self._prev_price = price
+        self._last_eval_t = now
+        
         # Update EMAs on new candle close
-        if self.use_trend:
-            closed = self.ws.get_latest_closed_kline()
-            if closed:
-                close_price = float(closed['close'])
-                self.update_emas(close_price)
+        if new_candle:
+            self._prev_kline_ts = closed['ts']
+            self.update_emas(float(closed['close']))
         
         # Get positions
         spot_usdt = self.get_spot_position_usdt(price)
@@ -398,22 +419,22 @@ class SpotRebalancer:
         
         # Check EMA-based opportunistic rebalancing BEFORE normal threshold check
         # This allows defensive rebalancing even when within normal thresholds
-        if hasattr(self, 'ema_rebalance_config') and self.ema_rebalance_config.get('enabled', False):
+        if self._ema_rb_enabled:
             ema_check = self.check_ema_rebalance_opportunity(price, spot_usdt, now)
-            if ema_check['should_rebalance']:
+            if ema_check.should_rebalance:
                 print(f"\n🎯 EMA OPPORTUNISTIC REBALANCE TRIGGERED")
-                print(f"   Reason: {ema_check['reason']}")
-                print(f"   Suggested reduction: {ema_check['suggested_ratio']*100:.0f}% of position")
+                print(f"   Reason: {ema_check.reason}")
+                print(f"   Suggested reduction: {ema_check.suggested_ratio*100:.0f}% of position")
                 
                 # Calculate rebalance quantity based on suggested ratio
                 # We want to reduce our exposure, so if long, sell; if short, buy
                 if spot_usdt > 0:  # Long exposure
-                    rebalance_qty_usdt = spot_usdt * ema_check['suggested_ratio']
-                    self.execute_ema_rebalance("Sell", rebalance_qty_usdt, price, ema_check['reason'])
+                    rebalance_qty_usdt = spot_usdt * ema_check.suggested_ratio
+                    self.execute_ema_rebalance("Sell", rebalance_qty_usdt, price, ema_check.reason)
                     return
                 elif spot_usdt < 0:  # Short exposure (shouldn't happen with spot, but for completeness)
-                    rebalance_qty_usdt = abs(spot_usdt) * ema_check['suggested_ratio']
-                    self.execute_ema_rebalance("Buy", rebalance_qty_usdt, price, ema_check['reason'])
+                    rebalance_qty_usdt = abs(spot_usdt) * ema_check.suggested_ratio
+                    self.execute_ema_rebalance("Buy", rebalance_qty_usdt, price, ema_check.reason)
                     return
         
         # Check if we need to rebalance (using adjusted threshold)
@@ -520,13 +541,8 @@ class SpotRebalancer:
 
     def place_limit_order(self, side: str, price: float, qty_base: float, qty_usdt: float, divergence: float):
         """Place a limit order slightly better than current price"""
-        # Adjust price slightly to increase fill probability
-        if side == "Buy":
-            order_price = price * 0.999  # Bid slightly below
-        else:
-            order_price = price * 1.001  # Ask slightly above
-        
-        order_price = round(order_price, 4)
+        # Adjust price slightly to increase fill probability: bid slightly below, ask slightly above
+        order_price = round(price * self._limit_price_mult[side], 4)
         
         print(f"\n{'='*60}")
         print(f"🎯 REBALANCING - {side.upper()} ${qty_usdt:,.0f} (divergence: ${divergence:+,.0f})")
@@ -547,6 +563,7 @@ class SpotRebalancer:
             if resp and resp.get('retCode') == 0:
                 order_id = resp['result']['orderId']
                 self.active_orders.add(order_id)
+                self._balance_dirty = True
                 print(f"✅ Limit order placed successfully - Order ID: {order_id}")
             else:
                 error_msg = resp.get('retMsg', 'Unknown error') if resp else 'No response'
@@ -573,6 +590,7 @@ class SpotRebalancer:
             if resp and resp.get('retCode') == 0:
                 order_id = resp['result']['orderId']
                 self.active_orders.add(order_id)
+                self._balance_dirty = True
                 print(f"✅ Market order executed successfully - Order ID: {order_id}")
             else:
                 error_msg = resp.get('retMsg', 'Unknown error') if resp else 'No response'
@@ -618,23 +636,20 @@ class SpotRebalancer:
     def get_instrument_info(self):
         """Get instrument specifications for proper quantity formatting"""
         try:
-            response = self.client.get_instruments_info(
-                category='spot',
-                symbol=self.symbol
+            # Steps rarely change, so a restart reuses the on-disk copy while it's fresh
+            info = get_instrument_info_cached(
+                self.client, 'spot', self.symbol,
+                ttl_seconds=self.instrument_cache_ttl_seconds
             )
             
-            if response and response.get('retCode') == 0:
-                instruments = response['result']['list']
-                if instruments:
-                    info = instruments[0]
-                    
-                    # Parse lot size filter for quantity step
-                    lot_size = info.get('lotSizeFilter', {})
-                    self.qty_step = float(lot_size.get('qtyStep', '1'))
-                    self.min_order_qty = float(lot_size.get('minOrderQty', '1'))
-                    
-                    print(f"📏 Instrument specs for {self.symbol}: qtyStep={self.qty_step}, minOrderQty={self.min_order_qty}")
-                    
+            if info:
+                # Parse lot size filter for quantity step
+                lot_size = info.get('lotSizeFilter', {})
+                self.qty_step = float(lot_size.get('qtyStep', '1'))
+                self.min_order_qty = float(lot_size.get('minOrderQty', '1'))
+                
+                print(f"📏 Instrument specs for {self.symbol}: qtyStep={self.qty_step}, minOrderQty={self.min_order_qty}")
+                
         except Exception as e:
             print(f"⚠️ Could not get instrument info for {self.symbol}: {e}")
             # Use conservative defaults
@@ -667,6 +682,7 @@ class SpotRebalancer:
                 
                 # Remove orders that are no longer active
                 self.active_orders = self.active_orders.intersection(active_order_ids)
+                self._balance_dirty = True  # dropped orders may have filled since the last read
                 
                 if len(self.active_orders) > 0:
                     print(f"🧹 Cleaned up orders, {len(self.active_orders)} still active")
@@ -683,6 +699,8 @@ class RebalancerRunner:
         self.running = True
         self.rebalancer = None
         self.ws = None
+        self.ws_trader = None
+        self.client = None
         self.config = None
 
     def signal_handler(self, signum, frame):
@@ -690,6 +708,10 @@ class RebalancerRunner:
         self.running = False
         if self.ws:
             self.ws.disconnect()
+        if self.ws_trader:
+            self.ws_trader.disconnect()
+        if self.client:
+            self.client.stop_keepalive()
         sys.exit(0)
 
     def run(self, config_file='config.yaml', symbol=None):
@@ -706,6 +728,19 @@ class RebalancerRunner:
             print("❌ Missing API credentials in env")
             return
         client = BybitClient(api_key=key, api_secret=sec, testnet=cfg['api']['testnet'])
+        # Orders over the trade websocket (REST is used whenever it isn't connected)
+        if cfg['api'].get('ws_trade', True):
+            self.ws_trader = BybitWsTrader(key, sec, testnet=cfg['api']['testnet'])
+            self.ws_trader.connect()
+            client.attach_ws_trader(self.ws_trader)
+        # Keep the REST fallback's pooled connection warm between orders
+        keepalive_s = cfg['api'].get('rest_keepalive_seconds', 20)
+        if keepalive_s:
+            client.start_keepalive(keepalive_s)
+        self.client = client
+        # De-duplicate balance/position lookups made several times within one step
+        cache_ttl_ms = cfg.get('delta_management', {}).get('cache_ttl_ms', 250)
+        client = CachedBybitClient(client, ttl_ms=cache_ttl_ms)
 
         r = cfg['rebalancer']
         # Use main symbol from strategy section, allow override from command line
@@ -739,7 +774,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Spot Rebalancer')
     parser.add_argument('--symbol', '-s', type=str, help='Spot symbol (e.g., BTCUSDT) - overrides config')
     parser.add_argument('--config', '-c', type=str, default='config.yaml', help='Config file path')
+    parser.add_argument('--log-level', type=str, default='INFO', help='Log level for bot modules (e.g., DEBUG)')
+    parser.add_argument('--log-file', type=str, default=None, help='Also write logs to this file (rotated at 10 MB)')
     args = parser.parse_args()
+    
+    setup_logging(args.log_level.upper(), log_file=args.log_file)
 
     runner = RebalancerRunner()
     runner.run(config_file=args.config, symbol=args.symbol)
\ No newline at end of file
@@ -0,0 +1,231 @@
+import random
+
+import pytest
+
+from bot.core.position_manager import Position, PositionManager
+
+
+class BaselinePositions:
+    """Per-object PositionManager position logic as it was before the structure-of-arrays rewrite."""
+
+    def __init__(self):
+        self.positions = {}
+        self.position_counter = 0
+
+    def add_position(self, side, entry_price, quantity, stop_loss=None, take_profit=None):
+        position_id = f"pos_{self.position_counter}"
+        self.position_counter += 1
+        self.positions[position_id] = Position(
+            symbol='TESTUSDT', side=side, entry_price=entry_price, quantity=quantity,
+            entry_time=0.0, ema_type='9', stop_loss=stop_loss, take_profit=take_profit,
+        )
+        return position_id
+
+    def update_position_stops(self, position_id, stop_loss=None, take_profit=None):
+        position = self.positions.get(position_id)
+        if position is None:
+            return
+        if stop_loss is not None:
+            position.stop_loss = stop_loss
+        if take_profit is not None:
+            position.take_profit = take_profit
+
+    def close_position(self, position_id, exit_price, exit_quantity=None):
+        position = self.positions[position_id]
+        if exit_quantity is None:
+            exit_quantity = position.quantity
+        else:
+            exit_quantity = min(exit_quantity, position.quantity)
+        if position.side == 'long':
+            pnl = (exit_price - position.entry_price) * exit_quantity
+        else:
+            pnl = (position.entry_price - exit_price) * exit_quantity
+        position.realized_pnl += pnl
+        position.quantity -= exit_quantity
+        if position.quantity <= 0:
+            del self.positions[position_id]
+        return pnl
+
+    def update_all_pnl(self, current_price):
+        for position in self.positions.values():
+            position.update_pnl(current_price)
+
+    def check_stop_levels(self, current_price):
+        hits = []
+        for position_id, position in self.positions.items():
+            if position.stop_loss:
+                if position.side == 'long' and current_price <= position.stop_loss:
+                    hits.append(position_id)
+                elif position.side == 'short' and current_price >= position.stop_loss:
+                    hits.append(position_id)
+            if position.take_profit:
+                if position.side == 'long' and current_price >= position.take_profit:
+                    hits.append(position_id)
+                elif position.side == 'short' and current_price <= position.take_profit:
+                    hits.append(position_id)
+        return hits
+
+    def update_trailing_stops(self, current_price, trail_distance_pct):
+        for position in self.positions.values():
+            if position.side == 'long':
+                new_stop = current_price * (1 - trail_distance_pct / 100)
+                if position.stop_loss is None or new_stop > position.stop_loss:
+                    position.stop_loss = new_stop
+                    position.trailing_stop_distance = trail_distance_pct
+            else:
+                new_stop = current_price * (1 + trail_distance_pct / 100)
+                if position.stop_loss is None or new_stop < position.stop_loss:
+                    position.stop_loss = new_stop
+                    position.trailing_stop_distance = trail_distance_pct
+
+    def get_total_exposure(self):
+        return sum(p.quantity * p.entry_price for p in self.positions.values())
+
+    def get_net_position(self):
+        return sum(p.quantity if p.side == 'long' else -p.quantity for p in self.positions.values())
+
+
+def assert_same_state(pm, baseline):
+    positions = pm.positions
+    assert list(positions) == list(baseline.positions)
+    for position_id, expected in baseline.positions.items():
+        actual = positions[position_id]
+        assert actual.side == expected.side
+        assert actual.quantity == pytest.approx(expected.quantity)
+        assert actual.realized_pnl == pytest.approx(expected.realized_pnl)
+        assert actual.unrealized_pnl == pytest.approx(expected.unrealized_pnl)
+        assert actual.peak_unrealized_pnl == pytest.approx(expected.peak_unrealized_pnl)
+        assert actual.stop_loss == pytest.approx(expected.stop_loss)
+        assert actual.take_profit == pytest.approx(expected.take_profit)
+        assert actual.trailing_stop_distance == expected.trailing_stop_distance
+    assert pm.get_total_exposure() == pytest.approx(baseline.get_total_exposure())
+    assert pm.get_net_position() == pytest.approx(baseline.get_net_position())
+
+
+def make_pair():
+    return PositionManager(client=None, symbol='TESTUSDT'), BaselinePositions()
+
+
+def add_both(pm, baseline, side, entry_price, quantity, stop_loss=None, take_profit=None):
+    position_id = pm.add_position(side, entry_price, quantity, '9', stop_loss=stop_loss,
+                                  take_profit=take_profit)
+    assert baseline.add_position(side, entry_price, quantity, stop_loss, take_profit) == position_id
+    return position_id
+
+
+def test_add_position_matches_baseline():
+    pm, baseline = make_pair()
+    add_both(pm, baseline, 'long', 100.0, 2.0, stop_loss=95.0, take_profit=110.0)
+    add_both(pm, baseline, 'short', 101.0, 1.5)
+    assert_same_state(pm, baseline)
+    summary = pm.get_position_summary()
+    assert summary['total_positions'] == 2
+    assert summary['long_positions'] == 1
+    assert summary['short_positions'] == 1
+
+
+def test_partial_and_full_close_match_baseline():
+    pm, baseline = make_pair()
+    long_id = add_both(pm, baseline, 'long', 100.0, 2.0)
+    short_id = add_both(pm, baseline, 'short', 100.0, 3.0)
+
+    assert pm.close_position(long_id, 105.0, 0.5) == pytest.approx(baseline.close_position(long_id, 105.0, 0.5))
+    assert pm.close_position(short_id, 98.0, 1.0) == pytest.approx(baseline.close_position(short_id, 98.0, 1.0))
+    assert_same_state(pm, baseline)
+
+    # Over-sized exits are clamped to what's left, and the position goes away
+    assert pm.close_position(long_id, 90.0, 10.0) == pytest.approx(baseline.close_position(long_id, 90.0, 10.0))
+    assert_same_state(pm, baseline)
+    assert pm.close_position('pos_missing', 100.0) == 0.0
+
+    # A freed slot is reused without leaking the old position's state
+    add_both(pm, baseline, 'long', 102.0, 1.0)
+    pm.update_all_pnl(103.0)
+    baseline.update_all_pnl(103.0)
+    assert_same_state(pm, baseline)
+
+
+def test_trailing_stops_match_baseline():
+    pm, baseline = make_pair()
+    add_both(pm, baseline, 'long', 100.0, 1.0)
+    add_both(pm, baseline, 'long', 100.0, 1.0, stop_loss=99.5)
+    add_both(pm, baseline, 'short', 100.0, 1.0)
+    add_both(pm, baseline, 'short', 100.0, 1.0, stop_loss=100.5)
+
+    for price in (100.0, 101.0, 100.5, 99.0, 98.0, 99.5):
+        pm.update_trailing_stops(price, 1.0)
+        baseline.update_trailing_stops(price, 1.0)
+        assert_same_state(pm, baseline)
+
+
+def test_check_stop_levels_matches_baseline():
+    pm, baseline = make_pair()
+    add_both(pm, baseline, 'long', 100.0, 1.0, stop_loss=95.0, take_profit=110.0)
+    add_both(pm, baseline, 'short', 100.0, 1.0, stop_loss=105.0, take_profit=90.0)
+    add_both(pm, baseline, 'long', 100.0, 1.0)
+
+    for price in (100.0, 95.0, 94.0, 105.0, 110.0, 90.0, 89.0):
+        assert sorted(pm.check_stop_levels(price)) == sorted(baseline.check_stop_levels(price))
+
+
+def test_tick_matches_baseline_sequence():
+    pm, baseline = make_pair()
+    add_both(pm, baseline, 'long', 100.0, 1.0, take_profit=104.0)
+    add_both(pm, baseline, 'short', 100.0, 2.0, stop_loss=103.0)
+    add_both(pm, baseline, 'long', 99.0, 0.5, stop_loss=97.0)
+
+    for price in (100.0, 101.5, 102.0, 100.5, 99.0, 103.5, 104.0):
+        hits = pm.tick(price, trail_distance_pct=1.5)
+        baseline.update_all_pnl(price)
+        baseline.update_trailing_stops(price, 1.5)
+        assert sorted(hits) == sorted(baseline.check_stop_levels(price))
+        assert_same_state(pm, baseline)
+
+    # Without a trail distance, tick only does P&L and level checks
+    hits = pm.tick(98.0)
+    baseline.update_all_pnl(98.0)
+    assert sorted(hits) == sorted(baseline.check_stop_levels(98.0))
+    assert_same_state(pm, baseline)
+
+
+def test_random_sequence_matches_baseline():
+    rng = random.Random(7)
+    pm, baseline = make_pair()
+    price = 100.0
+    for _ in range(300):
+        price = max(1.0, price * (1 + rng.uniform(-0.02, 0.02)))
+        action = rng.random()
+        if action < 0.25 or not baseline.positions:
+            side = rng.choice(('long', 'short'))
+            stop = price * (0.95 if side == 'long' else 1.05) if rng.random() < 0.5 else None
+            target = price * (1.05 if side == 'long' else 0.95) if rng.random() < 0.5 else None
+            add_both(pm, baseline, side, price, rng.uniform(0.1, 3.0), stop, target)
+        elif action < 0.4:
+            position_id = rng.choice(list(baseline.positions))
+            quantity = rng.choice((None, rng.uniform(0.05, 2.0)))
+            assert pm.close_position(position_id, price, quantity) == pytest.approx(
+                baseline.close_position(position_id, price, quantity))
+        else:
+            trail_distance_pct = rng.choice((None, 1.0, 2.5))
+            hits = pm.tick(price, trail_distance_pct=trail_distance_pct)
+            baseline.update_all_pnl(price)
+            if trail_distance_pct is not None:
+                baseline.update_trailing_stops(price, trail_distance_pct)
+            # Baseline listed an id twice when a trailed stop crossed its TP; tick() reports it once
+            assert sorted(hits) == sorted(set(baseline.check_stop_levels(price)))
+        assert_same_state(pm, baseline)
+
+
+def test_positions_is_read_only():
+    pm = PositionManager(client=None, symbol='TESTUSDT')
+    position_id = pm.add_position('long', 100.0, 1.0, '9')
+    with pytest.raises(TypeError):
+        pm.positions['pos_other'] = pm.positions[position_id]
+    with pytest.raises(TypeError):
+        del pm.positions[position_id]
+
+    # Stop changes go through update_position_stops and show up on the next read
+    pm.update_position_stops(position_id, stop_loss=95.0, take_profit=110.0)
+    assert pm.positions[position_id].stop_loss == 95.0
+    assert pm.positions[position_id].take_profit == 110.0
+    assert pm.check_stop_levels(94.0) == [position_id]